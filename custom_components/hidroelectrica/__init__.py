@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from dataclasses import dataclass, field
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.components import persistent_notification
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers import config_validation as cv
@@ -22,6 +24,7 @@ from homeassistant.helpers.update_coordinator import UpdateFailed
 from .api import HidroelectricaApiClient
 from .const import (
     CONF_ACCOUNT_METADATA,
+    CONF_BATCH_REFRESH,
     CONF_PASSWORD,
     CONF_SELECTED_ACCOUNTS,
     CONF_UPDATE_INTERVAL,
@@ -29,12 +32,21 @@ from .const import (
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
     DOMAIN_TOKEN_STORE,
+    HTTP_DEDICATED_SESSION,
     LICENSE_DATA_KEY,
     LICENSE_PURCHASE_URL,
     PLATFORMS,
+    SETUP_CONCURRENCY,
+    STATISTICS_IMPORT,
+)
+from .coordinator import (
+    HidroelectricaBatchCoordinator,
+    HidroelectricaCoordinator,
 )
-from .coordinator import HidroelectricaCoordinator
 from .license import LicenseManager
+from .session import SewSessionStats, create_sew_session
+from .statistics import HidroelectricaStatisticsImporter
+from .storage import HidroelectricaEntryStore, async_get_token_store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,6 +59,21 @@ class HidroelectricaRuntimeData:
 
     coordinators: dict[str, HidroelectricaCoordinator] = field(default_factory=dict)
     api_client: HidroelectricaApiClient | None = None
+    entry_store: HidroelectricaEntryStore | None = None
+    # Refresh grupat per login (doar cu opțiunea batch_refresh)
+    batch_coordinator: HidroelectricaBatchCoordinator | None = None
+    # Configurația la momentul setup-ului — reload doar dacă se schimbă
+    reload_signature: dict[str, Any] = field(default_factory=dict)
+    # Contoarele sesiunii HTTP dedicate (None cu sesiunea partajată HA)
+    http_stats: SewSessionStats | None = None
+
+
+def _reload_signature(entry: ConfigEntry) -> dict[str, Any]:
+    """Configurația relevantă pentru reload (fără token-uri / date volatile)."""
+    return {
+        "data": {k: v for k, v in entry.data.items() if k != "token_data"},
+        "options": dict(entry.options),
+    }
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
@@ -314,10 +341,25 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             entry.entry_id,
         )
 
-    session = async_get_clientsession(hass, verify_ssl=False)
+    # Sesiune HTTP dedicată (keep-alive, pool per host) — închisă la unload
+    # sau la oprirea Home Assistant (unload-ul nu rulează mereu la oprire)
+    http_stats: SewSessionStats | None = None
+    if HTTP_DEDICATED_SESSION:
+        session, http_stats = create_sew_session()
+
+        async def _async_close_session(_event: Event) -> None:
+            await session.close()
+
+        entry.async_on_unload(session.close)
+        entry.async_on_unload(
+            hass.bus.async_listen(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+        )
+    else:
+        session = async_get_clientsession(hass, verify_ssl=False)
     username = entry.data[CONF_USERNAME]
     password = entry.data[CONF_PASSWORD]
     update_interval = entry.data.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    batch_refresh = entry.data.get(CONF_BATCH_REFRESH, False)
 
     # Conturi selectate
     selected_accounts = entry.data.get(CONF_SELECTED_ACCOUNTS, [])
@@ -330,11 +372,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         return False
 
     _LOGGER.debug(
-        "Conturi selectate pentru %s (entry_id=%s): %s, interval=%ss.",
+        "Conturi selectate pentru %s (entry_id=%s): %s, interval=%ss, batch=%s.",
         DOMAIN,
         entry.entry_id,
         selected_accounts,
         update_interval,
+        batch_refresh,
     )
 
     # Un singur client API partajat (un singur cont, un singur token)
@@ -342,18 +385,29 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Injectăm token-ul salvat:
     # 1. hass.data (proaspăt, de la config_flow)
-    # 2. config_entry.data (persistent, pentru restart HA)
-    token_store = hass.data.get(DOMAIN_TOKEN_STORE, {})
-    stored_token = token_store.pop(username.lower(), None)
+    # 2. token store dedicat (persistent, pentru restart HA)
+    # 3. config_entry.data (format vechi — migrat în token store)
+    token_store = await async_get_token_store(hass)
+    handoff_store = hass.data.get(DOMAIN_TOKEN_STORE, {})
+    stored_token = handoff_store.pop(username.lower(), None)
+    legacy_token = entry.data.get("token_data")
     if stored_token:
         api_client.inject_token(stored_token)
+        token_store.async_set(username, stored_token)
         _LOGGER.debug(
             "Token injectat din config_flow pentru %s.", username
         )
-    elif entry.data.get("token_data"):
-        api_client.inject_token(entry.data["token_data"])
+    elif token_store.get(username):
+        api_client.inject_token(token_store.get(username))
         _LOGGER.debug(
-            "Token injectat din config_entry.data pentru %s.", username
+            "Token injectat din token store pentru %s.", username
+        )
+    elif legacy_token:
+        api_client.inject_token(legacy_token)
+        token_store.async_set(username, legacy_token)
+        _LOGGER.debug(
+            "Token injectat din config_entry.data (format vechi) pentru %s.",
+            username,
         )
     else:
         _LOGGER.debug(
@@ -361,7 +415,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             username,
         )
 
-    # Curățăm store-ul dacă e gol
+    # Migrare: eliminăm token-ul din config_entry.data (o singură dată).
+    # Listener-ul de opțiuni nu e încă înregistrat → nu declanșează reload.
+    if legacy_token is not None:
+        hass.config_entries.async_update_entry(
+            entry,
+            data={k: v for k, v in entry.data.items() if k != "token_data"},
+        )
+        _LOGGER.debug(
+            "Token mutat din config_entry.data în token store (%s).", username
+        )
+
+    # Curățăm store-ul de transfer dacă e gol
     if DOMAIN_TOKEN_STORE in hass.data and not hass.data[DOMAIN_TOKEN_STORE]:
         hass.data.pop(DOMAIN_TOKEN_STORE, None)
 
@@ -387,7 +452,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "Metadata nu conține accountNumber. Se obțin conturile din API."
         )
         try:
-            await api_client.async_ensure_authenticated()
+            await api_client.async_validate_session()
             fresh_accounts = await api_client.async_fetch_utility_accounts()
             for fa in fresh_accounts:
                 fa_uan = fa.get("contractAccountID", "").strip()
@@ -399,8 +464,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 "Nu s-au putut obține conturile din API pentru fallback: %s", err
             )
 
+    # Date locale per entry (snapshot coordinatoare)
+    entry_store = HidroelectricaEntryStore(hass, entry.entry_id)
+    await entry_store.async_load()
+
     # Creăm câte un coordinator per cont selectat
-    coordinators: dict[str, HidroelectricaCoordinator] = {}
+    pending: dict[str, HidroelectricaCoordinator] = {}
 
     for uan in selected_accounts:
         meta = account_metadata.get(uan, {})
@@ -415,35 +484,77 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             ("api_fallback" if acc_number_map.get(uan) else "GOL!"),
         )
 
-        coordinator = HidroelectricaCoordinator(
+        pending[uan] = HidroelectricaCoordinator(
             hass,
             api_client=api_client,
             uan=uan,
             account_number=acc_number,
             update_interval=update_interval,
             config_entry=entry,
+            token_store=token_store,
+            entry_store=entry_store,
+            # În modul batch, timer-ul e al coordinatorului per login
+            scheduled=not batch_refresh,
         )
 
-        try:
-            await coordinator.async_config_entry_first_refresh()
-        except UpdateFailed as err:
-            _LOGGER.error(
-                "Prima actualizare eșuată (entry_id=%s, UAN=%s): %s",
-                entry.entry_id,
-                uan,
-                err,
-            )
-            continue
-        except Exception as err:
-            _LOGGER.exception(
-                "Eroare neașteptată la prima actualizare (entry_id=%s, UAN=%s): %s",
-                entry.entry_id,
-                uan,
-                err,
-            )
-            continue
+    # Conturile cu snapshot local valid pornesc instantaneu din el;
+    # refresh-ul live (doar datele expirate) rulează în fundal după
+    # încărcarea platformelor.
+    restored = {
+        uan for uan, coord in pending.items() if coord.async_restore_snapshot()
+    }
+    if restored:
+        _LOGGER.info(
+            "%s conturi restaurate din snapshot local (entry_id=%s): %s.",
+            len(restored),
+            entry.entry_id,
+            sorted(restored),
+        )
 
-        coordinators[uan] = coordinator
+    # Prima actualizare: în paralel, limitat la SETUP_CONCURRENCY conturi
+    # simultan. Eșecul unui cont nu afectează celelalte.
+    semaphore = asyncio.Semaphore(SETUP_CONCURRENCY)
+
+    async def _async_first_refresh(
+        uan: str, coordinator: HidroelectricaCoordinator
+    ) -> bool:
+        async with semaphore:
+            try:
+                await coordinator.async_config_entry_first_refresh()
+            except UpdateFailed as err:
+                _LOGGER.error(
+                    "Prima actualizare eșuată (entry_id=%s, UAN=%s): %s",
+                    entry.entry_id,
+                    uan,
+                    err,
+                )
+                return False
+            except Exception as err:
+                _LOGGER.exception(
+                    "Eroare neașteptată la prima actualizare (entry_id=%s, UAN=%s): %s",
+                    entry.entry_id,
+                    uan,
+                    err,
+                )
+                return False
+            return True
+
+    async def _async_background_refresh(
+        coordinator: HidroelectricaCoordinator,
+    ) -> None:
+        async with semaphore:
+            await coordinator.async_refresh()
+
+    to_refresh = [uan for uan in pending if uan not in restored]
+    outcomes = await asyncio.gather(
+        *(_async_first_refresh(uan, pending[uan]) for uan in to_refresh)
+    )
+    failed = {uan for uan, ok in zip(to_refresh, outcomes) if not ok}
+
+    # Păstrăm ordinea din selected_accounts
+    coordinators: dict[str, HidroelectricaCoordinator] = {
+        uan: coord for uan, coord in pending.items() if uan not in failed
+    }
 
     if not coordinators:
         _LOGGER.error(
@@ -465,11 +576,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     entry.runtime_data = HidroelectricaRuntimeData(
         coordinators=coordinators,
         api_client=api_client,
+        entry_store=entry_store,
+        reload_signature=_reload_signature(entry),
+        http_stats=http_stats,
     )
 
     # Încărcăm platformele (sensor + button)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # Refresh live în fundal pentru conturile pornite din snapshot
+    for uan in restored:
+        entry.async_create_background_task(
+            hass,
+            _async_background_refresh(coordinators[uan]),
+            f"{DOMAIN}_refresh_{uan}",
+        )
+
+    # Reîncercările programate pentru endpoint-urile eșuate se opresc la unload
+    for coordinator in coordinators.values():
+        entry.async_on_unload(coordinator.async_cancel_retry)
+
+    # Istoric consum / index → statistici externe (incremental, cu watermark)
+    if STATISTICS_IMPORT:
+        for coordinator in coordinators.values():
+            entry.async_on_unload(
+                HidroelectricaStatisticsImporter(
+                    hass, coordinator, entry_store
+                ).async_start()
+            )
+
+    # Refresh grupat: un singur timer pentru toate conturile login-ului
+    if batch_refresh:
+        batch = HidroelectricaBatchCoordinator(
+            hass, api_client, coordinators, update_interval
+        )
+        entry.runtime_data.batch_coordinator = batch
+        entry.async_on_unload(batch.async_start())
+        _LOGGER.debug(
+            "Refresh grupat activ (entry_id=%s, %s conturi, interval=%ss).",
+            entry.entry_id,
+            len(coordinators),
+            update_interval,
+        )
+
     # Listener pentru modificarea opțiunilor
     entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
@@ -483,7 +632,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 
 async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reîncarcă integrarea când opțiunile se schimbă."""
+    """Reîncarcă integrarea când opțiunile se schimbă.
+
+    Listener-ul se declanșează la ORICE async_update_entry — comparăm
+    configurația cu cea de la setup și ignorăm actualizările fără efect.
+    """
+    runtime = getattr(entry, "runtime_data", None)
+    if runtime is not None and runtime.reload_signature == _reload_signature(entry):
+        _LOGGER.debug(
+            "Actualizare config entry fără modificări de opțiuni (entry_id=%s). "
+            "Nu se reîncarcă.",
+            entry.entry_id,
+        )
+        return
+
     _LOGGER.info(
         "Opțiunile integrării %s s-au schimbat (entry_id=%s). Se reîncarcă...",
         DOMAIN,
@@ -577,6 +739,19 @@ async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
         entry.entry_id,
     )
 
+    # ── Ștergem token-ul persistat pentru acest username ──
+    username = entry.data.get(CONF_USERNAME, "")
+    if username and not any(
+        e.data.get(CONF_USERNAME, "").lower() == username.lower()
+        for e in hass.config_entries.async_entries(DOMAIN)
+        if e.entry_id != entry.entry_id
+    ):
+        token_store = await async_get_token_store(hass)
+        token_store.async_remove(username)
+
+    # ── Ștergem datele locale ale entry-ului (snapshot etc.) ──
+    await HidroelectricaEntryStore(hass, entry.entry_id).async_remove()
+
     # ── Notificare „integration_removed" dacă e ultima intrare ──
     # LicenseManager nu mai există (distrus în async_unload_entry),
     # dar fingerprint-ul a fost salvat în hass.data[f"{DOMAIN}_notify"].
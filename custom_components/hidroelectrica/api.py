@@ -6,24 +6,49 @@ Autentificare în 3 pași:
   3. Apeluri post-auth → (Basic auth = UserID:SessionToken, SourceType=1)
 
 Retry automat la 401 (re-login + reîncercare o dată).
+Durata de viață a sesiunii se învață din 401-urile observate; token-ul
+se reînnoiește proactiv înainte de expirarea estimată, iar un token
+restaurat se verifică printr-un singur request ieftin (nu re-login forțat).
+Single-flight: apelurile identice concurente (endpoint + payload) se
+unesc într-un singur request HTTP.
+Cache TTL per endpoint (API_CACHE_TTL) pentru răspunsurile aproape statice,
+cu evacuare LRU și invalidare explicită (ex: după SubmitSelfMeterRead).
 Persistență token prin export_token_data / inject_token.
+Timeout per endpoint din latențele observate (latency.py), cu duplicat
+(hedging) pentru citirile idempotente mai lente decât p95.
+Toate request-urile HTTP trec prin limitatorul global (limiter.py) și prin
+circuit breaker-ul ihidro.ro (breaker.py): cu backend-ul căzut, request-urile
+eșuează imediat cu HidroelectricaUnavailableError.
 """
 
 from __future__ import annotations
 
 import asyncio
 import base64
+import json
 import logging
 import ssl
 import time
-from datetime import datetime
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
 from typing import Any
 
-from aiohttp import ClientSession, ClientTimeout
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+
+try:  # Backend JSON rapid (inclus în Home Assistant); fallback: json standard
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None
 
 from .const import (
     API_BASE,
-    API_TIMEOUT,
+    API_CACHE_DAY_ALIGNED,
+    API_CACHE_MAX_ENTRIES,
+    API_CACHE_TTL,
+    API_HEDGE_ENABLED,
+    API_JSON_EXECUTOR_THRESHOLD,
     DEFAULT_LANGUAGE,
     ENDPOINT_GET_BILL,
     ENDPOINT_GET_BILLING_HISTORY,
@@ -43,6 +68,16 @@ from .const import (
     ENDPOINT_VALIDATE_LOGIN,
     POST_AUTH_HEADERS,
     PRE_AUTH_HEADERS,
+    TOKEN_MIN_LIFETIME,
+    TOKEN_REFRESH_FRACTION,
+)
+from .breaker import STATE_CLOSED, get_circuit_breaker
+from .latency import LatencyTracker
+from .limiter import (
+    LANE_BACKGROUND,
+    LANE_INTERACTIVE,
+    LANE_NORMAL,
+    get_upstream_limiter,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -52,6 +87,42 @@ _SSL_CTX = ssl.create_default_context()
 _SSL_CTX.check_hostname = False
 _SSL_CTX.verify_mode = ssl.CERT_NONE
 
+# Endpoint-uri cu efecte secundare — NU se unesc (single-flight) niciodată
+_NO_COALESCE_ENDPOINTS: frozenset[str] = frozenset({
+    ENDPOINT_GET_METER_VALUE,
+    ENDPOINT_SUBMIT_SELF_METER_READ,
+})
+
+# Endpoint-uri invalidate din cache după o autocitire trimisă cu succes
+_SUBMIT_INVALIDATES: frozenset[str] = frozenset({
+    ENDPOINT_GET_WINDOW_DATES,
+    ENDPOINT_GET_WINDOW_DATES_ENC,
+    ENDPOINT_GET_METER_COUNTER_SERIES,
+})
+
+# Chei din payload care identifică contul (pentru invalidare per cont)
+_ACCOUNT_PAYLOAD_KEYS = ("UtilityAccountNumber", "utilityAccountNumber", "AccountNumber")
+
+# Banda de prioritate per endpoint (implicit: LANE_NORMAL).
+# Login-ul și verificarea sesiunii folosesc mereu LANE_INTERACTIVE.
+_ENDPOINT_LANES: dict[str, int] = {
+    ENDPOINT_GET_METER_VALUE: LANE_INTERACTIVE,
+    ENDPOINT_SUBMIT_SELF_METER_READ: LANE_INTERACTIVE,
+    ENDPOINT_GET_USAGE: LANE_BACKGROUND,
+    ENDPOINT_GET_BILLING_HISTORY: LANE_BACKGROUND,
+    ENDPOINT_GET_METER_COUNTER_SERIES: LANE_BACKGROUND,
+    ENDPOINT_GET_METER_READ_HISTORY: LANE_BACKGROUND,
+}
+
+
+def _json_loads(raw: bytes) -> Any:
+    """bytes → obiect JSON (orjson dacă e disponibil). None pentru corp gol."""
+    if not raw.strip():
+        return None
+    if _orjson is not None:
+        return _orjson.loads(raw)
+    return json.loads(raw)
+
 
 class HidroelectricaApiError(Exception):
     """Eroare generică aruncată de API client."""
@@ -61,6 +132,133 @@ class HidroelectricaAuthError(HidroelectricaApiError):
     """Eroare de autentificare (credențiale invalide)."""
 
 
+class HidroelectricaUnavailableError(HidroelectricaApiError):
+    """Backend indisponibil — circuit breaker deschis, request-ul nu a plecat."""
+
+
+class _ResponseCache:
+    """Cache LRU cu TTL per intrare pentru răspunsurile SEW.
+
+    Cheia este aceeași ca la single-flight: (endpoint, payload canonic).
+    Valorile sunt partajate între apelanți — NU trebuie modificate.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._max_entries = max_entries
+        # cheie → (expiră_la [monotonic], răspuns, conturi din payload)
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[float, dict, frozenset[str]]
+        ] = OrderedDict()
+        self._stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    def get(self, key: tuple[str, str]) -> dict | None:
+        """Returnează răspunsul din cache (sau None dacă lipsește / a expirat)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+        expires_at, value, _accounts = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def put(
+        self,
+        key: tuple[str, str],
+        value: dict,
+        ttl: float,
+        accounts: frozenset[str],
+    ) -> None:
+        """Adaugă un răspuns în cache; evacuează cele mai vechi intrări (LRU)."""
+        self._entries[key] = (time.monotonic() + ttl, value, accounts)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def invalidate(
+        self,
+        endpoints: frozenset[str] | set[str] | None = None,
+        account: str | None = None,
+    ) -> int:
+        """Elimină intrările filtrate pe endpoint și/sau cont. Returnează numărul lor."""
+        keys = [
+            key
+            for key, (_exp, _val, accounts) in self._entries.items()
+            if (endpoints is None or key[0] in endpoints)
+            and (account is None or account in accounts)
+        ]
+        for key in keys:
+            del self._entries[key]
+        self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Statistici cache (hit/miss/evacuări/invalidări + intrări curente)."""
+        return {**self._stats, "entries": len(self._entries)}
+
+
+class _TokenLifetime:
+    """Durata de viață a sesiunii SEW, estimată din observații.
+
+    Durata reală L (expirare absolută de la login) e încadrată de:
+    - max_valid_age: cea mai mare vârstă la care un request a reușit (L > ea)
+    - expired_age: cea mai mică vârstă la care s-a primit 401 (L ≤ ea)
+    Un 401 sub TOKEN_MIN_LIFETIME sau sub max_valid_age e o revocare, nu
+    o expirare, și se ignoră. Un request reușit peste expired_age arată că
+    estimarea e greșită (ex: expirare la inactivitate) — se renunță la ea.
+    """
+
+    def __init__(self) -> None:
+        self.max_valid_age: float = 0.0
+        self.expired_age: float | None = None
+
+    def restore(self, expired_age: Any) -> None:
+        """Restaurează estimarea persistată (din token store)."""
+        if isinstance(expired_age, (int, float)) and expired_age >= TOKEN_MIN_LIFETIME:
+            self.expired_age = float(expired_age)
+
+    def observe_valid(self, age: float) -> None:
+        self.max_valid_age = max(self.max_valid_age, age)
+        if self.expired_age is not None and age >= self.expired_age:
+            _LOGGER.debug(
+                "Sesiune validă la %.0fs (estimare %.0fs) — estimare abandonată.",
+                age, self.expired_age,
+            )
+            self.expired_age = None
+
+    def observe_expired(self, age: float) -> None:
+        if age < TOKEN_MIN_LIFETIME or age <= self.max_valid_age:
+            return
+        if self.expired_age is None or age < self.expired_age:
+            _LOGGER.debug("Durată sesiune SEW estimată: ≤ %.0fs.", age)
+            self.expired_age = age
+
+    @property
+    def refresh_after(self) -> float | None:
+        """Vârsta token-ului la care se face re-login proactiv (None = necunoscut)."""
+        if self.expired_age is None:
+            return None
+        return self.expired_age * TOKEN_REFRESH_FRACTION
+
+
+def _seconds_until_midnight() -> float:
+    """Secunde rămase până la miezul nopții (ora locală)."""
+    now = datetime.now()
+    midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+    return (midnight - now).total_seconds()
+
+
 class HidroelectricaApiClient:
     """Client async pentru API-ul Hidroelectrica România (SEW platform)."""
 
@@ -79,13 +277,38 @@ class HidroelectricaApiClient:
         self._token_id: str | None = None
         self._user_id: str | None = None
         self._session_token: str | None = None
+        # Momentul obținerii token-ului (time.time — se persistă între restarturi)
         self._token_obtained_at: float = 0.0
+        self._lifetime = _TokenLifetime()
 
         # Lock pentru a preveni login-uri concurente
         self._auth_lock = asyncio.Lock()
         self._token_generation: int = 0
+        # Generația verificată (login propriu sau probă reușită)
+        self._validated_generation: int = -1
+
+        # Latențe per endpoint → timeout adaptiv + hedging
+        self._latency = LatencyTracker()
+        # Limitator partajat de toți clienții din proces
+        self._limiter = get_upstream_limiter()
+        # Circuit breaker partajat pentru ihidro.ro
+        self._breaker = get_circuit_breaker(API_BASE)
+
+        # Single-flight: request-uri în curs, indexate pe (endpoint, payload)
+        self._inflight: dict[tuple[str, str], asyncio.Future] = {}
+        self._request_stats: dict[str, int] = {
+            "requests": 0,    # request-uri HTTP efective (post-auth)
+            "coalesced": 0,   # apeluri servite dintr-un request deja în curs
+            "expired_401": 0,         # 401 pe prima încercare (token expirat)
+            "proactive_logins": 0,    # re-login înainte de expirarea estimată
+            "session_probes": 0,      # verificări token restaurat
+            "hedged": 0,              # duplicate trimise (răspuns peste p95)
+            "hedge_wins": 0,          # duplicate care au răspuns primele
+            "executor_parses": 0,     # răspunsuri mari parsate în executor
+        }
 
-        self._timeout = ClientTimeout(total=API_TIMEOUT)
+        # Cache TTL pentru endpoint-urile aproape statice (API_CACHE_TTL)
+        self._cache = _ResponseCache(API_CACHE_MAX_ENTRIES)
 
     # ══════════════════════════════════════════════
     # Proprietăți publice
@@ -101,11 +324,82 @@ class HidroelectricaApiClient:
         """Generația curentă a token-ului (crește la fiecare login/inject)."""
         return self._token_generation
 
+    @property
+    def token_lifetime(self) -> dict[str, float | None]:
+        """Estimarea duratei sesiunii și vârsta token-ului (pentru diagnostics)."""
+        return {
+            "token_age": round(self._token_age(), 1) if self._session_token else None,
+            "max_valid_age": round(self._lifetime.max_valid_age, 1),
+            "expired_age": self._lifetime.expired_age,
+            "refresh_after": self._lifetime.refresh_after,
+        }
+
     @property
     def user_id(self) -> str | None:
         """Returnează UserID-ul obținut la autentificare."""
         return self._user_id
 
+    @property
+    def username(self) -> str:
+        """Returnează username-ul (email) folosit la autentificare."""
+        return self._username
+
+    @property
+    def request_stats(self) -> dict[str, int]:
+        """Contoare request-uri (efective vs. unite prin single-flight)."""
+        return dict(self._request_stats)
+
+    @property
+    def breaker_stats(self) -> dict[str, int | float | str]:
+        """Starea circuit breaker-ului pentru ihidro.ro."""
+        return self._breaker.stats
+
+    @property
+    def unavailable_retry_in(self) -> float | None:
+        """Secunde până la proba breaker-ului; None dacă backend-ul e disponibil."""
+        if self._breaker.state == STATE_CLOSED:
+            return None
+        return self._breaker.retry_in
+
+    @property
+    def latency_stats(self) -> dict[str, dict[str, float | int]]:
+        """Latențe p50/p95/p99 și timeout-ul curent, per endpoint."""
+        return self._latency.stats
+
+    @property
+    def limiter_stats(self) -> dict[str, dict[str, float]]:
+        """Timpi de așteptare în limitatorul global, per bandă de prioritate."""
+        return self._limiter.stats
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Statistici cache răspunsuri (hit/miss/evacuări/invalidări)."""
+        return self._cache.stats
+
+    def invalidate_cache(
+        self,
+        endpoints: frozenset[str] | set[str] | None = None,
+        account: str | None = None,
+    ) -> int:
+        """Invalidează explicit intrări din cache-ul de răspunsuri.
+
+        Args:
+            endpoints: Doar aceste endpoint-uri (None = toate)
+            account: Doar intrările pentru acest UAN / AccountNumber (None = toate)
+
+        Returns:
+            Numărul de intrări eliminate.
+        """
+        removed = self._cache.invalidate(endpoints, account)
+        if removed:
+            _LOGGER.debug(
+                "Cache invalidat: %s intrări (endpoints=%s, cont=%s).",
+                removed,
+                sorted(endpoints) if endpoints else "toate",
+                account or "toate",
+            )
+        return removed
+
     # ══════════════════════════════════════════════
     # Persistență token (export / inject)
     # ══════════════════════════════════════════════
@@ -113,7 +407,7 @@ class HidroelectricaApiClient:
     def export_token_data(self) -> dict | None:
         """Exportă datele de autentificare pentru persistență.
 
-        Folosit de __init__.py pentru a salva tokenul în hass.data
+        Folosit de coordinator pentru a salva tokenul în token store
         și de config_flow pentru a-l transfera la coordinator.
         """
         if self._session_token is None:
@@ -123,18 +417,27 @@ class HidroelectricaApiClient:
             "token_id": self._token_id,
             "user_id": self._user_id,
             "session_token": self._session_token,
+            "obtained_at": self._token_obtained_at,
+            "lifetime": self._lifetime.expired_age,
         }
 
     def inject_token(self, token_data: dict) -> None:
         """Injectează un token existent (obținut anterior).
 
-        Setează token_obtained_at la momentul curent.
+        Păstrează momentul obținerii și estimarea duratei, dacă au fost
+        salvate (token-urile vechi fără obtained_at primesc momentul curent).
+        Token-ul injectat nu e considerat verificat (vezi async_validate_session).
         """
         self._key = token_data.get("key")
         self._token_id = token_data.get("token_id")
         self._user_id = token_data.get("user_id")
         self._session_token = token_data.get("session_token")
-        self._token_obtained_at = time.monotonic()
+        obtained_at = token_data.get("obtained_at")
+        self._token_obtained_at = (
+            float(obtained_at) if isinstance(obtained_at, (int, float)) and obtained_at > 0
+            else time.time()
+        )
+        self._lifetime.restore(token_data.get("lifetime"))
         self._token_generation += 1
         _LOGGER.debug(
             "Token injectat (user_id=%s, gen=%s).",
@@ -147,6 +450,15 @@ class HidroelectricaApiClient:
         self._session_token = None
         self._token_obtained_at = 0.0
 
+    def _token_age(self) -> float:
+        """Vârsta token-ului curent (secunde)."""
+        return max(0.0, time.time() - self._token_obtained_at)
+
+    def _token_due(self) -> bool:
+        """True dacă token-ul a atins vârsta de re-login proactiv."""
+        refresh_after = self._lifetime.refresh_after
+        return refresh_after is not None and self._token_age() >= refresh_after
+
     # ══════════════════════════════════════════════
     # Autentificare — 3 pași SEW
     # ══════════════════════════════════════════════
@@ -236,8 +548,9 @@ class HidroelectricaApiClient:
                 "Autentificare eșuată — UserID sau SessionToken lipsă."
             )
 
-        self._token_obtained_at = time.monotonic()
+        self._token_obtained_at = time.time()
         self._token_generation += 1
+        self._validated_generation = self._token_generation
 
         _LOGGER.debug(
             "[LOGIN] Pas 2 OK: UserID=%s, gen=%s.",
@@ -250,18 +563,88 @@ class HidroelectricaApiClient:
     async def async_ensure_authenticated(self) -> bool:
         """Asigură că avem o sesiune validă (cu lock anti-concurență).
 
-        Dacă session_token există, presupunem că e valid.
-        Dacă lipsește, face login complet.
+        Dacă session_token există și nu a atins vârsta de re-login proactiv,
+        presupunem că e valid. Altfel face login complet — o singură dată;
+        apelurile paralele așteaptă lock-ul în loc să primească 401.
         """
-        if self._session_token:
+        if self._session_token and not self._token_due():
             return True
 
         async with self._auth_lock:
             # Double-check după obținerea lock-ului
-            if self._session_token:
+            if self._session_token and not self._token_due():
                 return True
+            if self._session_token:
+                self._request_stats["proactive_logins"] += 1
+                _LOGGER.debug(
+                    "Token la %.0fs (estimare expirare %.0fs) — re-login proactiv.",
+                    self._token_age(), self._lifetime.expired_age,
+                )
             return await self.async_login()
 
+    async def async_validate_session(self) -> bool:
+        """Ca async_ensure_authenticated, dar verifică o dată un token restaurat.
+
+        Un token injectat (din storage) poate fi expirat server-side. În loc
+        de re-login forțat, se trimite un singur GetUserSetting: 200 → token
+        valid; 401 → login; alt status → se reîncearcă la următorul apel.
+        Verificarea reușită se face o singură dată per generație de token,
+        oricâți coordinatori o cer în paralel.
+        """
+        if self._validated_generation == self._token_generation:
+            return await self.async_ensure_authenticated()
+
+        async with self._auth_lock:
+            if self._validated_generation != self._token_generation:
+                if self._session_token and not self._token_due():
+                    await self._async_probe_session()
+                else:
+                    self._session_token = None
+                    await self.async_login()
+        return await self.async_ensure_authenticated()
+
+    async def _async_probe_session(self) -> None:
+        """Verificare token restaurat cu GetUserSetting (apelat sub _auth_lock)."""
+        self._request_stats["session_probes"] += 1
+        age = self._token_age()
+        try:
+            async with self._http_post(
+                ENDPOINT_GET_USER_SETTING,
+                {"UserID": self._user_id},
+                self._build_auth_headers(),
+                LANE_INTERACTIVE,
+            ) as resp:
+                status = resp.status
+                await resp.read()
+        except Exception as exc:  # noqa: BLE001
+            # Rețea indisponibilă: nu putem decide — request-urile normale
+            # au oricum retry pe 401
+            _LOGGER.debug("Verificare token eșuată (%s) — se păstrează.", exc)
+            return
+
+        if status == 401:
+            self._request_stats["expired_401"] += 1
+            self._lifetime.observe_expired(age)
+            _LOGGER.debug(
+                "Token restaurat expirat (vârstă %.0fs) — login proaspăt.", age
+            )
+            self._session_token = None
+            await self.async_login()
+            return
+
+        if status != 200:
+            # 5xx / 429 / alt status: token-ul nu e confirmat — rămâne
+            # neverificat; request-urile normale decid (retry pe 401)
+            _LOGGER.debug(
+                "Verificare token neconcludentă (HTTP %s) — se păstrează neverificat.",
+                status,
+            )
+            return
+
+        self._lifetime.observe_valid(age)
+        _LOGGER.debug("Token restaurat verificat (vârstă %.0fs).", age)
+        self._validated_generation = self._token_generation
+
     # ══════════════════════════════════════════════
     # Metode private — transport HTTP
     # ══════════════════════════════════════════════
@@ -276,6 +659,61 @@ class HidroelectricaApiClient:
             "Authorization": f"Basic {basic}",
         }
 
+    @asynccontextmanager
+    async def _http_post(
+        self,
+        endpoint: str,
+        payload: dict,
+        headers: dict[str, str],
+        lane: int,
+    ) -> AsyncIterator[ClientResponse]:
+        """session.post prin circuit breaker + limitatorul global.
+
+        Breaker deschis → HidroelectricaUnavailableError imediat, fără rețea.
+        Timeout / eroare de rețea / HTTP 5xx contează ca eșec al backend-ului.
+        Timeout-ul vine din latențele observate ale endpoint-ului; durata
+        (fără așteptarea în limitator) se înregistrează la final.
+        """
+        ticket = self._breaker.allow_request()
+        if ticket is None:
+            raise HidroelectricaUnavailableError(
+                f"Backend indisponibil (reîncercare în {self._breaker.retry_in:.0f}s)."
+            )
+        timeout = self._latency.timeout_for(endpoint)
+        recorded = False
+        try:
+            async with self._limiter.slot(lane):
+                started = time.monotonic()
+                async with self._session.post(
+                    f"{API_BASE}{endpoint}",
+                    json=payload,
+                    headers=headers,
+                    timeout=ClientTimeout(total=timeout),
+                    ssl=_SSL_CTX,
+                ) as resp:
+                    if resp.status >= 500:
+                        self._breaker.record_failure(ticket)
+                    else:
+                        self._breaker.record_success(ticket)
+                    recorded = True
+                    yield resp
+                self._latency.record(endpoint, time.monotonic() - started)
+        except asyncio.TimeoutError:
+            # Durata reală ≥ timeout: o înregistrăm ca atare (timeout-ul crește)
+            self._latency.record(endpoint, timeout)
+            if not recorded:
+                self._breaker.record_failure(ticket)
+                recorded = True
+            raise
+        except ClientError:
+            if not recorded:
+                self._breaker.record_failure(ticket)
+                recorded = True
+            raise
+        finally:
+            if not recorded:
+                self._breaker.abandon(ticket)
+
     async def _post(
         self,
         endpoint: str,
@@ -289,19 +727,15 @@ class HidroelectricaApiClient:
         _LOGGER.debug("[%s] POST %s", label, url)
 
         try:
-            async with self._session.post(
-                url,
-                json=payload,
-                headers=headers,
-                timeout=self._timeout,
-                ssl=_SSL_CTX,
+            async with self._http_post(
+                endpoint, payload, headers, LANE_INTERACTIVE
             ) as resp:
                 if resp.status == 200:
-                    return await resp.json(content_type=None)
+                    return await self._read_json(resp)
 
-                text = await resp.text()
+                raw = await resp.read()
                 _LOGGER.error(
-                    "[%s] HTTP %s — %s", label, resp.status, text[:500]
+                    "[%s] HTTP %s — %s", label, resp.status, self._error_text(raw)
                 )
                 raise HidroelectricaApiError(
                     f"{label}: HTTP {resp.status}"
@@ -316,11 +750,87 @@ class HidroelectricaApiClient:
             _LOGGER.error("[%s] Eroare: %s", label, exc)
             raise HidroelectricaApiError(f"{label}: {exc}") from exc
 
+    @staticmethod
+    def _canonical_payload(payload: dict) -> str:
+        """Serializare canonică a payload-ului (cheie pentru single-flight)."""
+        return json.dumps(
+            payload, sort_keys=True, separators=(",", ":"), default=str
+        )
+
     async def _post_auth(
         self,
         endpoint: str,
         payload: dict,
         label: str = "request",
+    ) -> dict | None:
+        """POST autentificat cu cache TTL și single-flight pentru apeluri identice.
+
+        1. Endpoint-urile din API_CACHE_TTL se servesc din cache dacă e valid
+        2. Dacă un request cu același endpoint și payload este deja în curs,
+           apelantul așteaptă rezultatul acestuia în loc să trimită altul
+        Rezultatul (dict) este partajat — apelanții NU trebuie să-l modifice.
+        """
+        if endpoint in _NO_COALESCE_ENDPOINTS:
+            self._request_stats["requests"] += 1
+            return await self._post_auth_request(endpoint, payload, label)
+
+        key = (endpoint, self._canonical_payload(payload))
+        ttl = API_CACHE_TTL.get(endpoint)
+        if ttl is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                _LOGGER.debug("[%s] Răspuns servit din cache.", label)
+                return cached
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self._request_stats["coalesced"] += 1
+            _LOGGER.debug(
+                "[%s] Request identic deja în curs — se reutilizează (single-flight).",
+                label,
+            )
+        else:
+            self._request_stats["requests"] += 1
+            task = asyncio.ensure_future(
+                self._post_auth_request(endpoint, payload, label)
+            )
+            self._inflight[key] = task
+
+            def _on_done(done: asyncio.Future, key=key, ttl=ttl) -> None:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+                # Marcăm excepția ca preluată (apelanții pot fi anulați)
+                if done.cancelled() or done.exception() is not None:
+                    return
+                result = done.result()
+                if ttl is not None and result is not None:
+                    self._cache_response(key, payload, result, ttl)
+
+            task.add_done_callback(_on_done)
+
+        # shield: anularea unui apelant nu anulează request-ul celorlalți
+        return await asyncio.shield(task)
+
+    def _cache_response(
+        self,
+        key: tuple[str, str],
+        payload: dict,
+        result: dict,
+        ttl: float,
+    ) -> None:
+        """Salvează un răspuns reușit în cache (TTL aliniat la zi unde e cazul)."""
+        if key[0] in API_CACHE_DAY_ALIGNED:
+            ttl = min(ttl, _seconds_until_midnight())
+        accounts = frozenset(
+            str(payload[k]) for k in _ACCOUNT_PAYLOAD_KEYS if payload.get(k)
+        )
+        self._cache.put(key, result, ttl, accounts)
+
+    async def _post_auth_request(
+        self,
+        endpoint: str,
+        payload: dict,
+        label: str = "request",
     ) -> dict | None:
         """POST autentificat cu retry automat la 401.
 
@@ -331,29 +841,25 @@ class HidroelectricaApiClient:
         await self.async_ensure_authenticated()
 
         gen_before = self._token_generation
+        sent_age = self._token_age()
         url = f"{API_BASE}{endpoint}"
+        lane = _ENDPOINT_LANES.get(endpoint, LANE_NORMAL)
 
         _LOGGER.debug("[%s] POST auth %s", label, url)
 
         try:
-            async with self._session.post(
-                url,
-                json=payload,
-                headers=self._build_auth_headers(),
-                timeout=self._timeout,
-                ssl=_SSL_CTX,
-            ) as resp:
-                text = await resp.text()
-
-                if resp.status == 200:
-                    return await resp.json(content_type=None)
-
-                if resp.status != 401:
-                    _LOGGER.error(
-                        "[%s] HTTP %s — %s", label, resp.status, text[:500]
-                    )
-                    return None
+            status, text, body = await self._send_auth_hedged(
+                endpoint, payload, lane, label
+            )
+            if status == 200:
+                self._lifetime.observe_valid(sent_age)
+                return body
 
+            if status != 401:
+                _LOGGER.error("[%s] HTTP %s — %s", label, status, text)
+                return None
+        except HidroelectricaUnavailableError:
+            raise
         except asyncio.TimeoutError:
             _LOGGER.error("[%s] Timeout (prima încercare).", label)
             return None
@@ -369,30 +875,28 @@ class HidroelectricaApiClient:
             )
         else:
             _LOGGER.debug("[%s] HTTP 401 — se reautentifică.", label)
+            self._request_stats["expired_401"] += 1
+            self._lifetime.observe_expired(sent_age)
             self.invalidate_session()
             try:
                 await self.async_ensure_authenticated()
+            except HidroelectricaUnavailableError:
+                raise
             except HidroelectricaApiError:
                 _LOGGER.error("[%s] Reautentificare eșuată.", label)
                 return None
 
         try:
-            async with self._session.post(
-                url,
-                json=payload,
-                headers=self._build_auth_headers(),
-                timeout=self._timeout,
-                ssl=_SSL_CTX,
-            ) as resp:
-                text = await resp.text()
-                if resp.status == 200:
-                    return await resp.json(content_type=None)
-                _LOGGER.error(
-                    "[%s] Retry eșuat: HTTP %s — %s",
-                    label, resp.status, text[:500],
-                )
-                return None
+            status, text, body = await self._send_auth(endpoint, payload, lane)
+            if status == 200:
+                return body
+            _LOGGER.error(
+                "[%s] Retry eșuat: HTTP %s — %s", label, status, text,
+            )
+            return None
 
+        except HidroelectricaUnavailableError:
+            raise
         except asyncio.TimeoutError:
             _LOGGER.error("[%s] Timeout (retry).", label)
             return None
@@ -400,6 +904,88 @@ class HidroelectricaApiClient:
             _LOGGER.error("[%s] Eroare (retry): %s", label, exc)
             return None
 
+    async def _send_auth(
+        self, endpoint: str, payload: dict, lane: int
+    ) -> tuple[int, str, dict | None]:
+        """Un POST autentificat: (status, început corp pentru log, JSON dacă 200).
+
+        Corpul se citește o singură dată; doar răspunsurile 200 se parsează.
+        """
+        async with self._http_post(
+            endpoint, payload, self._build_auth_headers(), lane
+        ) as resp:
+            if resp.status == 200:
+                return resp.status, "", await self._read_json(resp)
+            raw = await resp.read()
+            return resp.status, self._error_text(raw), None
+
+    async def _send_auth_hedged(
+        self, endpoint: str, payload: dict, lane: int, label: str
+    ) -> tuple[int, str, dict | None]:
+        """Ca _send_auth; dacă răspunsul întârzie peste p95, trimite un duplicat.
+
+        Doar pentru citiri idempotente din afara benzii de fundal. Primul
+        răspuns (fără excepție) câștigă; celălalt request se anulează.
+        """
+        delay = None
+        if (
+            API_HEDGE_ENABLED
+            and lane != LANE_BACKGROUND
+            and endpoint not in _NO_COALESCE_ENDPOINTS
+        ):
+            delay = self._latency.hedge_delay(endpoint)
+        if delay is None:
+            return await self._send_auth(endpoint, payload, lane)
+
+        primary = asyncio.ensure_future(self._send_auth(endpoint, payload, lane))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        self._request_stats["hedged"] += 1
+        _LOGGER.debug(
+            "[%s] Răspuns peste p95 (%.0f ms) — trimit un duplicat.", label, delay * 1000
+        )
+        hedge = asyncio.ensure_future(self._send_auth(endpoint, payload, lane))
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._request_stats["hedge_wins"] += 1
+                        return task.result()
+            # Ambele au eșuat: propagăm eroarea request-ului original
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if not task.done():
+                    task.cancel()
+
+    async def _read_json(self, resp: ClientResponse) -> Any:
+        """Citește corpul o singură dată (bytes) și îl parsează o singură dată.
+
+        Răspunsurile peste API_JSON_EXECUTOR_THRESHOLD octeți se parsează
+        într-un thread din executor, ca să nu blocheze event loop-ul.
+        """
+        raw = await resp.read()
+        if len(raw) >= API_JSON_EXECUTOR_THRESHOLD:
+            self._request_stats["executor_parses"] += 1
+            body = await asyncio.get_running_loop().run_in_executor(
+                None, _json_loads, raw
+            )
+        else:
+            body = _json_loads(raw)
+        return body
+
+    @staticmethod
+    def _error_text(raw: bytes) -> str:
+        """Începutul corpului unui răspuns de eroare (pentru log)."""
+        return raw[:500].decode("utf-8", errors="replace")
+
     @staticmethod
     def _extract_data(response: dict, label: str) -> dict:
         """Extrage 'result.Data' din răspunsul SEW standard."""
@@ -685,11 +1271,15 @@ class HidroelectricaApiClient:
             "AccountNumber": account_number,
             "UsageSelfMeterReadEntity": usage_entity,
         }
-        return await self._post_auth(
+        result = await self._post_auth(
             endpoint=ENDPOINT_SUBMIT_SELF_METER_READ,
             payload=payload,
             label=f"SubmitSelfMeterRead ({account_number})",
         )
+        if result is not None:
+            # Fereastra / seriile contorului se pot schimba după autocitire
+            self.invalidate_cache(endpoints=_SUBMIT_INVALIDATES)
+        return result
 
     # ══════════════════════════════════════════════
     # Endpoint: Facturi
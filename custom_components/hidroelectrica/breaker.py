@@ -0,0 +1,146 @@
+"""Circuit breaker per URL de bază pentru integrarea Hidroelectrica România.
+
+Când ihidro.ro e căzut, fiecare request ar aștepta API_TIMEOUT întreg,
+pentru fiecare cont, la fiecare refresh. Breaker-ul, comun tuturor
+clienților API din proces, are trei stări:
+- închis: request-urile trec; BREAKER_FAILURE_THRESHOLD eșecuri
+  consecutive (timeout, eroare de rețea, HTTP 5xx) îl deschid
+- deschis: request-urile eșuează imediat, fără rețea, până la expirarea
+  pauzei (backoff exponențial cu jitter, crește la fiecare redeschidere)
+- semi-deschis: un singur request de probă trece; reușita închide
+  breaker-ul, eșecul îl redeschide cu pauza următoare
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+from .const import (
+    BREAKER_BASE_BACKOFF,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_JITTER,
+    BREAKER_MAX_BACKOFF,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Tichetul unui request obișnuit (nu e proba semi-deschisă)
+NO_PROBE = 0
+
+
+class CircuitBreaker:
+    """Stare de disponibilitate a unui backend (URL de bază)."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._failures = 0          # eșecuri consecutive (stare închisă)
+        self._trips = 0             # deschideri consecutive (pentru backoff)
+        self._open_until = 0.0      # monotonic
+        self._opened = False
+        self._probe = NO_PROBE      # tichetul probei în curs
+        self._probe_seq = 0
+        self._stats: dict[str, int] = {"trips": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def state(self) -> str:
+        if not self._opened:
+            return STATE_CLOSED
+        if time.monotonic() < self._open_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Secunde până când se acceptă proba (0 dacă închis / semi-deschis)."""
+        if not self._opened:
+            return 0.0
+        return max(0.0, self._open_until - time.monotonic())
+
+    @property
+    def stats(self) -> dict[str, int | float | str]:
+        return {
+            **self._stats,
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in, 1),
+        }
+
+    def allow_request(self) -> int | None:
+        """Tichetul request-ului, sau None dacă nu poate pleca.
+
+        În semi-deschis trece doar proba (tichet > NO_PROBE). Tichetul se
+        transmite la record_success / record_failure / abandon, ca doar
+        proba însăși să elibereze locul probei.
+        """
+        state = self.state
+        if state == STATE_CLOSED:
+            return NO_PROBE
+        if state == STATE_HALF_OPEN and self._probe == NO_PROBE:
+            self._probe_seq += 1
+            self._probe = self._probe_seq
+            self._stats["probes"] += 1
+            _LOGGER.debug("Breaker %s semi-deschis — trimit proba.", self.name)
+            return self._probe
+        self._stats["rejected"] += 1
+        return None
+
+    def record_success(self, ticket: int = NO_PROBE) -> None:
+        if self._opened:
+            _LOGGER.info(
+                "Backend %s disponibil din nou — breaker închis.", self.name
+            )
+        self._failures = 0
+        self._trips = 0
+        self._opened = False
+        self._probe = NO_PROBE
+
+    def record_failure(self, ticket: int = NO_PROBE) -> None:
+        if self._opened:
+            # Doar eșecul probei redeschide breaker-ul; un request pornit
+            # înainte de deschidere nu contează
+            if self._is_probe(ticket):
+                self._probe = NO_PROBE
+                self._trip()
+            return
+        self._failures += 1
+        if self._failures >= BREAKER_FAILURE_THRESHOLD:
+            self._trip()
+
+    def abandon(self, ticket: int = NO_PROBE) -> None:
+        """Request anulat fără rezultat — dacă era proba, poate fi reluată."""
+        if self._is_probe(ticket):
+            self._probe = NO_PROBE
+
+    def _is_probe(self, ticket: int) -> bool:
+        return ticket != NO_PROBE and ticket == self._probe
+
+    def _trip(self) -> None:
+        self._trips += 1
+        self._stats["trips"] += 1
+        backoff = min(
+            BREAKER_MAX_BACKOFF, BREAKER_BASE_BACKOFF * 2 ** (self._trips - 1)
+        )
+        backoff *= random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        self._opened = True
+        self._open_until = time.monotonic() + backoff
+        _LOGGER.warning(
+            "Backend %s indisponibil (deschidere #%s) — request-urile se opresc %.0fs.",
+            self.name, self._trips, backoff,
+        )
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(base_url: str) -> CircuitBreaker:
+    """Breaker-ul unic al procesului pentru un URL de bază."""
+    breaker = _BREAKERS.get(base_url)
+    if breaker is None:
+        breaker = _BREAKERS[base_url] = CircuitBreaker(base_url)
+    return breaker
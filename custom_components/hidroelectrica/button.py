@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import Any
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
@@ -15,15 +14,7 @@ from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, LICENSE_DATA_KEY
 from .coordinator import HidroelectricaCoordinator
-from .helpers import build_usage_entity, safe_get
-
-def _extract_list(data: Any, list_key: str) -> list:
-    """Extrage o listă dintr-un răspuns API care poate fi dict sau list."""
-    if isinstance(data, list):
-        return data
-    if isinstance(data, dict):
-        return data.get(list_key, []) or []
-    return []
+from .helpers import build_usage_entity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -53,17 +44,7 @@ async def async_setup_entry(
 
     for uan, coordinator in config_entry.runtime_data.coordinators.items():
         # Prosumatorii (registru 1.8.0_P) nu trimit index — distribuitorul citește automat
-        data = coordinator.data or {}
-        mrh = data.get("meter_read_history")
-        is_prosumer = False
-        if mrh and isinstance(mrh, dict):
-            mrh_data = safe_get(mrh, "result", "Data", default=[])
-            if isinstance(mrh_data, list):
-                is_prosumer = any(
-                    r.get("Registers") == "1.8.0_P" for r in mrh_data
-                )
-
-        if is_prosumer:
+        if coordinator.view.is_prosumer:
             _LOGGER.info(
                 "Prosumator detectat (UAN=%s): butonul 'Trimite index' NU se creează "
                 "(distribuitorul citește contorul automat).",
@@ -165,18 +146,13 @@ class TrimiteIndexButton(
                 return
 
             # 2. Extrage POD și installation din pods/previous_meter_read
-            data = self.coordinator.data or {}
-
-            pods = data.get("pods") or {}
-            pods_data = safe_get(pods, "result", "Data", default={})
-            pods_list = _extract_list(pods_data, "objPodData")
+            view = self.coordinator.view
 
             pod_value = ""
             installation_number = ""
-            if pods_list:
-                pod_info = pods_list[0]
-                pod_value = pod_info.get("pod", "")
-                installation_number = pod_info.get("installation", "")
+            if view.pods:
+                pod_value = view.pods[0].pod
+                installation_number = view.pods[0].installation
 
             if not pod_value:
                 _LOGGER.error(
@@ -186,9 +162,7 @@ class TrimiteIndexButton(
                 return
 
             # 3. Construiește UsageSelfMeterReadEntity
-            prev_read = data.get("previous_meter_read") or {}
-            prev_data = safe_get(prev_read, "result", "Data", default={})
-            read_list = _extract_list(prev_data, "objPreviousMeterReadData")
+            read_list = view.previous_reads
 
             if not read_list:
                 _LOGGER.error(
@@ -206,7 +180,7 @@ class TrimiteIndexButton(
             usage_entities = []
             for reading in read_list:
                 entity = build_usage_entity(
-                    previous_read=reading,
+                    previous_read=reading.as_api_dict(),
                     new_meter_read=index_value,
                     new_meter_read_date=now_str,
                 )
@@ -253,7 +227,8 @@ class TrimiteIndexButton(
                 )
                 return
 
-            # 6. Refresh date
+            # 6. Refresh date (citirile se cer din nou, indiferent de vârstă)
+            self.coordinator.async_mark_submitted()
             await self.coordinator.async_request_refresh()
 
             _LOGGER.info(
@@ -0,0 +1,143 @@
+"""Capabilități endpoint-uri per cont pentru integrarea Hidroelectrica România.
+
+Unele request-uri din refresh sunt redundante pentru un cont dat:
+- GetWindowDates și GetWindowDatesENC întorc aceleași date — se folosește
+  doar varianta care răspunde; cealaltă devine rezervă (cerută doar dacă
+  varianta cunoscută eșuează)
+- GetPreviousMeterRead întoarce HTTP 400 cât timp fereastra de autocitire
+  e închisă — se sare peste el când fereastra e „închisă" (Is_Window_Open
+  din varianta plain; pentru ENC, din zilele OpeningDate / ClosingDate)
+
+Ce s-a învățat se păstrează în entry store (secțiunea „capabilities") și
+se re-verifică periodic cu un refresh complet (toate request-urile).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from typing import Any
+
+from .const import CAPABILITY_REPROBE_INTERVAL
+from .derived import plain_window_state
+from .helpers import safe_get
+from .scheduler import reading_windows
+
+_LOGGER = logging.getLogger(__name__)
+
+# Variantele GetWindowDates (nume de nod în graful de fetch)
+WINDOW_PLAIN = "window_dates"
+WINDOW_ENC = "window_dates_enc"
+
+
+def _has_window_data(response: dict | None) -> bool:
+    """True dacă răspunsul GetWindowDates* conține result.Data utilizabil."""
+    wd_data = safe_get(response or {}, "result", "Data", default={})
+    return isinstance(wd_data, dict) and bool(wd_data)
+
+
+def window_state(response: dict | None, now: datetime | None = None) -> bool | None:
+    """Fereastră deschisă (True) / închisă (False) dintr-un răspuns GetWindowDates*.
+
+    Is_Window_Open dacă e în clar (plain); altfel din zilele
+    OpeningDate / ClosingDate, prezente necriptat și în varianta ENC.
+    None = necunoscut.
+    """
+    state = plain_window_state(response)
+    if state is not None:
+        return state
+    wd_data = safe_get(response or {}, "result", "Data", default={})
+    if not isinstance(wd_data, dict) or not wd_data:
+        return None
+    now = now or datetime.now()
+    windows = reading_windows(wd_data, now)
+    if not windows:
+        return None
+    return any(start <= now < end for start, end in windows)
+
+
+class EndpointCapabilities:
+    """Ce endpoint-uri merită cerute pentru un cont (UAN)."""
+
+    def __init__(self, stored: dict[str, Any] | None = None) -> None:
+        stored = stored if isinstance(stored, dict) else {}
+        variant = stored.get("window_variant")
+        self.window_variant: str | None = (
+            variant if variant in (WINDOW_PLAIN, WINDOW_ENC) else None
+        )
+        # Documentat: HTTP 400 cu fereastra închisă; re-verificat la fiecare probă
+        self.prev_read_when_closed: bool = stored.get("prev_read_when_closed") is True
+        self._probed_at: float = float(stored.get("probed_at", 0))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Structura salvată în entry store (serializabilă JSON)."""
+        return {
+            "window_variant": self.window_variant,
+            "prev_read_when_closed": self.prev_read_when_closed,
+            "probed_at": self._probed_at,
+        }
+
+    @property
+    def probe_due(self) -> bool:
+        """True dacă refresh-ul curent trebuie să ceară tot (re-verificare)."""
+        return (
+            self.window_variant is None
+            or time.time() - self._probed_at > CAPABILITY_REPROBE_INTERVAL
+        )
+
+    @property
+    def window_fallback(self) -> str | None:
+        """Varianta GetWindowDates cerută doar dacă cea cunoscută eșuează."""
+        if self.window_variant == WINDOW_PLAIN:
+            return WINDOW_ENC
+        if self.window_variant == WINDOW_ENC:
+            return WINDOW_PLAIN
+        return None
+
+    @property
+    def window_primary(self) -> str:
+        """Varianta GetWindowDates cerută prima (cea care răspunde)."""
+        return self.window_variant or WINDOW_PLAIN
+
+    def skip_previous_read(self, window_dates: dict | None) -> bool:
+        """True dacă GetPreviousMeterRead ar întoarce sigur 400 (fereastră închisă).
+
+        window_dates = răspunsul variantei principale (plain sau ENC).
+        """
+        return (
+            not self.prev_read_when_closed
+            and window_state(window_dates) is False
+        )
+
+    def observe(self, results: dict[str, Any], probe: bool) -> bool:
+        """Actualizează capabilitățile din rezultatele unui refresh.
+
+        Returns:
+            True dacă s-a schimbat ceva (de salvat în entry store).
+        """
+        before = self.as_dict()
+
+        if _has_window_data(results.get(WINDOW_PLAIN)):
+            self.window_variant = WINDOW_PLAIN
+        elif _has_window_data(results.get(WINDOW_ENC)):
+            self.window_variant = WINDOW_ENC
+
+        if probe:
+            # Doar la re-verificare se cer toate endpoint-urile
+            states = (
+                window_state(results.get(WINDOW_PLAIN)),
+                window_state(results.get(WINDOW_ENC)),
+            )
+            if next((s for s in states if s is not None), None) is False:
+                self.prev_read_when_closed = (
+                    results.get("previous_meter_read") is not None
+                )
+            self._probed_at = time.time()
+
+        changed = self.as_dict() != before
+        if changed:
+            _LOGGER.debug(
+                "Capabilități endpoint-uri actualizate: %s.", self.as_dict()
+            )
+        return changed
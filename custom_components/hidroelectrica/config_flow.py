@@ -33,6 +33,8 @@ from homeassistant.helpers.selector import (
 from .api import HidroelectricaApiClient, HidroelectricaAuthError
 from .const import (
     CONF_ACCOUNT_METADATA,
+    CONF_BATCH_REFRESH,
+    CONF_COMPACT_ATTRIBUTES,
     CONF_LICENSE_KEY,
     CONF_PASSWORD,
     CONF_SELECTED_ACCOUNTS,
@@ -232,6 +234,8 @@ class HidroelectricaOptionsFlow(config_entries.OptionsFlow):
         self._username: str = ""
         self._password: str = ""
         self._update_interval: int = DEFAULT_UPDATE_INTERVAL
+        self._batch_refresh: bool = False
+        self._compact_attributes: bool = False
         self._accounts_raw: list[dict] = []
         self._api: HidroelectricaApiClient | None = None
 
@@ -265,6 +269,8 @@ class HidroelectricaOptionsFlow(config_entries.OptionsFlow):
             update_interval = user_input.get(
                 CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
             )
+            batch_refresh = user_input.get(CONF_BATCH_REFRESH, False)
+            compact_attributes = user_input.get(CONF_COMPACT_ATTRIBUTES, False)
 
             session = async_get_clientsession(self.hass, verify_ssl=False)
             self._api = HidroelectricaApiClient(session, username, password)
@@ -279,6 +285,8 @@ class HidroelectricaOptionsFlow(config_entries.OptionsFlow):
                     self._username = username
                     self._password = password
                     self._update_interval = update_interval
+                    self._batch_refresh = batch_refresh
+                    self._compact_attributes = compact_attributes
                     return await self.async_step_select_accounts()
                 errors["base"] = "no_data"
 
@@ -305,6 +313,14 @@ class HidroelectricaOptionsFlow(config_entries.OptionsFlow):
                     vol.Coerce(int),
                     vol.Range(min=MIN_UPDATE_INTERVAL, max=MAX_UPDATE_INTERVAL),
                 ),
+                vol.Optional(
+                    CONF_BATCH_REFRESH,
+                    default=current.get(CONF_BATCH_REFRESH, False),
+                ): bool,
+                vol.Optional(
+                    CONF_COMPACT_ATTRIBUTES,
+                    default=current.get(CONF_COMPACT_ATTRIBUTES, False),
+                ): bool,
             }
         )
 
@@ -335,6 +351,8 @@ class HidroelectricaOptionsFlow(config_entries.OptionsFlow):
                         CONF_USERNAME: self._username,
                         CONF_PASSWORD: self._password,
                         CONF_UPDATE_INTERVAL: self._update_interval,
+                        CONF_BATCH_REFRESH: self._batch_refresh,
+                        CONF_COMPACT_ATTRIBUTES: self._compact_attributes,
                         "select_all": select_all,
                         CONF_SELECTED_ACCOUNTS: final_selection,
                         CONF_ACCOUNT_METADATA: build_account_metadata(
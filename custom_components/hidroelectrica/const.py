@@ -14,11 +14,110 @@ DEFAULT_UPDATE_INTERVAL = 3600  # Interval de actualizare în secunde (1 oră)
 MIN_UPDATE_INTERVAL = 300       # 5 minute
 MAX_UPDATE_INTERVAL = 86400     # 24 ore
 
+# Polling adaptiv (calendarul contului): intervalul configurat se aplică
+# doar în jurul evenimentelor (fereastră autocitire, scadență, factură nouă);
+# în rest se interoghează rar.
+ADAPTIVE_SPARSE_INTERVAL = 6 * 3600     # Nimic nu se poate schimba (6 ore)
+ADAPTIVE_EVENT_MARGIN = 86400           # Marjă în jurul unui eveniment (1 zi)
+ADAPTIVE_INVOICE_DAYS = 3               # Zile după închiderea ferestrei (factură nouă)
+
+# Câte conturi se inițializează în paralel la setup (prima actualizare)
+SETUP_CONCURRENCY = 5
+
+# Refresh grupat per login (opțional): câte conturi se actualizează simultan
+BATCH_CONCURRENCY = 5
+
+# ──────────────────────────────────────────────
+# Persistență locală (helpers.storage.Store)
+# ──────────────────────────────────────────────
+TOKEN_STORAGE_KEY = f"{DOMAIN}_tokens"   # .storage/hidroelectrica_tokens
+TOKEN_STORAGE_VERSION = 1
+TOKEN_SAVE_DELAY = 30           # Debounce scriere token pe disc (secunde)
+
+# Durata de viață a sesiunii SEW (învățată din 401-urile observate)
+TOKEN_REFRESH_FRACTION = 0.9    # Re-login proactiv la 90% din durata estimată
+TOKEN_MIN_LIFETIME = 300        # 401 mai devreme = revocare, nu expirare (secunde)
+
+ENTRY_STORAGE_KEY = f"{DOMAIN}_entry"    # .storage/hidroelectrica_entry_<entry_id>
+ENTRY_STORAGE_VERSION = 1
+ENTRY_SAVE_DELAY = 60           # Debounce scriere date per entry (secunde)
+
+# Snapshot coordinator: vârsta maximă acceptată la restaurare (secunde)
+SNAPSHOT_MAX_AGE = 7 * 86400    # 7 zile
+
+# Registru facturi / plăți (GetBillingHistoryList incremental)
+LEDGER_FULL_WINDOW_DAYS = 2 * 365          # Fereastra reconcilierii complete
+LEDGER_OVERLAP_DAYS = 62                   # Suprapunere la cererea incrementală
+LEDGER_RECONCILE_INTERVAL = 7 * 86400      # Reconciliere completă săptămânal
+
+# Istoric citiri filtrat pe seria activă: un răspuns gol se verifică cu o
+# cerere completă cel mult o dată pe interval (contor nou, fără citiri)
+READ_HISTORY_VERIFY_INTERVAL = 7 * 86400   # Săptămânal
+
+# Capabilități endpoint-uri per cont: re-verificare completă (secunde)
+CAPABILITY_REPROBE_INTERVAL = 86400        # O dată pe zi
+
+# Politica de prospețime per endpoint (policy.py): vârsta maximă a datelor
+# (secunde). Declanșatorii din calendarul contului pot cere mai devreme.
+ENDPOINT_MAX_AGE: dict[str, int] = {
+    "multi_meter": 24 * 3600,
+    "pods": 24 * 3600,
+    "bill": 6 * 3600,
+    "window_dates": 12 * 3600,               # + la fiecare zi nouă
+    "window_dates_enc": 12 * 3600,
+    "previous_meter_read": 6 * 3600,
+    "usage": 7 * 86400,                      # + când se schimbă factura
+    "billing_history": 3 * 86400,            # + când se schimbă factura
+    "meter_counter_series": 7 * 86400,
+    "meter_read_history": 24 * 3600,         # + după închiderea ferestrei
+}
+ENDPOINT_AGE_SLACK = 300        # Toleranță față de momentul refresh-ului (secunde)
+
+# Stale-while-revalidate per endpoint: după un eșec se servește ultima
+# valoare bună cel mult atât (secunde); endpoint-urile eșuate se reîncearcă
+# separat, cu backoff scurt, nu la următorul refresh complet.
+ENDPOINT_MAX_STALENESS: dict[str, int] = {
+    "multi_meter": 7 * 86400,
+    "pods": 7 * 86400,
+    "bill": 2 * 86400,
+    "window_dates": 6 * 3600,                # Is_Window_Open depinde de zi
+    "window_dates_enc": 6 * 3600,
+    "previous_meter_read": 6 * 3600,
+    "usage": 14 * 86400,
+    "billing_history": 14 * 86400,
+    "meter_counter_series": 14 * 86400,
+    "meter_read_history": 14 * 86400,
+}
+ENDPOINT_MAX_STALENESS_DEFAULT = 86400
+ENDPOINT_RETRY_BASE = 60        # Prima reîncercare (secunde), dublată la fiecare eșec
+ENDPOINT_RETRY_MAX = 900        # Pauză maximă între reîncercări (15 minute)
+ENDPOINT_RETRY_LIMIT = 3        # Apoi se așteaptă refresh-ul programat
+
 # ──────────────────────────────────────────────
 # Timeout implicit pentru requesturi API (secunde)
 # ──────────────────────────────────────────────
 API_TIMEOUT = 15
 
+# Limitator global către ihidro.ro (partajat de toate login-urile)
+UPSTREAM_MAX_INFLIGHT = 6       # Request-uri HTTP simultane
+UPSTREAM_RATE = 5.0             # Request-uri / secundă (medie)
+UPSTREAM_BURST = 10             # Rafală maximă
+
+# Circuit breaker ihidro.ro (backend indisponibil)
+BREAKER_FAILURE_THRESHOLD = 5   # Eșecuri consecutive până la deschidere
+BREAKER_BASE_BACKOFF = 30       # Prima pauză (secunde), dublată la fiecare redeschidere
+BREAKER_MAX_BACKOFF = 1800      # Pauză maximă (30 minute)
+BREAKER_JITTER = 0.2            # ±20% pe durata pauzei
+
+# Istoricul (consum lunar, index) se scrie și în statisticile pe termen lung
+STATISTICS_IMPORT = True
+
+# Sesiune HTTP proprie pentru ihidro.ro (pool de conexiuni dedicat).
+# False → sesiunea partajată a Home Assistant.
+HTTP_DEDICATED_SESSION = True
+HTTP_KEEPALIVE_TIMEOUT = 120    # Secunde păstrate deschise conexiunile inactive
+HTTP_DNS_TTL = 300              # Secunde în cache pentru rezoluția DNS
+
 # ──────────────────────────────────────────────
 # Limbă implicită
 # ──────────────────────────────────────────────
@@ -85,6 +184,54 @@ ENDPOINT_GET_BILLING_HISTORY = "/Service/Billing/GetBillingHistoryList"
 ENDPOINT_GET_METER_COUNTER_SERIES = "/Service/IndexHistory/GetMeterCounterSeries"
 ENDPOINT_GET_METER_READ_HISTORY = "/Service/IndexHistory/GetMeterReadHistory"
 
+# ──────────────────────────────────────────────
+# Cache răspunsuri API — TTL per endpoint (secunde)
+# Doar endpoint-urile (aproape) statice; restul merg mereu la server.
+# ──────────────────────────────────────────────
+API_CACHE_TTL: dict[str, int] = {
+    ENDPOINT_GET_USER_SETTING: 3600,                # 1 oră
+    ENDPOINT_GET_PODS: 24 * 3600,                   # 24 ore
+    ENDPOINT_GET_MULTI_METER: 24 * 3600,            # 24 ore
+    ENDPOINT_GET_METER_COUNTER_SERIES: 12 * 3600,   # 12 ore
+    ENDPOINT_GET_WINDOW_DATES: 6 * 3600,            # 6 ore (aliniat la zi)
+    ENDPOINT_GET_WINDOW_DATES_ENC: 6 * 3600,        # 6 ore (aliniat la zi)
+}
+
+# Endpoint-uri al căror răspuns depinde de ziua curentă (Is_Window_Open):
+# intrarea expiră cel târziu la miezul nopții (ora locală).
+API_CACHE_DAY_ALIGNED: frozenset[str] = frozenset({
+    ENDPOINT_GET_WINDOW_DATES,
+    ENDPOINT_GET_WINDOW_DATES_ENC,
+})
+
+# Număr maxim de intrări în cache (per client API) — evacuare LRU
+API_CACHE_MAX_ENTRIES = 256
+
+# Răspunsuri JSON de la această dimensiune (octeți) se parsează în executor
+API_JSON_EXECUTOR_THRESHOLD = 256 * 1024
+
+# ──────────────────────────────────────────────
+# Timeout adaptiv per endpoint (din latențele observate)
+# timeout = p99 × factor, limitat la [floor, ceiling] (secunde)
+# ──────────────────────────────────────────────
+API_TIMEOUT_FLOOR = 5
+API_TIMEOUT_CEILING = 45
+API_TIMEOUT_PERCENTILE = 0.99
+API_TIMEOUT_FACTOR = 2.0
+LATENCY_WINDOW = 50             # Ultimele N durate păstrate per endpoint
+LATENCY_MIN_SAMPLES = 8         # Sub atât se folosesc valorile implicite
+
+# Timeout implicit (până la primele observații) pentru răspunsurile mari
+API_TIMEOUT_DEFAULTS: dict[str, int] = {
+    ENDPOINT_GET_USAGE: 30,
+    ENDPOINT_GET_BILLING_HISTORY: 30,
+    ENDPOINT_GET_METER_READ_HISTORY: 30,
+}
+
+# Duplicat (hedging) pentru citirile idempotente mai lente decât p95
+API_HEDGE_ENABLED = True
+API_HEDGE_MIN_DELAY = 1.0       # Niciodată mai devreme (secunde)
+
 # ──────────────────────────────────────────────
 # Platforme suportate
 # ──────────────────────────────────────────────
@@ -101,6 +248,8 @@ ATTRIBUTION = "Date furnizate de Hidroelectrica România"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_UPDATE_INTERVAL = "update_interval"
+CONF_BATCH_REFRESH = "batch_refresh"
+CONF_COMPACT_ATTRIBUTES = "compact_attributes"
 CONF_SELECTED_ACCOUNTS = "selected_accounts"
 CONF_ACCOUNT_METADATA = "account_metadata"
 
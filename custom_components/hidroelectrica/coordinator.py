@@ -1,31 +1,151 @@
 """DataUpdateCoordinator pentru integrarea Hidroelectrica România.
 
 Strategia de actualizare:
-- Refresh ușor (light):  endpoint-uri esențiale — bill, multi_meter, window_dates
-- Refresh greu (heavy, la fiecare al 4-lea): + usage, billing_history, meter_read_history
-- Datele grele se reutilizează între refresh-urile ușoare
+- Fiecare refresh cere doar endpoint-urile expirate sau declanșate de
+  calendarul contului (policy.py); restul datelor se reutilizează
+- Endpoint-urile rulează ca graf de dependențe (DAG): fiecare pornește
+  imediat ce intrările lui sunt disponibile, nu în faze cu barieră
+- Intervalul se adaptează după calendarul contului (scheduler.py): dens în
+  jurul ferestrei de autocitire / scadenței, rar în rest
+- Opțional (batch_refresh): un singur coordinator per login actualizează
+  toate conturile într-o trecere programată, cu concurență limitată
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import time
+from collections.abc import Awaitable, Callable, Collection
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
-from .api import HidroelectricaApiClient, HidroelectricaApiError
-from .const import DOMAIN, LICENSE_DATA_KEY
+from .api import (
+    HidroelectricaApiClient,
+    HidroelectricaApiError,
+    HidroelectricaUnavailableError,
+)
+from .capabilities import WINDOW_ENC, WINDOW_PLAIN, EndpointCapabilities
+from .const import (
+    BATCH_CONCURRENCY,
+    DOMAIN,
+    LICENSE_DATA_KEY,
+    READ_HISTORY_VERIFY_INTERVAL,
+    SNAPSHOT_MAX_AGE,
+)
+from .derived import (
+    EMPTY_VIEW,
+    AccountView,
+    build_account_view,
+    get_active_counter_series,
+    get_counter_series_ids,
+    get_meter_read_list,
+    get_pods,
+)
+from .freshness import KEEP, SKIPPED, EndpointStates
+from .helpers import content_fingerprint
+from .ledger import BillingLedger
+from .models import ParsedResponses
+from .policy import POLICIES, SUBMIT_ENDPOINTS, plan_refresh
+from .scheduler import compute_update_interval
+from .storage import HidroelectricaEntryStore, HidroelectricaTokenStore
 
 _LOGGER = logging.getLogger(__name__)
 
-# La fiecare al N-lea refresh se face „heavy" (include istorice)
-HEAVY_REFRESH_EVERY = 4
+
+# ══════════════════════════════════════════════
+# Graf de dependențe pentru endpoint-uri
+# ══════════════════════════════════════════════
+
+@dataclass(slots=True)
+class FetchNode:
+    """Un endpoint din graful de refresh.
+
+    fetch primește un dict {dependență: rezultat} și returnează răspunsul.
+    """
+
+    name: str
+    fetch: Callable[[dict[str, Any]], Awaitable[Any]]
+    deps: tuple[str, ...] = ()
+
+
+async def run_fetch_graph(
+    nodes: list[FetchNode],
+    inputs: dict[str, Any] | None = None,
+) -> tuple[dict[str, Any], dict[str, dict[str, float]]]:
+    """Execută graful: fiecare nod pornește imediat ce dependențele lui s-au rezolvat.
+
+    Dependențele care nu sunt noduri în graf se iau din `inputs`
+    (ex: datele curente, la reîncercarea doar a endpoint-urilor eșuate).
+
+    Returns:
+        (rezultate per nod, timpi per nod {start_ms, duration_ms} relativ la pornire)
+    """
+    results: dict[str, Any] = {}
+    inputs = inputs or {}
+    timings: dict[str, dict[str, float]] = {}
+    tasks: dict[str, asyncio.Future] = {}
+    graph_start = time.monotonic()
+
+    async def _run(node: FetchNode) -> None:
+        deps = [tasks[d] for d in node.deps if d in tasks]
+        if deps:
+            await asyncio.gather(*deps)
+        node_start = time.monotonic()
+        try:
+            results[node.name] = await node.fetch(
+                {d: results[d] if d in tasks else inputs.get(d) for d in node.deps}
+            )
+        finally:
+            timings[node.name] = {
+                "start_ms": round((node_start - graph_start) * 1000, 1),
+                "duration_ms": round((time.monotonic() - node_start) * 1000, 1),
+            }
+
+    # Toate task-urile se creează înainte ca vreunul să ruleze
+    for node in nodes:
+        tasks[node.name] = asyncio.ensure_future(_run(node))
+
+    try:
+        await asyncio.gather(*tasks.values())
+    except BaseException:
+        for task in tasks.values():
+            task.cancel()
+        raise
+
+    return results, timings
+
+
+def _extract_pod_params(pods: dict | None) -> tuple[str, str, str]:
+    """Extrage (InstallationNumber, podValue, CustomerNumber) din GetPods.
+
+    Necesare pentru GetPreviousMeterRead, CounterSeries, ReadHistory.
+    """
+    pod_list = get_pods({"pods": pods})
+    if not pod_list:
+        return "", "", ""
+    first = pod_list[0]
+    return first.installation, first.pod, first.account_id
+
+
+def _read_series(read: dict) -> str:
+    """Seria de contor a unei citiri din GetMeterReadHistory."""
+    return str(read.get("CounterSeries", "") or read.get("MeterCounterSeriesId", ""))
+
+
+def _read_history_response(reads: list[dict]) -> dict:
+    """Răspuns GetMeterReadHistory cu lista de citiri dată (result.Data)."""
+    return {"result": {"Data": reads}}
 
 
 class HidroelectricaCoordinator(DataUpdateCoordinator):
@@ -39,47 +159,131 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
         account_number: str,
         update_interval: int,
         config_entry: ConfigEntry | None = None,
+        token_store: HidroelectricaTokenStore | None = None,
+        entry_store: HidroelectricaEntryStore | None = None,
+        scheduled: bool = True,
     ) -> None:
         super().__init__(
             hass,
             _LOGGER,
             name=f"HidroelectricaCoordinator_{uan}",
-            update_interval=timedelta(seconds=update_interval),
+            # scheduled=False → fără timer propriu (condus de batch coordinator)
+            update_interval=(
+                timedelta(seconds=update_interval) if scheduled else None
+            ),
         )
 
+        # Intervalul configurat = intervalul „dens" al programării adaptive
+        self._dense_interval = update_interval
+        self.adaptive_interval: int = update_interval
+        self.adaptive_reason: str = ""
+
         self.api_client = api_client
         self.uan = uan
         self.account_number = account_number
         self._config_entry = config_entry
+        self._token_store = token_store
+        self._entry_store = entry_store
+        # True dacă datele curente provin din snapshot-ul salvat (restart HA)
+        self.restored_from_snapshot: bool = False
         self._refresh_counter: int = 0
-        # Salvăm generația token-ului la creare — dacă alt coordinator
-        # a făcut deja login proaspăt, nu invalidăm din nou.
-        self._startup_gen: int = api_client.token_generation
+        # Capabilități endpoint-uri (încărcate la primul refresh)
+        self._capabilities: EndpointCapabilities | None = None
+        # Cum s-a cerut ultimul istoric de citiri: "targeted" / "full"
+        self.read_history_mode: str = ""
+        # Timpi per endpoint din ultimul refresh (pentru diagnostics)
+        self.fetch_timings: dict[str, dict[str, float]] = {}
+        # Registru local facturi/plăți (încărcat la primul refresh greu)
+        self._ledger: BillingLedger | None = None
+        # View derivat, reconstruit doar când `data` se schimbă
+        self._view: AccountView = EMPTY_VIEW
+        self._view_source: dict | None = None
+        # Modele per răspuns — refolosite cât timp răspunsul nu se schimbă
+        self._parsed = ParsedResponses()
+        # Cheile din `data` schimbate la ultima notificare a listener-ilor
+        # (entitățile fără intrări schimbate nu mai scriu starea)
+        self.changed_keys: frozenset[str] = frozenset()
+        self._fingerprints: dict[str, str] = {}
+        self._fp_source: dict | None = None
+        # Ultima valoare bună per endpoint (stale-while-revalidate)
+        self._endpoints = EndpointStates()
+        self._retry_unsub: CALLBACK_TYPE | None = None
+        # Endpoint-uri cerute oricum la următorul refresh (ex: după autocitire)
+        self._forced: set[str] = set()
+        # Planul ultimului refresh: endpoint → motiv (pentru diagnostics)
+        self.refresh_plan: dict[str, str] = {}
 
     @property
-    def _is_heavy_refresh(self) -> bool:
-        """Determină dacă refresh-ul curent este „greu"."""
-        return self._refresh_counter % HEAVY_REFRESH_EVERY == 0
+    def view(self) -> AccountView:
+        """Datele contului parsate o singură dată per refresh (vezi derived.py)."""
+        data = self.data
+        if data is not self._view_source:
+            self._view = build_account_view(data, self._parsed)
+            self._view_source = data
+        return self._view
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Calculează changed_keys, apoi notifică listener-ii.
+
+        Un răspuns refolosit (același obiect) e nemodificat fără hashing;
+        unul re-descărcat se compară prin amprenta conținutului.
+        """
+        data = self.data
+        if data is self._fp_source:
+            self.changed_keys = frozenset()
+        else:
+            previous = self._fp_source or {}
+            fingerprints: dict[str, str] = {}
+            changed: set[str] = set()
+            for key, value in (data or {}).items():
+                old_fp = self._fingerprints.get(key)
+                if old_fp is not None and value is previous.get(key):
+                    fingerprints[key] = old_fp
+                    continue
+                fingerprints[key] = content_fingerprint(value)
+                if fingerprints[key] != old_fp:
+                    changed.add(key)
+            changed.update(self._fingerprints.keys() - fingerprints.keys())
+            self._fingerprints = fingerprints
+            self._fp_source = data
+            self.changed_keys = frozenset(changed)
+        super().async_update_listeners()
+
+    @callback
+    def async_mark_submitted(self) -> None:
+        """Autocitire trimisă: următorul refresh cere din nou citirile."""
+        self._forced.update(SUBMIT_ENDPOINTS)
+
+    def _plan_refresh(self, probe: bool) -> dict[str, str]:
+        """Endpoint-urile de cerut acum (expirate / declanșate), cu motivul."""
+        forced = set(self._forced)
+        if probe:
+            # Re-verificarea capabilităților cere ambele ferestre + citirea anterioară
+            forced.update((WINDOW_PLAIN, WINDOW_ENC, "previous_meter_read"))
+        return plan_refresh(self._endpoints.fetched_at, self.data, forced)
 
     async def _async_update_data(self) -> dict:
-        """Obține date de la API cu strategie light/heavy."""
+        """Obține de la API doar endpoint-urile expirate (policy.py)."""
         # Verificare licență — nu fetchuim date dacă licența/trial nu e validă
         license_mgr = self.hass.data.get(DOMAIN, {}).get(LICENSE_DATA_KEY)
         if license_mgr and not license_mgr.is_valid:
             _LOGGER.debug("[Hidroelectrica] Licență invalidă — se omit apelurile API")
             return self.data or {}
 
+        # Backend indisponibil (circuit breaker deschis): fără request-uri,
+        # păstrăm ultimele date până la proba breaker-ului
+        if self.data and self.api_client.unavailable_retry_in:
+            return self._keep_last_data()
+
         uan = self.uan
         acc = self.account_number
-        is_heavy = self._is_heavy_refresh
 
         _LOGGER.debug(
-            "Actualizare Hidroelectrica (UAN=%s, AccountNumber='%s', "
-            "refresh=#%s, tip=%s).",
+            "Actualizare Hidroelectrica (UAN=%s, AccountNumber='%s', refresh=#%s).",
             uan,
             acc,
             self._refresh_counter,
-            "HEAVY" if is_heavy else "light",
         )
 
         if not acc:
@@ -113,154 +317,70 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
                 )
 
         try:
-            # La primul refresh (startup), token-ul din storage e aproape
-            # sigur expirat server-side → forțăm re-login proaspăt.
-            # Altfel, toate request-urile paralele primesc 401 simultan.
-            # Verificăm _login_generation pentru a evita invalidarea
-            # token-ului proaspăt obținut de alt coordinator.
-            if self._refresh_counter == 0 and self._startup_gen == self.api_client.token_generation:
-                _LOGGER.debug(
-                    "Primul refresh — forțez login proaspăt (UAN=%s).", uan
-                )
-                self.api_client.invalidate_session()
-                await self.api_client.async_ensure_authenticated()
-            elif not self.api_client.has_token:
-                _LOGGER.debug(
-                    "Token absent. Se autentifică (UAN=%s).", uan
-                )
-                await self.api_client.async_ensure_authenticated()
-
             # ──────────────────────────────────────────
-            # Endpoint-uri ESENȚIALE — Faza 1: paralel (fără dependențe)
+            # Graf de dependențe: fiecare endpoint pornește imediat ce
+            # intrările lui sunt disponibile (latența = drumul critic).
+            # Doar endpoint-urile expirate / declanșate (policy.py).
             # ──────────────────────────────────────────
-            essential_phase1 = [
-                self.api_client.async_fetch_multi_meter(uan, acc),
-                self.api_client.async_fetch_bill(uan, acc),
-                self.api_client.async_fetch_window_dates_enc(uan, acc),
-                self.api_client.async_fetch_window_dates(uan, acc),
-                self.api_client.async_fetch_pods(uan, acc),
-            ]
-
-            (
-                multi_meter,
-                bill,
-                window_dates_enc,
-                window_dates,
-                pods,
-            ) = await asyncio.gather(*essential_phase1)
+            probe = self._get_capabilities().probe_due
+            plan = self._plan_refresh(probe)
+            _LOGGER.debug("Plan refresh (UAN=%s): %s.", uan, plan or "nimic expirat")
+            nodes = self._build_fetch_nodes(uan, acc, plan)
+            prev = self.data or {}
 
-            # ──────────────────────────────────────────
-            # Extragere InstallationNumber / podValue din GetPods
-            # (necesare pentru GetPreviousMeterRead, CounterSeries, ReadHistory)
-            # ──────────────────────────────────────────
-            installation_number = ""
-            pod_value = ""
-            customer_number = ""
-
-            if pods and isinstance(pods, dict):
-                pods_data = pods.get("result", {})
-                if isinstance(pods_data, dict):
-                    pods_data = pods_data.get("Data", [])
-                if isinstance(pods_data, list) and pods_data:
-                    first_pod = pods_data[0]
-                    installation_number = str(
-                        first_pod.get("installation",
-                                      first_pod.get("InstallationNumber", ""))
-                    )
-                    pod_value = str(
-                        first_pod.get("pod",
-                                      first_pod.get("podValue", ""))
-                    )
-                    customer_number = str(
-                        first_pod.get("accountID", "")
-                    )
+            if nodes:
+                # Token restaurat din storage: o singură verificare ieftină
+                # (per generație de token, partajată între coordinatori) în loc
+                # de re-login forțat; token expirat conform estimării → login direct.
+                await self.api_client.async_validate_session()
 
-            _LOGGER.debug(
-                "Pods extras (UAN=%s): installation='%s', pod='%s', "
-                "customerNumber='%s'.",
-                uan, installation_number, pod_value, customer_number,
+            results, timings = await run_fetch_graph(nodes, prev)
+            # Nodurile condiționate care nu au avut nevoie de date noi
+            results = {name: v for name, v in results.items() if v is not KEEP}
+            self.fetch_timings = timings
+            self._observe_capabilities(
+                {name: None if v is SKIPPED else v for name, v in results.items()},
+                probe,
             )
+            # Eșec → ultima valoare bună (dacă nu e prea veche)
+            now = time.time()
+            results = {
+                name: self._endpoints.record(name, value, now)
+                for name, value in results.items()
+            }
 
-            # ──────────────────────────────────────────
-            # Faza 2: GetPreviousMeterRead (depinde de Pods)
-            # ──────────────────────────────────────────
-            previous_meter_read = await self.api_client.async_fetch_previous_meter_read(
+            # Endpoint-urile neplanificate păstrează valoarea curentă
+            values = {**prev, **results}
+            multi_meter = values.get("multi_meter")
+            bill = values.get("bill")
+            window_dates_enc = values.get("window_dates_enc")
+            window_dates = values.get("window_dates")
+            pods = values.get("pods")
+            previous_meter_read = values.get("previous_meter_read")
+            usage = values.get("usage")
+            billing_history = values.get("billing_history")
+            meter_counter_series = values.get("meter_counter_series")
+            meter_read_history = values.get("meter_read_history")
+
+            _LOGGER.debug(
+                "Endpoint-uri cerute (UAN=%s): %s; fără date: %s.",
                 uan,
-                installation_number=installation_number,
-                pod_value=pod_value,
-                customer_number=customer_number,
+                sorted(results),
+                sorted(name for name, v in results.items() if v is None),
             )
 
             _LOGGER.debug(
-                "Date esențiale (UAN=%s): multi_meter=%s, bill=%s, "
-                "window_dates=%s, pods=%s, prev_read=%s.",
+                "Durate endpoint-uri (UAN=%s, ms): %s.",
                 uan,
-                type(multi_meter).__name__ if multi_meter else None,
-                type(bill).__name__ if bill else None,
-                type(window_dates).__name__ if window_dates else None,
-                type(pods).__name__ if pods else None,
-                type(previous_meter_read).__name__ if previous_meter_read else None,
+                {name: t["duration_ms"] for name, t in timings.items()},
             )
 
-            # ──────────────────────────────────────────
-            # Endpoint-uri GRELE (doar la heavy refresh)
-            # ──────────────────────────────────────────
-            prev = self.data or {}
-
-            if is_heavy:
-                # Calculăm intervalul de date
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=2 * 365)
-                from_date = start_date.strftime("%Y-%m-%d")
-                to_date = end_date.strftime("%Y-%m-%d")
-
-                if not installation_number or not pod_value:
-                    _LOGGER.error(
-                        "InstallationNumber/podValue GOALE (UAN=%s)! "
-                        "GetMeterCounterSeries/GetMeterReadHistory vor eșua.",
-                        uan,
-                    )
-
-                # Usage și BillingHistory nu depind de pods
-                # MeterCounterSeries și MeterReadHistory NU mai pot rula în paralel:
-                # MeterReadHistory are nevoie de SerialNumber din CounterSeries
-                # Dar din testare, SerialNumber poate fi [] deci le rulăm în paralel
-
-                heavy_tasks = [
-                    self.api_client.async_fetch_usage(uan, acc),
-                    self.api_client.async_fetch_billing_history(
-                        uan, acc, from_date, to_date
-                    ),
-                    self.api_client.async_fetch_meter_counter_series(
-                        uan, installation_number, pod_value,
-                    ),
-                    self.api_client.async_fetch_meter_read_history(
-                        uan, installation_number, pod_value,
-                    ),
-                ]
-
-                (
-                    usage,
-                    billing_history,
-                    meter_counter_series,
-                    meter_read_history,
-                ) = await asyncio.gather(*heavy_tasks)
-
-                _LOGGER.debug(
-                    "Date grele (UAN=%s): usage=%s, billing=%s, "
-                    "counter_series=%s, read_history=%s.",
-                    uan,
-                    "OK" if usage else "None",
-                    "OK" if billing_history else "None",
-                    "OK" if meter_counter_series else "None",
-                    "OK" if meter_read_history else "None",
-                )
-            else:
-                # Light refresh: reutilizăm datele grele anterioare
-                usage = prev.get("usage")
-                billing_history = prev.get("billing_history")
-                meter_counter_series = prev.get("meter_counter_series")
-                meter_read_history = prev.get("meter_read_history")
+        except HidroelectricaUnavailableError as err:
+            if self.data:
+                return self._keep_last_data()
+            raise UpdateFailed(
+                f"Hidroelectrica indisponibil: {err}"
+            ) from err
 
         except HidroelectricaApiError as err:
             _LOGGER.error(
@@ -289,9 +409,11 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
             ) from err
 
         # Verificăm datele esențiale — avertizăm dar nu picăm
-        # (unele endpoint-uri returnează 400 pe anumite conturi)
+        # (unele endpoint-uri returnează 400 pe anumite conturi).
+        # Fereastra contează o dată: de regulă se cere o singură variantă.
+        window = window_dates if window_dates is not None else window_dates_enc
         available_count = sum(
-            1 for v in (multi_meter, bill, window_dates_enc, window_dates, pods)
+            1 for v in (multi_meter, bill, window, pods)
             if v is not None
         )
         if available_count == 0 and self._refresh_counter == 0:
@@ -305,7 +427,7 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
             )
         elif available_count < 3:
             _LOGGER.warning(
-                "Doar %s din 5 endpoint-uri esențiale au returnat date (UAN=%s).",
+                "Doar %s din 4 endpoint-uri esențiale au returnat date (UAN=%s).",
                 available_count, uan,
             )
 
@@ -314,6 +436,8 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
 
         # Incrementăm contorul
         self._refresh_counter += 1
+        self.refresh_plan = plan
+        self._forced.difference_update(plan)
 
         _LOGGER.debug(
             "Actualizare Hidroelectrica finalizată (UAN=%s, refresh=#%s).",
@@ -321,7 +445,7 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
             self._refresh_counter - 1,
         )
 
-        return {
+        data = {
             # Contor
             "multi_meter": multi_meter,
             # Factură
@@ -332,37 +456,663 @@ class HidroelectricaCoordinator(DataUpdateCoordinator):
             # Autocitire
             "pods": pods,
             "previous_meter_read": previous_meter_read,
-            # Istorice (heavy)
+            # Istorice
             "usage": usage,
             "billing_history": billing_history,
             "meter_counter_series": meter_counter_series,
             "meter_read_history": meter_read_history,
         }
 
-    def _persist_token(self) -> None:
-        """Persistă token-ul curent în config_entry.data (pentru restart HA)."""
-        if self._config_entry is None:
+        self.restored_from_snapshot = False
+        if results:
+            self._save_snapshot(data)
+        self._schedule_adaptive(data)
+        self._schedule_endpoint_retry()
+        return data
+
+    def _keep_last_data(self) -> dict:
+        """Returnează ultimele date; următorul refresh = momentul probei breaker-ului."""
+        retry_in = self.api_client.unavailable_retry_in or 0
+        _LOGGER.debug(
+            "Backend indisponibil — se păstrează ultimele date (UAN=%s, probă în %.0fs).",
+            self.uan, retry_in,
+        )
+        if self.update_interval is not None:
+            self.update_interval = timedelta(
+                seconds=min(self.adaptive_interval, max(retry_in, 1))
+            )
+        return self.data
+
+    def _schedule_adaptive(self, data: dict) -> None:
+        """Recalculează intervalul până la următorul refresh (calendarul contului)."""
+        interval, reason = compute_update_interval(data, self._dense_interval)
+        if interval != self.adaptive_interval:
+            _LOGGER.debug(
+                "Interval adaptiv (UAN=%s): %ss → %ss (%s).",
+                self.uan, self.adaptive_interval, interval, reason,
+            )
+        self.adaptive_interval = interval
+        self.adaptive_reason = reason
+        if self.update_interval is not None:
+            self.update_interval = timedelta(seconds=interval)
+
+    # ══════════════════════════════════════════════
+    # Reîncercare doar pentru endpoint-urile eșuate
+    # ══════════════════════════════════════════════
+
+    @property
+    def endpoint_states(self) -> dict[str, dict[str, Any]]:
+        """Vârsta / eșecurile per endpoint (pentru diagnostics)."""
+        return self._endpoints.stats(time.time())
+
+    @callback
+    def async_cancel_retry(self) -> None:
+        """Anulează reîncercarea programată (la unload)."""
+        if self._retry_unsub is not None:
+            self._retry_unsub()
+            self._retry_unsub = None
+
+    def _schedule_endpoint_retry(self) -> None:
+        """Programează reîncercarea endpoint-urilor eșuate (backoff scurt).
+
+        Nu se programează nimic dacă refresh-ul obișnuit vine oricum înainte.
+        """
+        self.async_cancel_retry()
+        names, retry_at = self._endpoints.pending_retry()
+        if not names or retry_at is None:
             return
-        token_data = self.api_client.export_token_data()
-        if token_data is None:
+        delay = max(retry_at - time.time(), 1.0)
+        if delay >= self.adaptive_interval:
             return
+        _LOGGER.debug(
+            "Reîncercare în %.0fs pentru %s (UAN=%s).", delay, names, self.uan
+        )
+        self._retry_unsub = async_call_later(
+            self.hass, delay, self._async_retry_endpoints
+        )
 
-        current_data = dict(self._config_entry.data)
-        old_token = current_data.get("token_data", {})
-
-        # Actualizăm doar dacă s-a schimbat
+    async def _async_retry_endpoints(self, _now: Any) -> None:
+        """Cere din nou doar endpoint-urile eșuate și actualizează `data`."""
+        self._retry_unsub = None
+        names, _ = self._endpoints.pending_retry()
+        base = self.data
+        license_mgr = self.hass.data.get(DOMAIN, {}).get(LICENSE_DATA_KEY)
         if (
-            old_token.get("session_token") == token_data.get("session_token")
-            and old_token.get("user_id") == token_data.get("user_id")
+            not names
+            or not base
+            or self.api_client.unavailable_retry_in
+            or (license_mgr and not license_mgr.is_valid)
         ):
             return
 
-        current_data["token_data"] = token_data
-        self.hass.config_entries.async_update_entry(
-            self._config_entry, data=current_data
+        try:
+            await self._async_retry_once(names, base)
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.exception(
+                "Eroare neașteptată la reîncercarea endpoint-urilor %s (UAN=%s): %s",
+                names, self.uan, err,
+            )
+            if self.data is base:
+                # Eșec înregistrat → backoff-ul avansează (fără buclă imediată)
+                now = time.time()
+                for name in names:
+                    self._endpoints.record(name, None, now)
+        finally:
+            self._schedule_endpoint_retry()
+
+    async def _async_retry_once(self, names: list[str], base: dict) -> None:
+        """O reîncercare: graful doar cu `names`, dependențele din `base`."""
+        nodes = self._build_fetch_nodes(self.uan, self.account_number, names)
+        try:
+            results, _ = await run_fetch_graph(nodes, base)
+        except (HidroelectricaApiError, asyncio.TimeoutError) as err:
+            _LOGGER.debug(
+                "Reîncercarea pentru %s a eșuat (UAN=%s): %s", names, self.uan, err
+            )
+            results = {name: None for name in names}
+        results = {name: v for name, v in results.items() if v is not KEEP}
+
+        if self.data is not base:
+            # Între timp a rulat un refresh complet (are deja date proaspete)
+            return
+
+        self._observe_capabilities(
+            {name: None if v is SKIPPED else v for name, v in results.items()},
+            False,
         )
+        now = time.time()
+        data = dict(base)
+        for name, value in results.items():
+            data[name] = self._endpoints.record(name, value, now)
+        recovered = [
+            name for name, value in results.items()
+            if value is not None and value is not SKIPPED
+        ]
         _LOGGER.debug(
-            "Token persistat în config_entry (UAN=%s, user_id=%s).",
+            "Reîncercare endpoint-uri (UAN=%s): recuperate=%s, din %s.",
+            self.uan, recovered, names,
+        )
+        if recovered:
+            # Fără async_set_updated_data: timer-ul refresh-ului rămâne neschimbat
+            self.data = data
+            self._save_snapshot(data)
+            self.async_update_listeners()
+
+    def _build_fetch_nodes(
+        self, uan: str, acc: str, planned: Collection[str]
+    ) -> list[FetchNode]:
+        """Construiește graful cu endpoint-urile planificate pentru un refresh.
+
+        Un endpoint neplanificat cu refetch_on_change (policy.py) intră ca
+        nod condiționat: se cere doar dacă sursa lui s-a schimbat acum,
+        altfel întoarce KEEP. Dependențele din afara grafului se iau din
+        datele curente (run_fetch_graph, `inputs`).
+
+        Dependențe reale:
+        - GetPreviousMeterRead, GetMeterCounterSeries, GetMeterReadHistory
+          au nevoie de InstallationNumber / podValue din GetPods
+        - GetMeterReadHistory cere doar seria activă din GetMeterCounterSeries
+        - restul endpoint-urilor nu depind de nimic
+
+        Capabilități învățate (în afara refresh-urilor de re-verificare):
+        - varianta GetWindowDates* care nu răspunde e doar rezervă
+        - GetPreviousMeterRead așteaptă varianta GetWindowDates principală
+          și se sare cu fereastra închisă (ar întoarce HTTP 400)
+
+        Un nod care nu trimite request întoarce SKIPPED (nu e eșec); o
+        dependență eșuată se înlocuiește cu ultima ei valoare bună.
+        """
+        api = self.api_client
+        caps = self._get_capabilities()
+        probe = caps.probe_due
+
+        def _dep(deps: dict[str, Any], name: str) -> Any:
+            """Rezultatul dependenței; dacă a eșuat, ultima valoare bună."""
+            value = deps.get(name)
+            if value is SKIPPED:
+                return None
+            return value if value is not None else self._endpoints.last_good(name)
+
+        async def _previous_meter_read(deps: dict[str, Any]) -> Any:
+            if not probe and caps.skip_previous_read(_dep(deps, caps.window_primary)):
+                _LOGGER.debug(
+                    "Fereastră închisă — sar peste GetPreviousMeterRead (UAN=%s).",
+                    uan,
+                )
+                return SKIPPED
+            installation, pod_value, customer = _extract_pod_params(_dep(deps, "pods"))
+            return await api.async_fetch_previous_meter_read(
+                uan,
+                installation_number=installation,
+                pod_value=pod_value,
+                customer_number=customer,
+            )
+
+        async def _meter_counter_series(deps: dict[str, Any]) -> dict | None:
+            installation, pod_value, _ = _extract_pod_params(_dep(deps, "pods"))
+            if not installation or not pod_value:
+                _LOGGER.error(
+                    "InstallationNumber/podValue GOALE (UAN=%s)! "
+                    "GetMeterCounterSeries/GetMeterReadHistory vor eșua.",
+                    uan,
+                )
+            return await api.async_fetch_meter_counter_series(
+                uan, installation, pod_value,
+            )
+
+        async def _meter_read_history(deps: dict[str, Any]) -> dict | None:
+            # Cerere țintită pe seria activă (din GetMeterCounterSeries, în cache)
+            installation, pod_value, _ = _extract_pod_params(_dep(deps, "pods"))
+            return await self._async_fetch_read_history(
+                uan, installation, pod_value, _dep(deps, "meter_counter_series"),
+            )
+
+        window_fetchers = {
+            WINDOW_PLAIN: lambda _d: api.async_fetch_window_dates(uan, acc),
+            WINDOW_ENC: lambda _d: api.async_fetch_window_dates_enc(uan, acc),
+        }
+        fallback = None if probe else caps.window_fallback
+
+        def _window_node(name: str) -> FetchNode:
+            if name != fallback:
+                return FetchNode(name, window_fetchers[name])
+            primary = caps.window_variant
+
+            # Varianta de rezervă se cere doar dacă cea cunoscută a eșuat
+            async def _fetch_fallback(deps: dict[str, Any]) -> Any:
+                if deps[primary] is not None:
+                    return SKIPPED
+                _LOGGER.debug(
+                    "%s a eșuat — încerc %s (UAN=%s).", primary, name, uan
+                )
+                return await window_fetchers[name](deps)
+
+            return FetchNode(name, _fetch_fallback, (primary,))
+
+        def _when_changed(node: FetchNode, source: str) -> FetchNode:
+            async def _fetch(deps: dict[str, Any]) -> Any:
+                if not self._content_changed(source, deps.get(source)):
+                    return KEEP
+                _LOGGER.debug(
+                    "%s s-a schimbat — se cere și %s (UAN=%s).", source, node.name, uan
+                )
+                return await node.fetch(deps)
+
+            return FetchNode(node.name, _fetch, (*node.deps, source))
+
+        all_nodes = [
+            FetchNode("multi_meter", lambda _d: api.async_fetch_multi_meter(uan, acc)),
+            FetchNode("bill", lambda _d: api.async_fetch_bill(uan, acc)),
+            _window_node(WINDOW_ENC),
+            _window_node(WINDOW_PLAIN),
+            FetchNode("pods", lambda _d: api.async_fetch_pods(uan, acc)),
+            FetchNode(
+                "previous_meter_read",
+                _previous_meter_read,
+                ("pods",) if probe else ("pods", caps.window_primary),
+            ),
+            FetchNode("usage", lambda _d: api.async_fetch_usage(uan, acc)),
+            FetchNode(
+                "billing_history",
+                lambda _d: self._async_fetch_billing_ledger(uan, acc),
+            ),
+            FetchNode("meter_counter_series", _meter_counter_series, ("pods",)),
+            FetchNode(
+                "meter_read_history",
+                _meter_read_history,
+                ("pods", "meter_counter_series"),
+            ),
+        ]
+
+        nodes: list[FetchNode] = []
+        for node in all_nodes:
+            source = POLICIES[node.name].refetch_on_change
+            if node.name in planned:
+                nodes.append(node)
+            elif source in planned:
+                nodes.append(_when_changed(node, source))
+        return nodes
+
+    def _content_changed(self, name: str, value: Any) -> bool:
+        """True dacă răspunsul nou `value` diferă de cel din datele curente."""
+        if value is None or value is SKIPPED:
+            return False
+        previous = self._fingerprints.get(name)
+        if previous is None or self._fp_source is not self.data:
+            previous = content_fingerprint((self.data or {}).get(name))
+        return content_fingerprint(value) != previous
+
+    @property
+    def capabilities(self) -> dict[str, Any]:
+        """Capabilitățile învățate ale contului (pentru diagnostics)."""
+        return self._get_capabilities().as_dict()
+
+    def _get_capabilities(self) -> EndpointCapabilities:
+        """Capabilitățile contului (încărcate o dată din entry store)."""
+        if self._capabilities is None:
+            stored = (
+                self._entry_store.get("capabilities", self.uan)
+                if self._entry_store else None
+            )
+            self._capabilities = EndpointCapabilities(stored)
+        return self._capabilities
+
+    def _observe_capabilities(self, results: dict[str, Any], probe: bool) -> None:
+        """Învață din rezultatele refresh-ului și persistă schimbările."""
+        caps = self._get_capabilities()
+        if caps.observe(results, probe) and self._entry_store:
+            self._entry_store.async_set("capabilities", self.uan, caps.as_dict())
+
+    async def _async_fetch_billing_ledger(self, uan: str, acc: str) -> dict | None:
+        """Istoric facturi/plăți din registrul local, actualizat incremental.
+
+        Se cere doar intervalul de la ultimul document cunoscut; periodic,
+        reconciliere completă pe ultimii 2 ani. Dacă request-ul eșuează,
+        se returnează registrul existent.
+        """
+        if self._ledger is None:
+            stored = (
+                self._entry_store.get("ledger", uan) if self._entry_store else None
+            )
+            self._ledger = BillingLedger(stored)
+
+        now = datetime.now()
+        start, full = self._ledger.plan(now)
+        response = await self.api_client.async_fetch_billing_history(
+            uan, acc, start.strftime("%Y-%m-%d"), now.strftime("%Y-%m-%d")
+        )
+        if self._ledger.merge(response, start, full) and self._entry_store:
+            self._entry_store.async_set("ledger", uan, self._ledger.as_dict())
+        return self._ledger.as_response()
+
+    async def _async_fetch_read_history(
+        self,
+        uan: str,
+        installation: str,
+        pod_value: str,
+        counter_series: dict | None,
+    ) -> dict | None:
+        """Istoric citiri doar pentru seria de contor activă.
+
+        - Seriile vechi se descarcă o singură dată (cerere fără SerialNumber)
+          și se arhivează în entry store (secțiunea „read_archive").
+        - Apoi se cere doar SerialNumber=[seria activă].
+        - Dacă serverul ignoră filtrul (întoarce și alte serii sau nimic, deși
+          cererea completă are citiri pe seria activă), contul revine
+          definitiv la cererea completă.
+        - Un răspuns gol (serie fără citiri) se verifică cu cererea completă
+          doar dacă filtrul nu e confirmat și cel mult o dată pe
+          READ_HISTORY_VERIFY_INTERVAL.
+        """
+        api = self.api_client
+        wrapped = {"meter_counter_series": counter_series}
+        active = get_active_counter_series(wrapped)
+        archive = self._read_archive()
+
+        if not active or archive.get("targeted") is False:
+            self.read_history_mode = "full"
+            return await api.async_fetch_meter_read_history(
+                uan, installation, pod_value,
+            )
+
+        old_series = [s for s in get_counter_series_ids(wrapped) if s != active]
+        if any(s not in archive["archived_series"] for s in old_series):
+            # Prima dată (sau contor schimbat): cerere completă + arhivare
+            full = await api.async_fetch_meter_read_history(
+                uan, installation, pod_value,
+            )
+            if full is None:
+                return None
+            reads = get_meter_read_list({"meter_read_history": full})
+            archive["reads"] = [
+                r for r in reads if _read_series(r) != active
+            ] or archive["reads"]
+            archive["archived_series"] = old_series
+            active_reads = [r for r in reads if _read_series(r) == active]
+            # Cererea completă tocmai a confirmat (sau nu) citirile seriei active
+            archive["empty_verified_at"] = None if active_reads else time.time()
+            self._save_read_archive(uan, archive)
+            _LOGGER.debug(
+                "Istoric serii vechi arhivat (UAN=%s): %s citiri, serii=%s.",
+                uan, len(archive["reads"]), old_series,
+            )
+            self.read_history_mode = "full"
+            return _read_history_response(active_reads)
+
+        targeted = await api.async_fetch_meter_read_history(
+            uan, installation, pod_value, serial_numbers=[active],
+        )
+        if targeted is None:
+            return None
+        reads = get_meter_read_list({"meter_read_history": targeted})
+        if reads and all(_read_series(r) == active for r in reads):
+            if archive.get("targeted") is not True:
+                archive["targeted"] = True
+                self._save_read_archive(uan, archive)
+            self.read_history_mode = "targeted"
+            return targeted
+
+        if reads:
+            # Serverul a ignorat filtrul → filtrăm local, cerere completă de acum
+            self._disable_targeted_reads(uan, archive)
+            return _read_history_response(
+                [r for r in reads if _read_series(r) == active]
+            )
+
+        # Nimic pentru seria activă. Filtrul deja confirmat sau verificat
+        # recent → răspunsul gol e valid (seria nu are încă citiri)
+        verified_at = archive.get("empty_verified_at") or 0.0
+        if (
+            archive.get("targeted") is True
+            or time.time() - verified_at < READ_HISTORY_VERIFY_INTERVAL
+        ):
+            self.read_history_mode = "targeted"
+            return targeted
+
+        # Verificăm cu o cerere completă
+        full = await api.async_fetch_meter_read_history(
+            uan, installation, pod_value,
+        )
+        if full is None:
+            return None
+        self.read_history_mode = "full"
+        active_reads = [
+            r for r in get_meter_read_list({"meter_read_history": full})
+            if _read_series(r) == active
+        ]
+        if active_reads:
+            # Filtrul SerialNumber nu funcționează pentru acest cont
+            self._disable_targeted_reads(uan, archive)
+        else:
+            archive["empty_verified_at"] = time.time()
+            self._save_read_archive(uan, archive)
+        return _read_history_response(active_reads)
+
+    def _disable_targeted_reads(self, uan: str, archive: dict[str, Any]) -> None:
+        """Contul revine definitiv la cererea GetMeterReadHistory completă."""
+        _LOGGER.debug(
+            "GetMeterReadHistory ignoră SerialNumber (UAN=%s) — revin la cererea completă.",
+            uan,
+        )
+        archive["targeted"] = False
+        self._save_read_archive(uan, archive)
+        self.read_history_mode = "full"
+
+    def _read_archive(self) -> dict[str, Any]:
+        """Arhiva seriilor vechi (din entry store sau goală)."""
+        stored = (
+            self._entry_store.get("read_archive", self.uan)
+            if self._entry_store else None
+        )
+        archive = dict(stored) if isinstance(stored, dict) else {}
+        archive.setdefault("archived_series", [])
+        archive.setdefault("reads", [])
+        archive.setdefault("targeted", None)
+        return archive
+
+    def _save_read_archive(self, uan: str, archive: dict[str, Any]) -> None:
+        if self._entry_store is not None:
+            self._entry_store.async_set("read_archive", uan, archive)
+
+    # ══════════════════════════════════════════════
+    # Snapshot local (pornire instantanee după restart HA)
+    # ══════════════════════════════════════════════
+
+    def async_restore_snapshot(self) -> bool:
+        """Restaurează ultimul `data` bun salvat local.
+
+        Entitățile se pot crea imediat din snapshot; refresh-ul live
+        rulează apoi în fundal.
+
+        Returns:
+            True dacă s-a restaurat un snapshot valid (nu mai vechi de SNAPSHOT_MAX_AGE).
+        """
+        if self._entry_store is None:
+            return False
+        snapshot = self._entry_store.get("snapshot", self.uan)
+        if not isinstance(snapshot, dict):
+            return False
+
+        age = time.time() - float(snapshot.get("saved_at", 0))
+        if age > SNAPSHOT_MAX_AGE:
+            _LOGGER.debug(
+                "Snapshot prea vechi (%.0f h) — se ignoră (UAN=%s).",
+                age / 3600, self.uan,
+            )
+            return False
+
+        try:
+            data = json.loads(snapshot.get("data", ""))
+        except (TypeError, ValueError):
+            _LOGGER.warning("Snapshot corupt — se ignoră (UAN=%s).", self.uan)
+            return False
+        if not isinstance(data, dict):
+            return False
+
+        self.data = data
+        self.restored_from_snapshot = True
+        if not self.hass.is_running:
+            # Pornire HA: vârstele din snapshot rămân valabile (policy.py).
+            # La reîncărcarea manuală a integrării se cere totul din nou.
+            self._endpoints.seed(
+                data, snapshot.get("endpoints"), float(snapshot.get("saved_at", 0))
+            )
+        _LOGGER.debug(
+            "Snapshot restaurat (UAN=%s, vârstă=%.0f min).", self.uan, age / 60
+        )
+        return True
+
+    def _save_snapshot(self, data: dict) -> None:
+        """Salvează `data` în entry store, serializat compact (scriere amânată)."""
+        if self._entry_store is None:
+            return
+        self._entry_store.async_set(
+            "snapshot",
             self.uan,
-            token_data.get("user_id", "?"),
+            {
+                "saved_at": time.time(),
+                "data": json.dumps(data, separators=(",", ":"), ensure_ascii=False),
+                "endpoints": self._endpoints.as_dict(),
+            },
+        )
+
+    def _persist_token(self) -> None:
+        """Persistă token-ul curent în token store (pentru restart HA).
+
+        NU folosim config_entry.data: async_update_entry ar declanșa
+        listener-ul de opțiuni (reload complet) la fiecare re-login.
+        Scrierea pe disc e amânată (debounce) de token store.
+        """
+        if self._token_store is None:
+            return
+        token_data = self.api_client.export_token_data()
+        if token_data is None:
+            return
+
+        if self._token_store.async_set(self.api_client.username, token_data):
+            _LOGGER.debug(
+                "Token persistat în token store (UAN=%s, user_id=%s).",
+                self.uan,
+                token_data.get("user_id", "?"),
+            )
+
+
+# ══════════════════════════════════════════════
+# Refresh grupat per login (opțional)
+# ══════════════════════════════════════════════
+
+class HidroelectricaBatchCoordinator:
+    """Actualizează toate conturile unui login într-o singură trecere programată.
+
+    Coordinatoarele per cont rămân „vederi" pentru entități (fără timer
+    propriu); acesta le conduce refresh-ul:
+    - semafor comun (BATCH_CONCURRENCY conturi simultan)
+    - ordine echitabilă: punctul de start se rotește la fiecare trecere,
+      deci niciun cont nu ajunge mereu ultimul
+    - autentificare o singură dată la începutul trecerii; datele statice
+      sunt partajate prin cache-ul clientului API
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api_client: HidroelectricaApiClient,
+        coordinators: dict[str, HidroelectricaCoordinator],
+        update_interval: int,
+        concurrency: int = BATCH_CONCURRENCY,
+    ) -> None:
+        self.hass = hass
+        self.api_client = api_client
+        self.coordinators = coordinators
+        self._dense_interval = update_interval
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._lock = asyncio.Lock()
+        self._offset: int = 0
+        self._unsub: CALLBACK_TYPE | None = None
+        # Statistici ultima trecere (pentru diagnostics)
+        self.last_pass: dict[str, Any] = {}
+
+    def async_start(self) -> CALLBACK_TYPE:
+        """Pornește programarea; returnează funcția de oprire (pentru async_on_unload)."""
+        self._schedule_next()
+        return self.async_stop
+
+    def async_stop(self) -> None:
+        """Oprește timer-ul."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def _next_interval(self) -> int:
+        """Cel mai scurt interval adaptiv dintre conturi (niciun cont nu întârzie)."""
+        intervals = [c.adaptive_interval for c in self.coordinators.values()]
+        # Backend indisponibil: următoarea trecere la momentul probei breaker-ului
+        retry_in = self.api_client.unavailable_retry_in
+        if retry_in is not None:
+            intervals.append(max(int(retry_in), 1))
+        return min(intervals) if intervals else self._dense_interval
+
+    def _schedule_next(self) -> None:
+        self.async_stop()
+        self._unsub = async_call_later(
+            self.hass, self._next_interval(), self._async_scheduled_pass
         )
+
+    async def _async_scheduled_pass(self, _now: Any) -> None:
+        self._unsub = None
+        try:
+            await self.async_refresh_all()
+        finally:
+            self._schedule_next()
+
+    def _fair_order(self) -> list[str]:
+        """Ordinea conturilor pentru trecerea curentă (rotație round-robin)."""
+        uans = list(self.coordinators)
+        if not uans:
+            return []
+        start = self._offset % len(uans)
+        self._offset = start + 1
+        return uans[start:] + uans[:start]
+
+    async def async_refresh_all(self) -> None:
+        """O trecere completă peste toate conturile."""
+        if self._lock.locked():
+            _LOGGER.debug("Trecere batch deja în curs — se omite.")
+            return
+
+        async with self._lock:
+            order = self._fair_order()
+            started = time.monotonic()
+
+            # Autentificare o singură dată, înainte de fan-out
+            try:
+                await self.api_client.async_validate_session()
+            except Exception as err:  # noqa: BLE001
+                _LOGGER.warning(
+                    "Autentificare eșuată la trecerea batch (%s): %s",
+                    self.api_client.username, err,
+                )
+
+            async def _refresh_one(uan: str) -> None:
+                async with self._semaphore:
+                    # async_refresh prinde UpdateFailed și notifică entitățile
+                    await self.coordinators[uan].async_refresh()
+
+            await asyncio.gather(*(_refresh_one(uan) for uan in order))
+
+            failed = [
+                uan for uan in order
+                if not self.coordinators[uan].last_update_success
+            ]
+            self.last_pass = {
+                "order": order,
+                "duration_ms": round((time.monotonic() - started) * 1000, 1),
+                "failed": failed,
+            }
+            _LOGGER.debug(
+                "Trecere batch finalizată (%s): %s conturi, %s eșuate, %.0f ms.",
+                self.api_client.username,
+                len(order),
+                len(failed),
+                self.last_pass["duration_ms"],
+            )
@@ -0,0 +1,138 @@
+"""Parsare rapidă a datelor SEW pentru integrarea Hidroelectrica România.
+
+API-ul SEW trimite datele în mai multe formate:
+- "dd/MM/yyyy"              (citiri, plăți, facturi, MrDate)
+- "MM/dd/yyyy HH:mm:ss"     (unele câmpuri de contract)
+- "yyyy-MM-ddTHH:mm:ss[Z]"  (ISO)
+- "yyyyMMdd"                (GetBill.duedate)
+
+În loc de până la patru datetime.strptime per valoare (cu excepții ca
+flux de control), formatul se detectează după separatori și se
+construiește direct datetime(...). Rezultatele se memorează într-un
+cache LRU mărginit — istoricele conțin aceleași date la fiecare refresh.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from functools import lru_cache
+
+# Număr maxim de valori memorate per funcție de parsare
+DATE_CACHE_SIZE = 4096
+
+# "d/m/yyyy" sau "dd/mm/yyyy" (ordinea zi/lună se decide la validare)
+_SLASH_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+# "yyyy-mm-dd" cu oră opțională "Thh:mm:ss"
+_ISO_RE = re.compile(
+    r"(\d{4})-(\d{1,2})-(\d{1,2})(?:T(\d{1,2}):(\d{1,2}):(\d{1,2}))?"
+)
+
+# Formatele acceptate, în ordinea de încercare (fallback lent)
+_SEW_FORMATS = ("%d/%m/%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%m/%d/%Y")
+
+
+def _build(year: int, month: int, day: int, *time: int) -> datetime | None:
+    """datetime(...) sau None dacă data nu e validă (ex: luna 13)."""
+    try:
+        return datetime(year, month, day, *time)
+    except ValueError:
+        return None
+
+
+def _parse_slow(clean: str) -> datetime | None:
+    """Fallback: strptime pe fiecare format (valori neobișnuite)."""
+    for fmt in _SEW_FORMATS:
+        try:
+            return datetime.strptime(clean, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_sew_date(date_str: str) -> datetime | None:
+    """Parsează o dată SEW în oricare format cunoscut. None dacă eșuează.
+
+    Echivalent cu încercarea succesivă a formatelor din _SEW_FORMATS.
+    """
+    if not date_str:
+        return None
+    # Dacă conține spațiu + timp (ex: "06/15/2021 00:00:00"), trunchiem
+    clean = date_str.rstrip("Z")
+    if " " in date_str:
+        clean = clean.split(" ")[0]
+
+    match = _SLASH_RE.fullmatch(clean)
+    if match:
+        first, second, year = (int(g) for g in match.groups())
+        # dd/MM/yyyy are prioritate; MM/dd/yyyy doar dacă prima variantă e invalidă
+        return _build(year, second, first) or _build(year, first, second)
+
+    match = _ISO_RE.fullmatch(clean)
+    if match:
+        year, month, day, hour, minute, second = match.groups()
+        if hour is None:
+            return _build(int(year), int(month), int(day))
+        return _build(
+            int(year), int(month), int(day), int(hour), int(minute), int(second)
+        )
+
+    return _parse_slow(clean)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_dmy(date_str: str) -> datetime | None:
+    """Parsează strict "dd/MM/yyyy" (ex: NextMonthOpeningDate). None dacă eșuează."""
+    match = _SLASH_RE.fullmatch(date_str) if date_str else None
+    if not match:
+        return None
+    day, month, year = (int(g) for g in match.groups())
+    return _build(year, month, day)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_yyyymmdd(date_str: str) -> datetime | None:
+    """Parsează "yyyyMMdd" (GetBill.duedate). None dacă eșuează."""
+    if not date_str or len(date_str) != 8 or not date_str.isdigit():
+        return None
+    return _build(int(date_str[:4]), int(date_str[4:6]), int(date_str[6:]))
+
+
+def format_dmy(value: datetime) -> str:
+    """datetime → "dd/MM/yyyy" (fără strftime)."""
+    return f"{value.day:02d}/{value.month:02d}/{value.year:04d}"
+
+
+def format_date_display(date_str: str) -> str:
+    """Formatează o dată pentru afișare. Returnează string-ul original dacă nu poate parsa."""
+    parsed = parse_sew_date(date_str)
+    if parsed:
+        return format_dmy(parsed)
+    return date_str
+
+
+def extract_year(date_str: str) -> int | None:
+    """Extrage anul dintr-o dată dd/MM/yyyy sau yyyy-... format."""
+    parsed = parse_sew_date(date_str)
+    if parsed:
+        return parsed.year
+    if date_str and len(date_str) >= 10:
+        try:
+            return int(date_str[-4:])
+        except (ValueError, TypeError):
+            pass
+    if date_str and len(date_str) >= 4:
+        try:
+            return int(date_str[:4])
+        except (ValueError, TypeError):
+            pass
+    return None
+
+
+def format_duedate_yyyymmdd(duedate: str) -> str:
+    """Formatează duedate din format yyyyMMdd (ex: '20260316') în dd/MM/yyyy."""
+    if not duedate or len(duedate) != 8:
+        return duedate or "Necunoscut"
+    parsed = parse_yyyymmdd(duedate)
+    return format_dmy(parsed) if parsed else duedate
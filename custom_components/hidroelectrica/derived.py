@@ -0,0 +1,624 @@
+"""Model derivat per cont pentru integrarea Hidroelectrica România.
+
+Răspunsurile SEW sunt parsate O SINGURĂ DATĂ per refresh într-un
+AccountView imutabil (seria activă, citiri pe registru și an, plăți
+grupate, ultima factură), cu elementele ca modele tipizate (models.py).
+Senzorii fac doar căutări în view, nu mai re-parsează datele la fiecare
+scriere de stare.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from types import MappingProxyType
+from typing import Any, Mapping
+
+from .dates import extract_year, format_dmy, parse_dmy
+from .helpers import safe_get
+from .models import (
+    Bill,
+    CounterSeries,
+    Invoice,
+    MeterDetails,
+    MeterReading,
+    ParsedResponses,
+    Payment,
+    Pod,
+    PreviousRead,
+    UsageMonth,
+    WindowDates,
+)
+
+# ══════════════════════════════════════════════
+# Helpers pentru extragerea datelor din API
+# (structuri reale din debug JSON)
+# ══════════════════════════════════════════════
+
+def get_meter_read_list(data: dict | None) -> list:
+    """Extrage lista de citiri din GetMeterReadHistory.
+
+    Structură reală: result.Data = LIST direct cu:
+    {POD, CounterSeries, RegisterDescription, Registers, ReadingType, Date, Index}
+    """
+    if not data:
+        return []
+    mrh = data.get("meter_read_history")
+    if not mrh:
+        return []
+    mrh_data = safe_get(mrh, "result", "Data", default=[])
+    if isinstance(mrh_data, list):
+        return mrh_data
+    if isinstance(mrh_data, dict):
+        for key in ("objMeterReadHistoryData", "objMeterReadData", "objHistoryData"):
+            lst = mrh_data.get(key, [])
+            if lst:
+                return lst
+    return []
+
+
+def get_billing_list(data: dict | None) -> list:
+    """Extrage lista de facturi din GetBillingHistory.
+
+    Structură reală: result.objBillingHistoryEntity = LIST cu:
+    {amount, invoiceDate, dueDate, invoiceType, exbel, invoiceId, ...}
+    """
+    if not data:
+        return []
+    bh = data.get("billing_history")
+    if not bh:
+        return []
+    result = bh.get("result", {})
+    if not isinstance(result, dict):
+        return []
+    bh_list = result.get("objBillingHistoryEntity", [])
+    if bh_list:
+        return bh_list
+    data_inner = result.get("Data", {})
+    if isinstance(data_inner, list):
+        return data_inner
+    if isinstance(data_inner, dict):
+        for key in ("objBillingHistoryData", "objBillingData"):
+            lst = data_inner.get(key, [])
+            if lst:
+                return lst
+    return []
+
+
+def get_payment_list(data: dict | None) -> list:
+    """Extrage lista de plăți din GetBillingHistory.
+
+    Structură reală: result.objBillingPaymentHistoryEntity = LIST cu:
+    {amount, paymentDate, channel, type, status, ...}
+    """
+    if not data:
+        return []
+    bh = data.get("billing_history")
+    if not bh:
+        return []
+    result = bh.get("result", {})
+    if not isinstance(result, dict):
+        return []
+    return result.get("objBillingPaymentHistoryEntity", []) or []
+
+
+def _get_usage_list(data: dict | None) -> list:
+    """Extrage lista de consum din GetUsageGeneration.
+
+    Structură reală: result.Data.objUsageGenerationResultSetTwo = LIST cu:
+    {Month, Year, UsageDate, UsageValue, value, BillingDays, FromDate, ToDate, ...}
+    """
+    if not data:
+        return []
+    usage = data.get("usage")
+    if not usage:
+        return []
+    usage_data = safe_get(usage, "result", "Data", default={})
+    if isinstance(usage_data, dict):
+        return usage_data.get("objUsageGenerationResultSetTwo", []) or []
+    if isinstance(usage_data, list):
+        return usage_data
+    return []
+
+
+def _get_window_data(data: dict | None) -> dict:
+    """Extrage datele ferestrei de autocitire.
+
+    Structură reală: result.Data = DICT cu:
+    {OpeningDate, ClosingDate, NextMonthOpeningDate, NextMonthClosingDate, Is_Window_Open}
+    """
+    if not data:
+        return {}
+    wd = data.get("window_dates") or data.get("window_dates_enc") or {}
+    wd_data = safe_get(wd, "result", "Data", default={})
+    if isinstance(wd_data, dict):
+        return wd_data
+    return {}
+
+
+def _compute_closing_date(wd: WindowDates) -> str:
+    """Calculează data corectă de închidere a ferestrei de autocitire.
+
+    API-ul returnează:
+      - OpeningDate: "22"               (zi deschidere, luna curentă)
+      - ClosingDate: "26"               (zi închidere)
+      - NextMonthOpeningDate: "22/04/2026"  (data completă deschidere viitoare)
+      - NextMonthClosingDate: "26/03/2026"  (ATENȚIE: luna e GREȘITĂ/curentă!)
+
+    Bug Hidroelectrica: NextMonthClosingDate NU se actualizează corect —
+    rămâne pe luna curentă în loc de luna viitoare.
+
+    Soluția: calculăm durata ferestrei (ClosingDate - OpeningDate) și
+    adăugăm zilele la NextMonthOpeningDate (care e mereu corect).
+
+    Exemplu: OpeningDate="22", ClosingDate="26" → durata = 4 zile
+             NextMonthOpeningDate="22/04/2026" + 4 zile = "26/04/2026"
+    """
+    opening_day = wd.opening_date
+    closing_day = wd.closing_date
+    next_opening = wd.next_opening_date
+
+    if opening_day and closing_day and next_opening:
+        try:
+            open_d = int(opening_day)
+            close_d = int(closing_day)
+            durata = close_d - open_d
+            if durata < 0:
+                # Fereastra trece peste granița lunii (ex: 28 → 2)
+                # Estimăm ~30 zile în lună
+                durata = (30 - open_d) + close_d
+            dt_opening = parse_dmy(next_opening)
+            if dt_opening is not None:
+                return format_dmy(dt_opening + timedelta(days=durata))
+        except (ValueError, IndexError):
+            pass
+
+    # Fallback pe NextMonthClosingDate dacă calculul eșuează
+    return wd.next_closing_date
+
+
+def _get_pods_list(data: dict | None) -> list:
+    """Extrage lista de PODs din GetPods.
+
+    Structură reală: result.Data = LIST direct cu:
+    {accountID, installation, contractAccountID, pod}
+    """
+    if not data:
+        return []
+    pods = data.get("pods")
+    if not pods:
+        return []
+    pods_data = safe_get(pods, "result", "Data", default=[])
+    if isinstance(pods_data, list):
+        return pods_data
+    if isinstance(pods_data, dict):
+        return pods_data.get("objPodData", []) or []
+    return []
+
+
+def get_pods(data: dict | None) -> tuple[Pod, ...]:
+    """PODs din GetPods, ca modele (primul = cel folosit în request-uri)."""
+    return tuple(Pod.from_api(p) for p in _get_pods_list(data) if isinstance(p, dict))
+
+
+def _get_multi_meter_data(data: dict | None) -> dict:
+    """Extrage datele contorului din GetMultiMeter.
+
+    Structură reală: result.MeterDetails = LIST cu:
+    {MeterType, MeterNumber, IsAMI, Status, Address}
+    """
+    if not data:
+        return {}
+    mm = data.get("multi_meter")
+    if not mm:
+        return {}
+    result = mm.get("result", {})
+    if not isinstance(result, dict):
+        return {}
+    meter_details = result.get("MeterDetails", [])
+    if meter_details and isinstance(meter_details, list):
+        return meter_details[0]
+    return {}
+
+
+def _get_previous_read_list(data: dict | None) -> list:
+    """Extrage registrele din GetPreviousMeterRead.
+
+    Structură reală: result.Data = LIST (un element per registru) cu:
+    {contractAccountID, equipmentNo, prevMRResult, prevMRDate, prevMRRsn,
+     serialNumber, pod, distributor, supplier, distCustomer, distContract, ...}
+    """
+    if not data:
+        return []
+    prev = data.get("previous_meter_read")
+    if not prev:
+        return []
+    prev_data = safe_get(prev, "result", "Data", default=[])
+    if isinstance(prev_data, list):
+        return prev_data
+    if isinstance(prev_data, dict):
+        inner = prev_data.get("objPreviousMeterReadData", [])
+        if inner and isinstance(inner, list):
+            return inner
+        return [prev_data] if prev_data else []
+    return []
+
+
+def _get_counter_series_list(data: dict | None) -> list:
+    """Extrage lista de serii din GetMeterCounterSeries.
+
+    Structură reală: result.Data = LIST (sau dict cu objMeterCounterSeriesList):
+    {CounterSeries | MeterCounterSeriesId, MrDate, Index, ...}
+    """
+    if not data:
+        return []
+    mcs = data.get("meter_counter_series")
+    if not mcs:
+        return []
+    mcs_data = safe_get(mcs, "result", "Data", default=[])
+    if isinstance(mcs_data, dict):
+        inner = mcs_data.get("objMeterCounterSeriesList", [])
+        return inner if isinstance(inner, list) else []
+    return mcs_data if isinstance(mcs_data, list) else []
+
+
+def _counter_series(data: dict | None) -> tuple[CounterSeries, ...]:
+    """Seriile din GetMeterCounterSeries, ca modele."""
+    return tuple(
+        CounterSeries.from_api(entry)
+        for entry in _get_counter_series_list(data)
+        if isinstance(entry, dict)
+    )
+
+
+def get_counter_series_ids(data: dict | None) -> list[str]:
+    """Toate seriile de contor cunoscute (active și vechi)."""
+    ids: list[str] = []
+    for entry in _counter_series(data):
+        if entry.series and entry.series not in ids:
+            ids.append(entry.series)
+    return ids
+
+
+def _active_series(series: tuple[CounterSeries, ...]) -> str | None:
+    """Seria cu MrDate cel mai recent (None dacă nicio dată nu se parsează)."""
+    best_series = None
+    best_date = datetime.min
+    for entry in series:
+        if entry.mr_at and entry.mr_at > best_date:
+            best_date = entry.mr_at
+            best_series = entry.series
+    return best_series
+
+
+def get_active_counter_series(data: dict | None) -> str | None:
+    """Determină seria de contor activă (cea mai recentă).
+
+    Verifică meter_counter_series (GetMeterCounterSeries) care are MrDate
+    pentru fiecare serie. Seria cu MrDate mai recent este cea activă.
+    Fallback: dacă nu există meter_counter_series, returnează None
+    (și build_account_view va lua cea mai recentă citire din toate seriile).
+    """
+    return _active_series(_counter_series(data))
+
+
+def _counter_series_fallback(
+    series: tuple[CounterSeries, ...], active_series: str | None
+) -> tuple[int | None, str | None]:
+    """Fallback: ultimul index din meter_counter_series (seria activă).
+
+    Returnează (index, date_str) sau (None, None).
+    Folosit doar dacă meter_read_history nu are date.
+    """
+    if not series:
+        return None, None
+
+    target = next(
+        (s for s in series if active_series and s.series == str(active_series)),
+        series[0],
+    )
+    index = target.last_index
+    if index is None:
+        return None, None
+    return index, target.mr_date
+
+
+def _get_bill_result(data: dict | None) -> dict:
+    """Extrage result din GetBill.
+
+    Structură reală: result = DICT cu:
+    {billamount, invoicenumber, rembalance, duedate, Table1, objResponseProxy}
+    """
+    if not data:
+        return {}
+    bill = data.get("bill") or {}
+    result = bill.get("result", {})
+    return result if isinstance(result, dict) else {}
+
+
+# ══════════════════════════════════════════════
+# View imutabil per refresh
+# ══════════════════════════════════════════════
+
+_EMPTY: Mapping = MappingProxyType({})
+
+# Filtre de canal pentru plăți: plăți normale (Incasari-*) / compensații ANRE
+PAYMENT_FILTERS: tuple[str, ...] = ("normal", "comp")
+
+
+@dataclass(frozen=True, slots=True)
+class AccountView:
+    """Datele unui cont, parsate o singură dată per refresh.
+
+    Elementele sunt modele tipizate (vezi models.py), listele sunt tuple,
+    dicționarele sunt MappingProxyType. Gălețile pe an sunt deja sortate
+    cronologic.
+    """
+
+    # Fereastra de autocitire
+    window: WindowDates | None = None
+    closing_date: str = ""
+    window_is_open: bool = False
+    # Factură și contract
+    bill: Bill | None = None
+    pods: tuple[Pod, ...] = ()
+    meter: MeterDetails | None = None
+    # Un element per registru (payload-ul de autocitire); primul = previous_read
+    previous_reads: tuple[PreviousRead, ...] = ()
+    latest_invoice: Invoice | None = None
+    # Citiri contor
+    active_series: str | None = None
+    is_prosumer: bool = False
+    production_read_count: int = 0
+    # registru (None = oricare) → cea mai recentă citire pe seria activă
+    latest_reads: Mapping[str | None, MeterReading] = field(
+        default_factory=lambda: _EMPTY
+    )
+    counter_series_fallback: tuple[int | None, str | None] = (None, None)
+    # Grupări pe an
+    usage_years: Mapping[int, tuple[UsageMonth, ...]] = field(
+        default_factory=lambda: _EMPTY
+    )
+    # registru (None = fără filtru) → {an: citiri sortate pe Date}
+    meter_read_years: Mapping[
+        str | None, Mapping[int, tuple[MeterReading, ...]]
+    ] = field(default_factory=lambda: _EMPTY)
+    # filtru canal → {an: plăți sortate pe paymentDate}
+    payment_years: Mapping[str, Mapping[int, tuple[Payment, ...]]] = field(
+        default_factory=lambda: _EMPTY
+    )
+
+    @property
+    def previous_read(self) -> PreviousRead | None:
+        """Primul registru din GetPreviousMeterRead (None dacă lipsește)."""
+        return self.previous_reads[0] if self.previous_reads else None
+
+    def latest_read(self, register: str | None = None) -> MeterReading | None:
+        """Cea mai recentă citire (opțional filtrată pe registru)."""
+        return self.latest_reads.get(register)
+
+    def meter_reads_for_year(
+        self, year: int, register: str | None = None
+    ) -> tuple[MeterReading, ...]:
+        """Citirile unui an, sortate cronologic."""
+        return self.meter_read_years.get(register, _EMPTY).get(year, ())
+
+    def payments_for_year(
+        self, year: int, channel_filter: str
+    ) -> tuple[Payment, ...]:
+        """Plățile unui an (normale sau compensații), sortate cronologic."""
+        return self.payment_years.get(channel_filter, _EMPTY).get(year, ())
+
+
+EMPTY_VIEW = AccountView()
+
+
+def _freeze_years(
+    yearly: dict[int, list], sort_key: Any = None
+) -> Mapping[int, tuple]:
+    """{an: listă} → {an: tuple sortat} imutabil."""
+    return MappingProxyType({
+        year: tuple(sorted(entries, key=sort_key) if sort_key else entries)
+        for year, entries in yearly.items()
+    })
+
+
+def _read_key(read: MeterReading) -> datetime:
+    """Cheie de sortare cronologică (datetime.min dacă data lipsește)."""
+    return read.read_at or datetime.min
+
+
+def plain_window_state(window_dates: dict | None) -> bool | None:
+    """Is_Window_Open dintr-un răspuns GetWindowDates (plain).
+
+    Spre deosebire de _window_is_open, lipsa câmpului NU înseamnă „închisă":
+    None = necunoscut (răspuns lipsă, ENC sau câmp absent).
+    """
+    plain_data = safe_get(window_dates or {}, "result", "Data", default={})
+    val = plain_data.get("Is_Window_Open") if isinstance(plain_data, dict) else None
+    if val in ("0", "1"):
+        return val == "1"
+    return None
+
+
+def _window_is_open(data: dict) -> bool:
+    """Is_Window_Open din GetWindowDates (plain); fallback pe GetPreviousMeterRead.
+
+    Varianta ENC are Is_Window_Open criptat — nu o putem folosi.
+    """
+    wd_plain = data.get("window_dates") or {}
+    plain_data = safe_get(wd_plain, "result", "Data", default={})
+    if isinstance(plain_data, dict):
+        val = plain_data.get("Is_Window_Open", "0")
+        if val in ("0", "1"):
+            return val == "1"
+
+    prev = data.get("previous_meter_read")
+    if prev and isinstance(prev, dict):
+        if prev.get("status_code", 0) == 200:
+            return True
+    return False
+
+
+def _parse_models(data: dict, parsed: ParsedResponses) -> dict[str, Any]:
+    """Modelele fiecărui răspuns (reconstruite doar pentru răspunsuri noi)."""
+
+    def _dicts(items: list) -> list[dict]:
+        return [item for item in items if isinstance(item, dict)]
+
+    window_response = data.get("window_dates") or data.get("window_dates_enc")
+    billing = data.get("billing_history")
+    return {
+        "window": parsed.get(
+            "window", window_response,
+            lambda: WindowDates.from_api(wd) if (wd := _get_window_data(data)) else None,
+        ),
+        "bill": parsed.get(
+            "bill", data.get("bill"),
+            lambda: Bill.from_api(b) if (b := _get_bill_result(data)) else None,
+        ),
+        "pods": parsed.get(
+            "pods", data.get("pods"),
+            lambda: get_pods(data),
+        ),
+        "meter": parsed.get(
+            "meter", data.get("multi_meter"),
+            lambda: MeterDetails.from_api(m) if (m := _get_multi_meter_data(data)) else None,
+        ),
+        "previous_reads": parsed.get(
+            "previous_reads", data.get("previous_meter_read"),
+            lambda: tuple(
+                PreviousRead.from_api(r) for r in _dicts(_get_previous_read_list(data))
+            ),
+        ),
+        "counter_series": parsed.get(
+            "counter_series", data.get("meter_counter_series"),
+            lambda: _counter_series(data),
+        ),
+        "reads": parsed.get(
+            "reads", data.get("meter_read_history"),
+            lambda: tuple(
+                MeterReading.from_api(r) for r in _dicts(get_meter_read_list(data))
+            ),
+        ),
+        "usage": parsed.get(
+            "usage", data.get("usage"),
+            lambda: tuple(UsageMonth.from_api(u) for u in _dicts(_get_usage_list(data))),
+        ),
+        "invoices": parsed.get(
+            "invoices", billing,
+            lambda: tuple(Invoice.from_api(i) for i in _dicts(get_billing_list(data))),
+        ),
+        "payments": parsed.get(
+            "payments", billing,
+            lambda: tuple(Payment.from_api(p) for p in _dicts(get_payment_list(data))),
+        ),
+    }
+
+
+def build_account_view(
+    data: dict | None, parsed: ParsedResponses | None = None
+) -> AccountView:
+    """Construiește AccountView din coordinator.data (o dată per refresh).
+
+    Cu `parsed` (păstrat de coordinator), răspunsurile nemodificate de la
+    refresh-ul anterior nu se mai transformă în modele.
+    """
+    if not data:
+        return EMPTY_VIEW
+
+    models = _parse_models(data, parsed if parsed is not None else ParsedResponses())
+    window: WindowDates | None = models["window"]
+    counter_series: tuple[CounterSeries, ...] = models["counter_series"]
+    reads: tuple[MeterReading, ...] = models["reads"]
+    active_series = _active_series(counter_series)
+
+    # ── Citiri: seria activă (CounterSeries sau MeterCounterSeriesId) ──
+    active_reads: tuple[MeterReading, ...] = reads
+    if active_series:
+        filtered = tuple(
+            r for r in reads
+            if r.counter_series == active_series
+            or r.meter_counter_series_id == active_series
+        )
+        if filtered:
+            active_reads = filtered
+
+    # Cea mai recentă citire (data e deja parsată în model)
+    latest_reads: dict[str | None, MeterReading] = {}
+    if active_reads:
+        latest_reads[None] = max(active_reads, key=_read_key)
+        by_register: dict[str, list[MeterReading]] = defaultdict(list)
+        for r in active_reads:
+            if r.registers:
+                by_register[r.registers].append(r)
+        for register, lst in by_register.items():
+            latest_reads[register] = max(lst, key=_read_key)
+
+    # ── Citiri pe an: doar CounterSeries (fără fallback), ca în arhive ──
+    archive_reads = reads
+    if active_series:
+        archive_reads = tuple(r for r in reads if r.counter_series == active_series)
+    registers = {r.registers for r in archive_reads if r.registers}
+    meter_read_years: dict[str | None, Mapping[int, tuple]] = {}
+    for register in (None, *registers):
+        yearly: dict[int, list] = defaultdict(list)
+        for r in archive_reads:
+            if register is not None and r.registers != register:
+                continue
+            year = r.read_at.year if r.read_at else extract_year(r.date)
+            if year:
+                yearly[year].append(r)
+        meter_read_years[register] = _freeze_years(yearly, _read_key)
+
+    # ── Plăți pe an (normale / compensații) ──
+    payment_years: dict[str, Mapping[int, tuple]] = {}
+    for channel_filter in PAYMENT_FILTERS:
+        comp = channel_filter == "comp"
+        yearly = defaultdict(list)
+        for p in models["payments"]:
+            if p.is_compensation != comp:
+                continue
+            year = p.paid_at.year if p.paid_at else extract_year(p.payment_date)
+            if year:
+                yearly[year].append(p)
+        payment_years[channel_filter] = _freeze_years(
+            yearly, lambda p: p.paid_at or datetime.min
+        )
+
+    # ── Consum pe an ──
+    usage_years: dict[int, list] = defaultdict(list)
+    for month in models["usage"]:
+        if month.year:
+            usage_years[month.year].append(month)
+
+    # ── Ultima factură emisă ──
+    invoices: tuple[Invoice, ...] = models["invoices"]
+    latest_invoice = (
+        max(invoices, key=lambda i: i.invoiced_at or datetime.min)
+        if invoices else None
+    )
+
+    production_read_count = sum(1 for r in reads if r.registers == "1.8.0_P")
+
+    return AccountView(
+        window=window,
+        closing_date=_compute_closing_date(window) if window else "",
+        window_is_open=_window_is_open(data),
+        bill=models["bill"],
+        pods=models["pods"],
+        meter=models["meter"],
+        previous_reads=models["previous_reads"],
+        latest_invoice=latest_invoice,
+        active_series=active_series,
+        is_prosumer=production_read_count > 0,
+        production_read_count=production_read_count,
+        latest_reads=MappingProxyType(latest_reads),
+        counter_series_fallback=_counter_series_fallback(
+            counter_series, active_series
+        ),
+        usage_years=_freeze_years(usage_years, lambda m: m.month),
+        meter_read_years=MappingProxyType(meter_read_years),
+        payment_years=MappingProxyType(payment_years),
+    )
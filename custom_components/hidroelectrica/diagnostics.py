@@ -4,6 +4,7 @@ Diagnosticare pentru integrarea Hidroelectrica România.
 Exportă informații de diagnostic pentru support tickets:
 - Licență (fingerprint, status, cheie mascată)
 - Conturi active și coordinatoare
+- Statistici client API (request-uri efective / unite, cache)
 - Starea senzorilor
 
 Datele sensibile (parolă, token-uri) sunt excluse.
@@ -45,8 +46,36 @@ async def async_get_config_entry_diagnostics(
             coordinators_info[uan] = {
                 "account_number": getattr(coordinator, "account_number", ""),
                 "last_update_success": coordinator.last_update_success,
+                "fetch_timings": getattr(coordinator, "fetch_timings", {}),
+                "adaptive_interval": getattr(coordinator, "adaptive_interval", None),
+                "adaptive_reason": getattr(coordinator, "adaptive_reason", ""),
+                "read_history_mode": getattr(coordinator, "read_history_mode", ""),
+                "refresh_plan": getattr(coordinator, "refresh_plan", {}),
+                "changed_keys": sorted(getattr(coordinator, "changed_keys", ())),
+                "endpoints": getattr(coordinator, "endpoint_states", {}),
+                "capabilities": getattr(coordinator, "capabilities", {}),
+                "restored_from_snapshot": getattr(
+                    coordinator, "restored_from_snapshot", False
+                ),
             }
 
+    # ── Client API (statistici request-uri) ──
+    api_info: dict[str, Any] = {}
+    api_client = getattr(runtime, "api_client", None) if runtime else None
+    if api_client is not None:
+        api_info["request_stats"] = api_client.request_stats
+        api_info["cache_stats"] = api_client.cache_stats
+        api_info["token_lifetime"] = api_client.token_lifetime
+        api_info["limiter_stats"] = api_client.limiter_stats
+        api_info["latency_stats"] = api_client.latency_stats
+        api_info["breaker_stats"] = api_client.breaker_stats
+    batch = getattr(runtime, "batch_coordinator", None) if runtime else None
+    if batch is not None:
+        api_info["batch_last_pass"] = batch.last_pass
+    http_stats = getattr(runtime, "http_stats", None) if runtime else None
+    if http_stats is not None:
+        api_info["http_session_stats"] = http_stats.stats
+
     # ── Senzori activi ──
     senzori_activi = sorted(
         entitate.entity_id
@@ -62,10 +91,12 @@ async def async_get_config_entry_diagnostics(
             "domeniu": DOMAIN,
             "username": _mascheaza_email(entry.data.get("username", "")),
             "update_interval": entry.data.get("update_interval"),
+            "batch_refresh": entry.data.get("batch_refresh", False),
             "selected_accounts": entry.data.get("selected_accounts", []),
         },
         "licenta": licenta_info,
         "conturi": coordinators_info,
+        "api": api_info,
         "stare": {
             "senzori_activi": len(senzori_activi),
             "lista_senzori": senzori_activi,
@@ -0,0 +1,172 @@
+"""Prospețimea datelor per endpoint pentru integrarea Hidroelectrica România.
+
+Un request eșuat (timeout, HTTP 400 / 500 → None) nu mai golește cheia
+lui din coordinator.data. Pentru fiecare endpoint se păstrează:
+- ultima valoare bună și momentul în care a sosit (fetched_at)
+- numărul de eșecuri consecutive
+
+Un eșec servește în continuare ultima valoare bună, cel mult
+ENDPOINT_MAX_STALENESS secunde (stale-while-revalidate). Endpoint-urile
+eșuate se reîncearcă separat, cu backoff scurt (ENDPOINT_RETRY_BASE,
+dublat la fiecare eșec), de cel mult ENDPOINT_RETRY_LIMIT ori — fără să
+aștepte intervalul complet de actualizare.
+
+Momentele fetched_at se salvează împreună cu snapshot-ul coordinatorului.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any
+
+from .const import (
+    ENDPOINT_MAX_STALENESS,
+    ENDPOINT_MAX_STALENESS_DEFAULT,
+    ENDPOINT_RETRY_BASE,
+    ENDPOINT_RETRY_LIMIT,
+    ENDPOINT_RETRY_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class _Marker:
+    """Rezultat special al unui nod din graf (nu e un răspuns API)."""
+
+    __slots__ = ("_name",)
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __repr__(self) -> str:
+        return self._name
+
+
+# Nodul nu a trimis request (sărit intenționat, nu eșuat) → None
+SKIPPED: Any = _Marker("SKIPPED")
+# Nodul nu a avut nevoie de date noi → rămâne valoarea curentă
+KEEP: Any = _Marker("KEEP")
+
+
+@dataclass(slots=True)
+class EndpointState:
+    """Starea unui endpoint: ultima valoare bună și eșecurile de după ea."""
+
+    value: Any = None
+    # time.time() la ultimul răspuns bun (None = niciodată)
+    fetched_at: float | None = None
+    # Eșecuri consecutive de la ultimul răspuns bun
+    errors: int = 0
+    failed_at: float | None = None
+
+    def age(self, now: float) -> float | None:
+        return None if self.fetched_at is None else now - self.fetched_at
+
+    def retry_at(self) -> float | None:
+        """Momentul următoarei reîncercări (None = nu se reîncearcă)."""
+        if not self.errors or self.errors > ENDPOINT_RETRY_LIMIT:
+            return None
+        backoff = min(ENDPOINT_RETRY_BASE * 2 ** (self.errors - 1), ENDPOINT_RETRY_MAX)
+        return (self.failed_at or 0.0) + backoff
+
+
+def max_staleness(name: str) -> int:
+    """Cât timp (secunde) se servește ultima valoare bună după un eșec."""
+    return ENDPOINT_MAX_STALENESS.get(name, ENDPOINT_MAX_STALENESS_DEFAULT)
+
+
+class EndpointStates:
+    """Stările endpoint-urilor unui cont (UAN)."""
+
+    def __init__(self) -> None:
+        self._states: dict[str, EndpointState] = {}
+
+    def seed(
+        self, data: dict[str, Any], stored: dict[str, Any] | None, saved_at: float
+    ) -> None:
+        """Pornește din snapshot: valorile din `data`, momentele din `stored`.
+
+        Fără momente salvate (snapshot vechi), se folosește saved_at.
+        """
+        stored = stored if isinstance(stored, dict) else {}
+        for name, value in data.items():
+            if value is None:
+                continue
+            fetched_at = stored.get(name, {}).get("fetched_at")
+            self._states[name] = EndpointState(
+                value=value,
+                fetched_at=float(fetched_at) if fetched_at else saved_at,
+            )
+
+    def record(self, name: str, value: Any, now: float) -> Any:
+        """Înregistrează rezultatul unui nod; returnează valoarea de servit.
+
+        - SKIPPED: nu s-a trimis request → None, starea se uită
+        - valoare: răspuns bun → devine ultima valoare bună
+        - None: eșec → ultima valoare bună, dacă nu e mai veche de
+          max_staleness(name)
+        """
+        if value is SKIPPED:
+            self._states.pop(name, None)
+            return None
+        if value is not None:
+            self._states[name] = EndpointState(value=value, fetched_at=now)
+            return value
+
+        state = self._states.setdefault(name, EndpointState())
+        state.errors += 1
+        state.failed_at = now
+        age = state.age(now)
+        if age is None or age > max_staleness(name):
+            state.value = None
+            return None
+        _LOGGER.debug(
+            "%s a eșuat (%s× consecutiv) — se păstrează valoarea de acum %.0f min.",
+            name, state.errors, age / 60,
+        )
+        return state.value
+
+    def last_good(self, name: str) -> Any:
+        """Ultima valoare bună încă servită (None dacă lipsește / a expirat)."""
+        state = self._states.get(name)
+        return state.value if state is not None else None
+
+    def fetched_at(self, name: str) -> float | None:
+        """Momentul ultimului răspuns bun (None = niciodată / uitat)."""
+        state = self._states.get(name)
+        return state.fetched_at if state is not None else None
+
+    def pending_retry(self) -> tuple[list[str], float | None]:
+        """(endpoint-uri de reîncercat, momentul celei mai apropiate reîncercări)."""
+        names: list[str] = []
+        earliest: float | None = None
+        for name, state in self._states.items():
+            retry_at = state.retry_at()
+            if retry_at is None:
+                continue
+            names.append(name)
+            earliest = retry_at if earliest is None else min(earliest, retry_at)
+        return names, earliest
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Momentele salvate împreună cu snapshot-ul (serializabile JSON)."""
+        return {
+            name: {"fetched_at": state.fetched_at}
+            for name, state in self._states.items()
+            if state.fetched_at is not None
+        }
+
+    def stats(self, now: float) -> dict[str, dict[str, Any]]:
+        """Vârsta și eșecurile per endpoint (pentru diagnostics)."""
+        result: dict[str, dict[str, Any]] = {}
+        for name, state in self._states.items():
+            age = state.age(now)
+            retry_at = state.retry_at()
+            result[name] = {
+                "age_s": None if age is None else round(age),
+                "errors": state.errors,
+                "stale": bool(state.errors) and state.value is not None,
+                "retry_in_s": None if retry_at is None else max(0, round(retry_at - now)),
+            }
+        return result
@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 from datetime import datetime
 from typing import Any
 
 from homeassistant.helpers.selector import SelectOptionDict
 
+try:
+    import orjson as _orjson
+except ImportError:  # pragma: no cover
+    _orjson = None
+
+from .dates import format_dmy, parse_sew_date
+
 
 # ══════════════════════════════════════════════
 # Mapping-uri luni și tipuri citire
@@ -114,9 +123,12 @@ def parse_romanian_amount(value_str: str) -> float:
         raise ValueError(f"Cannot parse Romanian amount: {value_str}") from exc
 
 
+_ISO_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
 def format_date_ro(
     date_str: str,
-    input_format: str = "%Y-%m-%dT%H:%M:%S"
+    input_format: str = _ISO_FORMAT
 ) -> str:
     """Convertește data din ISO format la "dd/MM/yyyy".
 
@@ -130,10 +142,17 @@ def format_date_ro(
     Raises:
         ValueError: Dacă date_str nu poate fi parsat
     """
+    # Eliminează Z din finalul stringului dacă există
+    if date_str.endswith("Z"):
+        date_str = date_str[:-1]
+
+    # Cale rapidă (memorată) pentru formatul implicit ISO
+    if input_format == _ISO_FORMAT and "T" in date_str:
+        parsed = parse_sew_date(date_str)
+        if parsed is not None:
+            return format_dmy(parsed)
+
     try:
-        # Eliminează Z din finalul stringului dacă există
-        if date_str.endswith("Z"):
-            date_str = date_str[:-1]
         parsed_date = datetime.strptime(date_str, input_format)
         return parsed_date.strftime("%d/%m/%Y")
     except ValueError as exc:
@@ -166,6 +185,21 @@ def safe_get(data: Any, *keys: str, default: Any = None) -> Any:
     return current if current is not None else default
 
 
+def content_fingerprint(value: Any) -> str:
+    """Amprentă scurtă a conținutului unui răspuns JSON (chei sortate).
+
+    Două răspunsuri cu același conținut au aceeași amprentă, indiferent de
+    ordinea cheilor sau de obiectul Python care le conține.
+    """
+    if _orjson is not None:
+        raw = _orjson.dumps(
+            value, option=_orjson.OPT_SORT_KEYS | _orjson.OPT_NON_STR_KEYS
+        )
+    else:
+        raw = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+
 # ══════════════════════════════════════════════
 # Funcții pentru configurare conturi
 # ══════════════════════════════════════════════
@@ -0,0 +1,91 @@
+"""Latențe observate per endpoint pentru integrarea Hidroelectrica România.
+
+Un singur API_TIMEOUT pentru GetId (răspuns mic) și pentru
+GetUsageGeneration / GetBillingHistoryList (răspunsuri mari) e fie prea
+lung, fie prea scurt. Clientul API păstrează ultimele LATENCY_WINDOW
+durate per endpoint și derivă din ele:
+- timeout-ul: percentila API_TIMEOUT_PERCENTILE × API_TIMEOUT_FACTOR,
+  între API_TIMEOUT_FLOOR și API_TIMEOUT_CEILING
+- întârzierea de hedging: percentila 95, dar minim API_HEDGE_MIN_DELAY
+  (după ea se poate trimite un duplicat pentru citirile idempotente)
+
+Un request expirat se înregistrează cu durata egală cu timeout-ul, deci
+timeout-ul crește singur pentru endpoint-urile care chiar sunt lente.
+Până la LATENCY_MIN_SAMPLES observații se folosesc valorile implicite.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+
+from .const import (
+    API_HEDGE_MIN_DELAY,
+    API_TIMEOUT,
+    API_TIMEOUT_CEILING,
+    API_TIMEOUT_DEFAULTS,
+    API_TIMEOUT_FACTOR,
+    API_TIMEOUT_FLOOR,
+    API_TIMEOUT_PERCENTILE,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW,
+)
+
+HEDGE_PERCENTILE = 0.95
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Percentila q (0..1) prin interpolare liniară (listă sortată, nevidă)."""
+    pos = (len(sorted_values) - 1) * q
+    low = int(pos)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (pos - low)
+
+
+class LatencyTracker:
+    """Fereastră glisantă de durate (secunde) per endpoint."""
+
+    def __init__(self) -> None:
+        self._samples: dict[str, deque[float]] = {}
+
+    def record(self, endpoint: str, seconds: float) -> None:
+        window = self._samples.get(endpoint)
+        if window is None:
+            window = self._samples[endpoint] = deque(maxlen=LATENCY_WINDOW)
+        window.append(seconds)
+
+    def percentile(self, endpoint: str, q: float) -> float | None:
+        """Percentila q a duratelor; None sub LATENCY_MIN_SAMPLES observații."""
+        window = self._samples.get(endpoint)
+        if not window or len(window) < LATENCY_MIN_SAMPLES:
+            return None
+        return _percentile(sorted(window), q)
+
+    def timeout_for(self, endpoint: str) -> float:
+        """Timeout-ul (secunde) pentru următorul request la endpoint."""
+        high = self.percentile(endpoint, API_TIMEOUT_PERCENTILE)
+        if high is None:
+            return float(API_TIMEOUT_DEFAULTS.get(endpoint, API_TIMEOUT))
+        return min(API_TIMEOUT_CEILING, max(API_TIMEOUT_FLOOR, high * API_TIMEOUT_FACTOR))
+
+    def hedge_delay(self, endpoint: str) -> float | None:
+        """După cât timp merită un duplicat (p95, minim API_HEDGE_MIN_DELAY).
+
+        None dacă nu avem destule date.
+        """
+        p95 = self.percentile(endpoint, HEDGE_PERCENTILE)
+        return None if p95 is None else max(p95, API_HEDGE_MIN_DELAY)
+
+    @property
+    def stats(self) -> dict[str, dict[str, float | int]]:
+        """p50 / p95 / p99 (ms) și timeout-ul curent, per endpoint."""
+        result: dict[str, dict[str, float | int]] = {}
+        for endpoint, window in self._samples.items():
+            ordered = sorted(window)
+            result[endpoint] = {
+                "samples": len(ordered),
+                "p50_ms": round(_percentile(ordered, 0.5) * 1000, 1),
+                "p95_ms": round(_percentile(ordered, 0.95) * 1000, 1),
+                "p99_ms": round(_percentile(ordered, 0.99) * 1000, 1),
+                "timeout_s": round(self.timeout_for(endpoint), 1),
+            }
+        return result
@@ -0,0 +1,177 @@
+"""Registru local de facturi și plăți pentru integrarea Hidroelectrica România.
+
+GetBillingHistoryList returnează facturile (objBillingHistoryEntity) și
+plățile (objBillingPaymentHistoryEntity) dintr-un interval de date.
+În loc să cerem aceiași 2 ani la fiecare refresh greu:
+- documentele se păstrează local, indexate pe invoiceId / identitatea plății
+- refresh-ul incremental cere doar intervalul de la ultimul document
+  cunoscut (cu o suprapunere pentru documente întârziate)
+- periodic se face o reconciliere completă pe fereastra de 2 ani, în care
+  serverul e autoritar; documentele mai vechi rămân în registru
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from .const import (
+    LEDGER_FULL_WINDOW_DAYS,
+    LEDGER_OVERLAP_DAYS,
+    LEDGER_RECONCILE_INTERVAL,
+)
+from .dates import parse_sew_date
+from .derived import get_billing_list, get_payment_list
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _invoice_key(entry: dict) -> str:
+    """Identitatea unei facturi: invoiceId (fallback: dată + sumă + tip)."""
+    invoice_id = entry.get("invoiceId")
+    if invoice_id:
+        return str(invoice_id)
+    return "|".join(
+        str(entry.get(k, "")) for k in ("invoiceDate", "amount", "invoiceType")
+    )
+
+
+def _payment_keys(entries: list[dict]) -> list[str]:
+    """Identitatea plăților (nu au ID): dată + sumă + canal + tip + nr. apariție.
+
+    Numărul de apariție deosebește două plăți identice în aceeași zi.
+    """
+    seen: dict[str, int] = {}
+    keys: list[str] = []
+    for entry in entries:
+        base = "|".join(
+            str(entry.get(k, ""))
+            for k in ("paymentDate", "amount", "channel", "type")
+        )
+        seen[base] = seen.get(base, 0) + 1
+        keys.append(f"{base}#{seen[base]}")
+    return keys
+
+
+def _doc_date(entry: dict, field: str) -> datetime | None:
+    return parse_sew_date(str(entry.get(field, "")))
+
+
+class BillingLedger:
+    """Registru append-only de facturi și plăți pentru un cont (UAN)."""
+
+    def __init__(self, stored: dict[str, Any] | None = None) -> None:
+        stored = stored if isinstance(stored, dict) else {}
+        self._invoices: dict[str, dict] = dict(stored.get("invoices", {}))
+        self._payments: dict[str, dict] = dict(stored.get("payments", {}))
+        self._last_full: float = float(stored.get("last_full", 0))
+
+    @property
+    def is_empty(self) -> bool:
+        return not self._invoices and not self._payments
+
+    def as_dict(self) -> dict[str, Any]:
+        """Structura salvată în entry store (serializabilă JSON)."""
+        return {
+            "invoices": self._invoices,
+            "payments": self._payments,
+            "last_full": self._last_full,
+        }
+
+    def plan(self, now: datetime) -> tuple[datetime, bool]:
+        """Intervalul de cerut: (data de început, reconciliere completă?)."""
+        full_start = now - timedelta(days=LEDGER_FULL_WINDOW_DAYS)
+        if self.is_empty or time.time() - self._last_full > LEDGER_RECONCILE_INTERVAL:
+            return full_start, True
+
+        newest = max(
+            (
+                d
+                for d in [
+                    *(_doc_date(e, "invoiceDate") for e in self._invoices.values()),
+                    *(_doc_date(e, "paymentDate") for e in self._payments.values()),
+                ]
+                if d is not None
+            ),
+            default=None,
+        )
+        if newest is None:
+            return full_start, True
+
+        start = min(newest, now) - timedelta(days=LEDGER_OVERLAP_DAYS)
+        return max(start, full_start), False
+
+    def merge(self, response: dict | None, start: datetime, full: bool) -> bool:
+        """Integrează răspunsul GetBillingHistoryList în registru.
+
+        Incremental: doar adaugă / actualizează. Reconciliere completă:
+        documentele din [start, azi] care nu mai apar la server se elimină.
+
+        Returns:
+            True dacă răspunsul a fost valid și s-a integrat.
+        """
+        if not response or not isinstance(response.get("result"), dict):
+            return False
+
+        wrapped = {"billing_history": response}
+        invoices = {_invoice_key(e): e for e in get_billing_list(wrapped)}
+        payment_list = get_payment_list(wrapped)
+        payments = dict(zip(_payment_keys(payment_list), payment_list))
+
+        # Un răspuns complet gol nu șterge nimic (eroare server mascată)
+        if full and (invoices or payments):
+            self._drop_missing(self._invoices, invoices, "invoiceDate", start)
+            self._drop_missing(self._payments, payments, "paymentDate", start)
+        if full:
+            self._last_full = time.time()
+
+        added = (len(invoices.keys() - self._invoices.keys()),
+                 len(payments.keys() - self._payments.keys()))
+        self._invoices.update(invoices)
+        self._payments.update(payments)
+
+        _LOGGER.debug(
+            "Registru facturi: %s (de la %s): +%s facturi, +%s plăți "
+            "(total %s facturi, %s plăți).",
+            "reconciliere completă" if full else "incremental",
+            start.strftime("%Y-%m-%d"),
+            added[0], added[1],
+            len(self._invoices), len(self._payments),
+        )
+        return True
+
+    @staticmethod
+    def _drop_missing(
+        current: dict[str, dict],
+        fresh: dict[str, dict],
+        date_field: str,
+        start: datetime,
+    ) -> None:
+        """Elimină documentele din fereastră pe care serverul nu le mai raportează."""
+        for key in [k for k in current if k not in fresh]:
+            parsed = _doc_date(current[key], date_field)
+            if parsed is not None and parsed >= start:
+                del current[key]
+
+    def as_response(self) -> dict | None:
+        """Răspuns sintetic în formatul GetBillingHistoryList (cele mai noi primele)."""
+        if self.is_empty:
+            return None
+
+        def _sorted(docs: dict[str, dict], date_field: str) -> list[dict]:
+            return sorted(
+                docs.values(),
+                key=lambda e: _doc_date(e, date_field) or datetime.min,
+                reverse=True,
+            )
+
+        return {
+            "result": {
+                "objBillingHistoryEntity": _sorted(self._invoices, "invoiceDate"),
+                "objBillingPaymentHistoryEntity": _sorted(
+                    self._payments, "paymentDate"
+                ),
+            }
+        }
@@ -0,0 +1,180 @@
+"""Limitator global de request-uri către ihidro.ro (Hidroelectrica România).
+
+Toți clienții API din proces (toate login-urile, toate conturile) trec
+prin același limitator:
+- maxim UPSTREAM_MAX_INFLIGHT request-uri HTTP simultan
+- buget de UPSTREAM_RATE request-uri/secundă (token bucket, rafală
+  de maxim UPSTREAM_BURST)
+- benzi de prioritate: interactiv (autocitire, login) înaintea
+  refresh-ului normal, iar acesta înaintea istoricelor grele
+
+Cererile așteaptă într-o coadă ordonată după (bandă, ordinea sosirii).
+Timpii de așteptare se expun per bandă (pentru diagnostics).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .const import UPSTREAM_BURST, UPSTREAM_MAX_INFLIGHT, UPSTREAM_RATE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Benzi de prioritate (valoare mică = servită prima)
+LANE_INTERACTIVE = 0
+LANE_NORMAL = 1
+LANE_BACKGROUND = 2
+
+_LANE_NAMES = {
+    LANE_INTERACTIVE: "interactive",
+    LANE_NORMAL: "normal",
+    LANE_BACKGROUND: "background",
+}
+
+
+class UpstreamLimiter:
+    """Semafor cu priorități + token bucket, partajat de toți clienții API."""
+
+    def __init__(self, max_inflight: int, rate: float, burst: int) -> None:
+        self._max_inflight = max_inflight
+        self._rate = rate
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._inflight = 0
+        # (bandă, nr. sosire, future) — heap
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._stats: dict[int, dict[str, float]] = {
+            lane: {"granted": 0, "queued": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0}
+            for lane in _LANE_NAMES
+        }
+
+    @asynccontextmanager
+    async def slot(self, lane: int = LANE_NORMAL) -> AsyncIterator[None]:
+        """Ocupă un loc pentru un request HTTP (eliberat la ieșire)."""
+        started = time.monotonic()
+        self._refill()
+        if not self._waiters and self._can_grant():
+            self._take()
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (lane, next(self._arrivals), waiter))
+            self._stats[lane]["queued"] += 1
+            self._dispatch()
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Locul a fost acordat chiar înainte de anulare → îl eliberăm
+                if waiter.done() and not waiter.cancelled():
+                    self._release()
+                raise
+
+        self._record_wait(lane, (time.monotonic() - started) * 1000)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Timpi de așteptare per bandă + starea curentă."""
+        result: dict[str, dict[str, float]] = {}
+        for lane, name in _LANE_NAMES.items():
+            lane_stats = self._stats[lane]
+            granted = lane_stats["granted"]
+            result[name] = {
+                **lane_stats,
+                "wait_ms_avg": round(lane_stats["wait_ms_total"] / granted, 1)
+                if granted else 0.0,
+            }
+        result["current"] = {
+            "inflight": self._inflight,
+            "waiting": sum(1 for *_, w in self._waiters if not w.done()),
+            "tokens": round(self._tokens, 2),
+        }
+        return result
+
+    # ──────────────────────────────────────────
+    # Intern
+    # ──────────────────────────────────────────
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._refilled_at) * self._rate
+        )
+        self._refilled_at = now
+
+    def _can_grant(self) -> bool:
+        return self._inflight < self._max_inflight and self._tokens >= 1
+
+    def _take(self) -> None:
+        self._tokens -= 1
+        self._inflight += 1
+
+    def _release(self) -> None:
+        self._inflight -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Acordă locuri celor din coadă, în ordinea priorității."""
+        self._refill()
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                # Apelant anulat în timp ce aștepta
+                heapq.heappop(self._waiters)
+                continue
+            if self._inflight >= self._max_inflight:
+                return
+            if self._tokens < 1:
+                self._schedule_refill()
+                return
+            heapq.heappop(self._waiters)
+            self._take()
+            waiter.set_result(None)
+
+    def _schedule_refill(self) -> None:
+        """Re-încearcă dispecerizarea când bucket-ul are din nou un token."""
+        if self._timer is not None:
+            return
+        delay = (1 - self._tokens) / self._rate
+
+        def _on_timer() -> None:
+            self._timer = None
+            self._dispatch()
+
+        self._timer = asyncio.get_running_loop().call_later(delay, _on_timer)
+
+    def _record_wait(self, lane: int, wait_ms: float) -> None:
+        lane_stats = self._stats[lane]
+        lane_stats["granted"] += 1
+        lane_stats["wait_ms_total"] = round(lane_stats["wait_ms_total"] + wait_ms, 1)
+        if wait_ms > lane_stats["wait_ms_max"]:
+            lane_stats["wait_ms_max"] = round(wait_ms, 1)
+        if wait_ms > 1000:
+            _LOGGER.debug(
+                "Request în coadă %.0f ms (bandă %s, în curs=%s).",
+                wait_ms, _LANE_NAMES[lane], self._inflight,
+            )
+
+
+_UPSTREAM_LIMITER: UpstreamLimiter | None = None
+
+
+def get_upstream_limiter() -> UpstreamLimiter:
+    """Limitatorul unic al procesului (creat la primul apel)."""
+    global _UPSTREAM_LIMITER  # noqa: PLW0603
+    if _UPSTREAM_LIMITER is None:
+        _UPSTREAM_LIMITER = UpstreamLimiter(
+            UPSTREAM_MAX_INFLIGHT, UPSTREAM_RATE, UPSTREAM_BURST
+        )
+    return _UPSTREAM_LIMITER
@@ -0,0 +1,383 @@
+"""Modele tipizate pentru răspunsurile SEW (Hidroelectrica România).
+
+Fiecare element dintr-un răspuns (POD, citire, serie de contor, factură,
+plată, lună de consum, fereastră de autocitire) devine un dataclass cu
+__slots__, construit o singură dată per răspuns:
+- doar câmpurile folosite de senzori / buton, cu nume stabile
+- datele calendaristice și sumele parsate la construire, nu la fiecare
+  scriere de stare
+- fără dicționar per instanță (memorie mai mică decât dict-ul brut)
+
+ParsedResponses memorează modelele per răspuns: un răspuns nemodificat
+(endpoint neplanificat, cache API) nu se re-parsează. Răspunsurile brute rămân
+forma persistată (snapshot, diagnostics, registre locale).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, ClassVar, Mapping, TypeVar
+
+from .dates import parse_sew_date
+from .helpers import parse_romanian_amount
+
+_T = TypeVar("_T")
+
+
+def _text(value: Any) -> str:
+    """Valoare SEW → str ("" pentru None)."""
+    return "" if value is None else str(value)
+
+
+def _amount(value: Any) -> float | None:
+    """Sumă în format românesc → float (None dacă nu se poate parsa)."""
+    try:
+        return parse_romanian_amount(str(value))
+    except (ValueError, TypeError):
+        return None
+
+
+# ══════════════════════════════════════════════
+# Contract / contor
+# ══════════════════════════════════════════════
+
+@dataclass(frozen=True, slots=True)
+class Pod:
+    """Un element din GetPods (result.Data)."""
+
+    pod: str = ""
+    installation: str = ""
+    contract_account_id: str = ""
+    account_id: str = ""
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> Pod:
+        return cls(
+            pod=_text(raw.get("pod", raw.get("podValue"))),
+            installation=_text(
+                raw.get("installation", raw.get("InstallationNumber"))
+            ),
+            contract_account_id=_text(raw.get("contractAccountID")),
+            account_id=_text(raw.get("accountID")),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class MeterDetails:
+    """Primul element din GetMultiMeter (result.MeterDetails)."""
+
+    meter_type: str = ""
+    meter_number: str = ""
+    is_ami: bool | None = None
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> MeterDetails:
+        is_ami = raw.get("IsAMI")
+        return cls(
+            meter_type=_text(raw.get("MeterType")),
+            meter_number=_text(raw.get("MeterNumber")),
+            is_ami=None if is_ami is None else bool(is_ami),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PreviousRead:
+    """Un registru din GetPreviousMeterRead (result.Data).
+
+    Păstrează toate câmpurile necesare payload-ului de autocitire
+    (UsageSelfMeterReadEntity) — vezi as_api_dict.
+    """
+
+    contract_account_id: str | None = None
+    account_id: str | None = None
+    equipment_no: str | None = None
+    register_no: str | None = None
+    register_type: str | None = None
+    uom: str | None = None
+    pre_decimals: str | None = None
+    post_decimals: str | None = None
+    no_mr_order: str | None = None
+    prev_mr_result: Any = None
+    prev_mr_date: str | None = None
+    prev_mr_rsn: str | None = None
+    prev_mr_cat: str | None = None
+    serial_number: str | None = None
+    pod: str | None = None
+    register_cat: str | None = None
+    distributor: str | None = None
+    meter_interval: str | None = None
+    supplier: str | None = None
+    dist_customer: str | None = None
+    dist_customer_id: str | None = None
+    dist_contract: str | None = None
+    dist_contract_date: str | None = None
+
+    # atribut → cheie API (identică cu cea din răspuns și din payload)
+    API_KEYS: ClassVar[dict[str, str]] = {
+        "contract_account_id": "contractAccountID",
+        "account_id": "accountID",
+        "equipment_no": "equipmentNo",
+        "register_no": "registerNo",
+        "register_type": "registerType",
+        "uom": "uom",
+        "pre_decimals": "preDecimals",
+        "post_decimals": "postDecimals",
+        "no_mr_order": "noMROrder",
+        "prev_mr_result": "prevMRResult",
+        "prev_mr_date": "prevMRDate",
+        "prev_mr_rsn": "prevMRRsn",
+        "prev_mr_cat": "prevMRCat",
+        "serial_number": "serialNumber",
+        "pod": "pod",
+        "register_cat": "registerCat",
+        "distributor": "distributor",
+        "meter_interval": "meterInterval",
+        "supplier": "supplier",
+        "dist_customer": "distCustomer",
+        "dist_customer_id": "distCustomerId",
+        "dist_contract": "distContract",
+        "dist_contract_date": "distContractDate",
+    }
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> PreviousRead:
+        return cls(**{attr: raw.get(key) for attr, key in cls.API_KEYS.items()})
+
+    def as_api_dict(self) -> dict[str, Any]:
+        """Câmpurile prezente, cu cheile originale (pentru build_usage_entity)."""
+        result: dict[str, Any] = {}
+        for attr, key in self.API_KEYS.items():
+            value = getattr(self, attr)
+            if value is not None:
+                result[key] = value
+        return result
+
+
+# ══════════════════════════════════════════════
+# Citiri contor
+# ══════════════════════════════════════════════
+
+@dataclass(frozen=True, slots=True)
+class MeterReading:
+    """O citire din GetMeterReadHistory."""
+
+    pod: str = ""
+    counter_series: str = ""
+    meter_counter_series_id: str = ""
+    register_description: str = ""
+    registers: str = ""
+    reading_type: str = ""
+    date: str = ""
+    index: Any = None
+    read_at: datetime | None = None
+
+    @property
+    def series(self) -> str:
+        """Seria de contor (CounterSeries sau MeterCounterSeriesId)."""
+        return self.counter_series or self.meter_counter_series_id
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> MeterReading:
+        date = _text(raw.get("Date"))
+        return cls(
+            pod=_text(raw.get("POD")),
+            counter_series=_text(raw.get("CounterSeries")),
+            meter_counter_series_id=_text(raw.get("MeterCounterSeriesId")),
+            register_description=_text(raw.get("RegisterDescription")),
+            registers=_text(raw.get("Registers")),
+            reading_type=_text(raw.get("ReadingType")),
+            date=date,
+            index=raw.get("Index"),
+            read_at=parse_sew_date(date),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CounterSeries:
+    """O serie din GetMeterCounterSeries."""
+
+    series: str = ""
+    mr_date: str = ""
+    index: str = ""
+    mr_at: datetime | None = None
+
+    @property
+    def last_index(self) -> int | None:
+        """Ultimul index din lista „Index" (valori separate prin virgulă)."""
+        if not self.index:
+            return None
+        try:
+            return int(self.index.split(",")[-1].strip())
+        except (ValueError, TypeError):
+            return None
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> CounterSeries:
+        mr_date = _text(raw.get("MrDate"))
+        return cls(
+            series=_text(
+                raw.get("CounterSeries", "") or raw.get("MeterCounterSeriesId", "")
+            ),
+            mr_date=mr_date,
+            index=_text(raw.get("Index")),
+            mr_at=parse_sew_date(mr_date),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class UsageMonth:
+    """O lună din GetUsageGeneration (objUsageGenerationResultSetTwo).
+
+    value = consum în kWh; usage_value = sumă facturată în lei.
+    """
+
+    year: int = 0
+    month: int = 0
+    value: Any = None
+    usage_value: Any = 0
+    billing_days: Any = "0"
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> UsageMonth:
+        return cls(
+            year=raw.get("Year", 0) or 0,
+            month=raw.get("Month", 0) or 0,
+            value=raw.get("value"),
+            usage_value=raw.get("UsageValue", 0),
+            billing_days=raw.get("BillingDays", "0"),
+        )
+
+
+# ══════════════════════════════════════════════
+# Facturare
+# ══════════════════════════════════════════════
+
+@dataclass(frozen=True, slots=True)
+class Bill:
+    """Factura curentă din GetBill (result)."""
+
+    rembalance: str = "0"
+    billamount: str = ""
+    duedate: str = ""
+    invoicenumber: str = ""
+    # rembalance parsat (None dacă nu se poate parsa)
+    balance: float | None = 0.0
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> Bill:
+        rembalance = _text(raw.get("rembalance", "0"))
+        return cls(
+            rembalance=rembalance,
+            billamount=_text(raw.get("billamount")),
+            duedate=_text(raw.get("duedate")),
+            invoicenumber=_text(raw.get("invoicenumber")),
+            balance=_amount(rembalance),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Invoice:
+    """O factură din GetBillingHistoryList (objBillingHistoryEntity)."""
+
+    invoice_id: str = ""
+    amount: str = ""
+    invoice_date: str = ""
+    due_date: str = ""
+    invoice_type: str = ""
+    invoiced_at: datetime | None = None
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> Invoice:
+        invoice_date = _text(raw.get("invoiceDate"))
+        return cls(
+            invoice_id=_text(raw.get("invoiceId")),
+            amount=_text(raw.get("amount")),
+            invoice_date=invoice_date,
+            due_date=_text(raw.get("dueDate")),
+            invoice_type=_text(raw.get("invoiceType")),
+            invoiced_at=parse_sew_date(invoice_date),
+        )
+
+
+# Prefixe canal care indică compensație ANRE (prosumator)
+_COMP_PREFIXES = ("Comp ANRE", "Comp ", "Compensare")
+
+
+@dataclass(frozen=True, slots=True)
+class Payment:
+    """O plată din GetBillingHistoryList (objBillingPaymentHistoryEntity)."""
+
+    amount: str = "0"
+    payment_date: str = ""
+    channel: str = ""
+    paid_at: datetime | None = None
+    # amount parsat (0.0 dacă nu se poate parsa)
+    amount_value: float = 0.0
+
+    @property
+    def is_compensation(self) -> bool:
+        """True pentru compensațiile ANRE (prosumator)."""
+        return any(self.channel.startswith(p) for p in _COMP_PREFIXES)
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> Payment:
+        amount = _text(raw.get("amount", "0"))
+        payment_date = _text(raw.get("paymentDate"))
+        return cls(
+            amount=amount,
+            payment_date=payment_date,
+            channel=_text(raw.get("channel")),
+            paid_at=parse_sew_date(payment_date),
+            amount_value=_amount(amount) or 0.0,
+        )
+
+
+# ══════════════════════════════════════════════
+# Fereastra de autocitire
+# ══════════════════════════════════════════════
+
+@dataclass(frozen=True, slots=True)
+class WindowDates:
+    """result.Data din GetWindowDates / GetWindowDatesENC."""
+
+    opening_date: str = ""
+    closing_date: str = ""
+    next_opening_date: str = ""
+    next_closing_date: str = ""
+    # "0" / "1" (plain); criptat în varianta ENC
+    is_window_open: str = ""
+
+    @classmethod
+    def from_api(cls, raw: Mapping[str, Any]) -> WindowDates:
+        return cls(
+            opening_date=_text(raw.get("OpeningDate")),
+            closing_date=_text(raw.get("ClosingDate")),
+            next_opening_date=_text(raw.get("NextMonthOpeningDate")),
+            next_closing_date=_text(raw.get("NextMonthClosingDate")),
+            is_window_open=_text(raw.get("Is_Window_Open")),
+        )
+
+
+# ══════════════════════════════════════════════
+# Memorare per răspuns
+# ══════════════════════════════════════════════
+
+class ParsedResponses:
+    """Modelele construite din ultimul răspuns văzut, per slot.
+
+    Un slot (ex: „pods", „payments") se reconstruiește doar când obiectul
+    răspunsului se schimbă. Se păstrează doar răspunsul curent per slot.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[str, tuple[Any, Any]] = {}
+
+    def get(self, slot: str, response: Any, build: Callable[[], _T]) -> _T:
+        entry = self._entries.get(slot)
+        if entry is not None and entry[0] is response:
+            return entry[1]
+        parsed = build()
+        self._entries[slot] = (response, parsed)
+        return parsed
@@ -0,0 +1,153 @@
+"""Politica de prospețime per endpoint pentru integrarea Hidroelectrica România.
+
+Înlocuiește refresh-ul pe două niveluri (ușor / greu la fiecare al 4-lea).
+Fiecare endpoint are o vârstă maximă a datelor (ENDPOINT_MAX_AGE) și,
+opțional, declanșatori din calendarul contului:
+- scadența facturii a trecut de la ultima cerere → GetBill
+- fereastra de autocitire s-a închis de la ultima cerere → GetBill
+  (factură nouă), GetMeterReadHistory (citirea distribuitorului)
+- perioadă densă a calendarului (vezi scheduler.py) → GetBill la fiecare
+  refresh, ca înainte
+- zi nouă de la ultima cerere → GetWindowDates*, GetPreviousMeterRead
+  (Is_Window_Open se schimbă doar la miezul nopții)
+- autocitire trimisă → GetPreviousMeterRead, GetMeterCounterSeries,
+  GetMeterReadHistory
+- factura s-a schimbat în refresh-ul curent (nouă / plătită) →
+  GetUsageGeneration, GetBillingHistoryList (evaluat în graf, după GetBill)
+
+Fiecare refresh cere doar endpoint-urile expirate sau declanșate
+(plan_refresh). Pentru un cont fără evenimente între facturi, istoricele
+grele se cer de câteva ori pe săptămână, nu la fiecare al 4-lea refresh.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .capabilities import WINDOW_ENC, WINDOW_PLAIN
+from .const import ENDPOINT_AGE_SLACK, ENDPOINT_MAX_AGE
+from .scheduler import bill_due_date, event_periods, reading_windows, window_data
+
+# (date curente, acum, ultima cerere reușită) → motiv sau None
+Trigger = Callable[[dict[str, Any], datetime, datetime], "str | None"]
+
+
+def _due_passed(data: dict[str, Any], now: datetime, fetched: datetime) -> str | None:
+    """Scadența facturii a trecut de la ultima cerere."""
+    due = bill_due_date(data)
+    if due is not None and fetched < due <= now:
+        return "scadență depășită"
+    return None
+
+
+def _window_closed(data: dict[str, Any], now: datetime, fetched: datetime) -> str | None:
+    """Fereastra de autocitire s-a închis de la ultima cerere."""
+    for _start, end in reading_windows(window_data(data), now):
+        if fetched < end <= now:
+            return "fereastră închisă"
+    return None
+
+
+def _event_period(data: dict[str, Any], now: datetime, _fetched: datetime) -> str | None:
+    """Suntem într-o perioadă densă a calendarului (scadență, factură nouă...)."""
+    for start, end, reason in event_periods(data, now):
+        if start <= now < end:
+            return reason
+    return None
+
+
+def _new_day(_data: dict[str, Any], now: datetime, fetched: datetime) -> str | None:
+    """Zi nouă de la ultima cerere."""
+    return "zi nouă" if fetched.date() != now.date() else None
+
+
+@dataclass(frozen=True, slots=True)
+class EndpointPolicy:
+    """Când se cere din nou un endpoint."""
+
+    triggers: tuple[Trigger, ...] = ()
+    # Se cere și când acest endpoint s-a schimbat în refresh-ul curent
+    refetch_on_change: str | None = None
+    # Se cere după trimiterea unei autocitiri
+    on_submit: bool = False
+    # Endpoint-uri planificate împreună (variantele GetWindowDates);
+    # vârsta grupului = cel mai recent răspuns bun dintre ele
+    group: tuple[str, ...] = ()
+
+
+_WINDOW_GROUP = (WINDOW_PLAIN, WINDOW_ENC)
+
+POLICIES: dict[str, EndpointPolicy] = {
+    "multi_meter": EndpointPolicy(),
+    "bill": EndpointPolicy(triggers=(_due_passed, _window_closed, _event_period)),
+    WINDOW_ENC: EndpointPolicy(triggers=(_new_day,), group=_WINDOW_GROUP),
+    WINDOW_PLAIN: EndpointPolicy(triggers=(_new_day,), group=_WINDOW_GROUP),
+    "pods": EndpointPolicy(),
+    "previous_meter_read": EndpointPolicy(triggers=(_new_day,), on_submit=True),
+    "usage": EndpointPolicy(refetch_on_change="bill"),
+    "billing_history": EndpointPolicy(refetch_on_change="bill"),
+    "meter_counter_series": EndpointPolicy(on_submit=True),
+    "meter_read_history": EndpointPolicy(triggers=(_window_closed,), on_submit=True),
+}
+
+# Endpoint-urile cerute din nou după o autocitire trimisă
+SUBMIT_ENDPOINTS: frozenset[str] = frozenset(
+    name for name, policy in POLICIES.items() if policy.on_submit
+)
+
+
+def _stale_reason(
+    name: str,
+    policy: EndpointPolicy,
+    fetched_at: float | None,
+    data: dict[str, Any],
+    now: datetime,
+) -> str | None:
+    if fetched_at is None:
+        return "fără date"
+    age = now.timestamp() - fetched_at
+    if age + ENDPOINT_AGE_SLACK >= ENDPOINT_MAX_AGE[name]:
+        return f"vârstă {age / 3600:.1f} h"
+    fetched = datetime.fromtimestamp(fetched_at)
+    for trigger in policy.triggers:
+        reason = trigger(data, now, fetched)
+        if reason:
+            return reason
+    return None
+
+
+def plan_refresh(
+    fetched_at: Callable[[str], float | None],
+    data: dict[str, Any] | None,
+    forced: Collection[str] = (),
+    now: datetime | None = None,
+) -> dict[str, str]:
+    """Endpoint-urile de cerut în refresh-ul curent, cu motivul fiecăruia.
+
+    Args:
+        fetched_at: momentul ultimului răspuns bun per endpoint (time.time())
+        data: datele curente ale coordinatorului
+        forced: endpoint-uri cerute oricum (re-verificare, autocitire)
+        now: momentul curent (implicit datetime.now())
+    """
+    now = now or datetime.now()
+    data = data or {}
+    plan: dict[str, str] = {}
+    for name, policy in POLICIES.items():
+        if name in plan:
+            continue
+        members = policy.group or (name,)
+        if any(member in forced for member in members):
+            reason: str | None = "forțat"
+        else:
+            times = [t for t in map(fetched_at, members) if t is not None]
+            reason = _stale_reason(
+                name, policy, max(times) if times else None, data, now
+            )
+        if reason:
+            for member in members:
+                plan[member] = reason
+    return plan
@@ -0,0 +1,137 @@
+"""Programare adaptivă a refresh-ului pentru integrarea Hidroelectrica România.
+
+Datele SEW se schimbă doar în jurul unor momente cunoscute din calendarul
+contului (deja prezente în răspunsurile API):
+- fereastra de autocitire (OpeningDate / ClosingDate / NextMonthOpeningDate)
+- scadența facturii (GetBill.duedate)
+- emiterea facturii noi (în zilele de după închiderea ferestrei)
+
+În jurul acestor momente se folosește intervalul configurat (dens);
+în rest se interoghează rar, dar niciodată peste următorul eveniment.
+"""
+
+from __future__ import annotations
+
+from calendar import monthrange
+from datetime import datetime, timedelta
+
+from .const import (
+    ADAPTIVE_EVENT_MARGIN,
+    ADAPTIVE_INVOICE_DAYS,
+    ADAPTIVE_SPARSE_INTERVAL,
+    MAX_UPDATE_INTERVAL,
+)
+from .dates import parse_dmy, parse_yyyymmdd
+from .helpers import safe_get
+
+
+def window_data(data: dict) -> dict:
+    """result.Data din GetWindowDates (sau varianta ENC)."""
+    wd = data.get("window_dates") or data.get("window_dates_enc") or {}
+    wd_data = safe_get(wd, "result", "Data", default={})
+    return wd_data if isinstance(wd_data, dict) else {}
+
+
+def _day_in_month(year: int, month: int, day: int) -> datetime:
+    """Ziua `day` din luna dată (limitată la ultima zi a lunii)."""
+    return datetime(year, month, min(day, monthrange(year, month)[1]))
+
+
+def reading_windows(wd: dict, now: datetime) -> list[tuple[datetime, datetime]]:
+    """Ferestrele de autocitire cunoscute: [deschidere, sfârșit zi închidere).
+
+    Fereastra lunii curente vine din OpeningDate/ClosingDate (doar ziua),
+    cea viitoare din NextMonthOpeningDate (data completă) + aceeași durată.
+    NextMonthClosingDate nu e de încredere (rămâne pe luna curentă).
+    """
+    try:
+        open_d = int(wd.get("OpeningDate", ""))
+        close_d = int(wd.get("ClosingDate", ""))
+    except (TypeError, ValueError):
+        return []
+
+    year, month = now.year, now.month
+    if close_d < open_d and now.day <= close_d:
+        # Fereastra trece peste granița lunii (ex: 28 → 2) și suntem în
+        # coada ei (zilele 1–2) → a început în luna precedentă
+        year, month = (year - 1, 12) if month == 1 else (year, month - 1)
+
+    durata = close_d - open_d
+    if durata < 0:
+        durata = (monthrange(year, month)[1] - open_d) + close_d
+
+    windows: list[tuple[datetime, datetime]] = []
+    start = _day_in_month(year, month, open_d)
+    windows.append((start, start + timedelta(days=durata + 1)))
+
+    start = parse_dmy(wd.get("NextMonthOpeningDate", ""))
+    if start is not None:
+        windows.append((start, start + timedelta(days=durata + 1)))
+
+    return windows
+
+
+def bill_due_date(data: dict) -> datetime | None:
+    """Scadența din GetBill (format yyyyMMdd)."""
+    duedate = safe_get(data.get("bill") or {}, "result", "duedate", default="")
+    return parse_yyyymmdd(duedate) if isinstance(duedate, str) else None
+
+
+def event_periods(data: dict, now: datetime) -> list[tuple[datetime, datetime, str]]:
+    """Perioadele „dense" (start, sfârșit, motiv) derivate din date."""
+    margin = timedelta(seconds=ADAPTIVE_EVENT_MARGIN)
+    periods: list[tuple[datetime, datetime, str]] = []
+
+    for start, end in reading_windows(window_data(data), now):
+        periods.append((start - margin, end + margin, "fereastră autocitire"))
+        # Factura nouă se emite după închiderea ferestrei
+        periods.append(
+            (end, end + timedelta(days=ADAPTIVE_INVOICE_DAYS), "factură nouă")
+        )
+
+    due = bill_due_date(data)
+    if due is not None:
+        periods.append((due - margin, due + timedelta(days=1) + margin, "scadență"))
+
+    return periods
+
+
+def compute_update_interval(
+    data: dict | None,
+    dense_interval: int,
+    now: datetime | None = None,
+) -> tuple[int, str]:
+    """Calculează intervalul până la următorul refresh.
+
+    Args:
+        data: datele coordinatorului (ultimul refresh reușit)
+        dense_interval: intervalul configurat de utilizator (secunde)
+        now: momentul curent (implicit datetime.now())
+
+    Returns:
+        (interval în secunde, motiv — pentru log/diagnostics)
+    """
+    if not data:
+        return dense_interval, "fără date"
+
+    now = now or datetime.now()
+    wd = window_data(data)
+    if wd.get("Is_Window_Open") in (True, "true", "True", 1, "1"):
+        return dense_interval, "fereastră autocitire deschisă"
+
+    next_start: datetime | None = None
+    for start, end, reason in event_periods(data, now):
+        if start <= now < end:
+            return dense_interval, reason
+        if start > now and (next_start is None or start < next_start):
+            next_start = start
+
+    sparse = max(dense_interval, ADAPTIVE_SPARSE_INTERVAL)
+    if next_start is None:
+        return min(sparse, MAX_UPDATE_INTERVAL), "fără evenimente cunoscute"
+
+    until_next = int((next_start - now).total_seconds())
+    return (
+        max(dense_interval, min(sparse, until_next, MAX_UPDATE_INTERVAL)),
+        f"următorul eveniment la {next_start:%d/%m/%Y %H:%M}",
+    )
@@ -3,517 +3,89 @@
 from __future__ import annotations
 
 import logging
-from collections import defaultdict
+from abc import abstractmethod
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import ATTRIBUTION, DOMAIN, LICENSE_DATA_KEY
+from .const import ATTRIBUTION, CONF_COMPACT_ATTRIBUTES, DOMAIN, LICENSE_DATA_KEY
 from .coordinator import HidroelectricaCoordinator
+from .dates import format_date_display, format_duedate_yyyymmdd, parse_yyyymmdd
+from .derived import AccountView
+from .models import Bill, Invoice
 from .helpers import (
     MONTHS_NUM_RO,
     READING_TYPE_MAP,
     format_number_ro,
     format_ron,
     parse_romanian_amount,
-    safe_get,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Chei separator din atributele detaliate (doar pentru afișare în UI)
+_SEPARATOR_KEYS = frozenset({"────", "─────", "──────"})
 
-# ══════════════════════════════════════════════
-# Helpers pentru date format dd/MM/yyyy
-# ══════════════════════════════════════════════
 
-def _parse_date_dmy(date_str: str) -> datetime | None:
-    """Parsează o dată în diverse formate. Returnează None dacă eșuează."""
-    if not date_str:
-        return None
-    # Dacă conține spațiu + timp (ex: "06/15/2021 00:00:00"), trunchiem
-    clean = date_str.rstrip("Z").split(" ")[0] if " " in date_str else date_str.rstrip("Z")
-    for fmt in ("%d/%m/%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%m/%d/%Y"):
-        try:
-            return datetime.strptime(clean, fmt)
-        except ValueError:
-            continue
-    return None
-
-
-def _format_date_display(date_str: str) -> str:
-    """Formatează o dată pentru afișare. Returnează string-ul original dacă nu poate parsa."""
-    parsed = _parse_date_dmy(date_str)
-    if parsed:
-        return parsed.strftime("%d/%m/%Y")
-    return date_str
-
-
-def _extract_year_from_dmy(date_str: str) -> int | None:
-    """Extrage anul dintr-o dată dd/MM/yyyy sau yyyy-... format."""
-    parsed = _parse_date_dmy(date_str)
-    if parsed:
-        return parsed.year
-    if date_str and len(date_str) >= 10:
-        try:
-            return int(date_str[-4:])
-        except (ValueError, TypeError):
-            pass
-    if date_str and len(date_str) >= 4:
-        try:
-            return int(date_str[:4])
-        except (ValueError, TypeError):
-            pass
-    return None
-
-
-def _format_duedate_yyyymmdd(duedate: str) -> str:
-    """Formatează duedate din format yyyyMMdd (ex: '20260316') în dd/MM/yyyy."""
-    if not duedate or len(duedate) != 8:
-        return duedate or "Necunoscut"
+def _number(value: Any) -> int | float | None:
+    """Valoare SEW → int / float pentru atributele compacte (None dacă lipsește)."""
     try:
-        parsed = datetime.strptime(duedate, "%Y%m%d")
-        return parsed.strftime("%d/%m/%Y")
-    except ValueError:
-        return duedate
-
-
-# ══════════════════════════════════════════════
-# Helpers pentru extragerea datelor din API
-# (structuri reale din debug JSON)
-# ══════════════════════════════════════════════
-
-def _get_meter_read_list(data: dict | None) -> list:
-    """Extrage lista de citiri din GetMeterReadHistory.
-
-    Structură reală: result.Data = LIST direct cu:
-    {POD, CounterSeries, RegisterDescription, Registers, ReadingType, Date, Index}
-    """
-    if not data:
-        return []
-    mrh = data.get("meter_read_history")
-    if not mrh:
-        return []
-    mrh_data = safe_get(mrh, "result", "Data", default=[])
-    if isinstance(mrh_data, list):
-        return mrh_data
-    if isinstance(mrh_data, dict):
-        for key in ("objMeterReadHistoryData", "objMeterReadData", "objHistoryData"):
-            lst = mrh_data.get(key, [])
-            if lst:
-                return lst
-    return []
-
-
-def _get_billing_list(data: dict | None) -> list:
-    """Extrage lista de facturi din GetBillingHistory.
-
-    Structură reală: result.objBillingHistoryEntity = LIST cu:
-    {amount, invoiceDate, dueDate, invoiceType, exbel, invoiceId, ...}
-    """
-    if not data:
-        return []
-    bh = data.get("billing_history")
-    if not bh:
-        return []
-    result = bh.get("result", {})
-    if not isinstance(result, dict):
-        return []
-    bh_list = result.get("objBillingHistoryEntity", [])
-    if bh_list:
-        return bh_list
-    data_inner = result.get("Data", {})
-    if isinstance(data_inner, list):
-        return data_inner
-    if isinstance(data_inner, dict):
-        for key in ("objBillingHistoryData", "objBillingData"):
-            lst = data_inner.get(key, [])
-            if lst:
-                return lst
-    return []
-
-
-def _get_payment_list(data: dict | None) -> list:
-    """Extrage lista de plăți din GetBillingHistory.
-
-    Structură reală: result.objBillingPaymentHistoryEntity = LIST cu:
-    {amount, paymentDate, channel, type, status, ...}
-    """
-    if not data:
-        return []
-    bh = data.get("billing_history")
-    if not bh:
-        return []
-    result = bh.get("result", {})
-    if not isinstance(result, dict):
-        return []
-    return result.get("objBillingPaymentHistoryEntity", []) or []
-
-
-def _get_usage_list(data: dict | None) -> list:
-    """Extrage lista de consum din GetUsageGeneration.
-
-    Structură reală: result.Data.objUsageGenerationResultSetTwo = LIST cu:
-    {Month, Year, UsageDate, UsageValue, value, BillingDays, FromDate, ToDate, ...}
-    """
-    if not data:
-        return []
-    usage = data.get("usage")
-    if not usage:
-        return []
-    usage_data = safe_get(usage, "result", "Data", default={})
-    if isinstance(usage_data, dict):
-        return usage_data.get("objUsageGenerationResultSetTwo", []) or []
-    if isinstance(usage_data, list):
-        return usage_data
-    return []
-
-
-def _get_window_data(data: dict | None) -> dict:
-    """Extrage datele ferestrei de autocitire.
-
-    Structură reală: result.Data = DICT cu:
-    {OpeningDate, ClosingDate, NextMonthOpeningDate, NextMonthClosingDate, Is_Window_Open}
-    """
-    if not data:
-        return {}
-    wd = data.get("window_dates") or data.get("window_dates_enc") or {}
-    wd_data = safe_get(wd, "result", "Data", default={})
-    if isinstance(wd_data, dict):
-        return wd_data
-    return {}
-
-
-def _compute_closing_date(wd: dict) -> str:
-    """Calculează data corectă de închidere a ferestrei de autocitire.
-
-    API-ul returnează:
-      - OpeningDate: "22"               (zi deschidere, luna curentă)
-      - ClosingDate: "26"               (zi închidere)
-      - NextMonthOpeningDate: "22/04/2026"  (data completă deschidere viitoare)
-      - NextMonthClosingDate: "26/03/2026"  (ATENȚIE: luna e GREȘITĂ/curentă!)
-
-    Bug Hidroelectrica: NextMonthClosingDate NU se actualizează corect —
-    rămâne pe luna curentă în loc de luna viitoare.
-
-    Soluția: calculăm durata ferestrei (ClosingDate - OpeningDate) și
-    adăugăm zilele la NextMonthOpeningDate (care e mereu corect).
-
-    Exemplu: OpeningDate="22", ClosingDate="26" → durata = 4 zile
-             NextMonthOpeningDate="22/04/2026" + 4 zile = "26/04/2026"
-    """
-    from datetime import datetime, timedelta
-
-    opening_day = wd.get("OpeningDate", "")
-    closing_day = wd.get("ClosingDate", "")
-    next_opening = wd.get("NextMonthOpeningDate", "")
-
-    if opening_day and closing_day and next_opening:
-        try:
-            open_d = int(opening_day)
-            close_d = int(closing_day)
-            durata = close_d - open_d
-            if durata < 0:
-                # Fereastra trece peste granița lunii (ex: 28 → 2)
-                # Estimăm ~30 zile în lună
-                durata = (30 - open_d) + close_d
-            dt_opening = datetime.strptime(next_opening, "%d/%m/%Y")
-            dt_closing = dt_opening + timedelta(days=durata)
-            return dt_closing.strftime("%d/%m/%Y")
-        except (ValueError, IndexError):
-            pass
-
-    # Fallback pe NextMonthClosingDate dacă calculul eșuează
-    return wd.get("NextMonthClosingDate", "")
-
-
-def _get_pods_list(data: dict | None) -> list:
-    """Extrage lista de PODs din GetPods.
-
-    Structură reală: result.Data = LIST direct cu:
-    {accountID, installation, contractAccountID, pod}
-    """
-    if not data:
-        return []
-    pods = data.get("pods")
-    if not pods:
-        return []
-    pods_data = safe_get(pods, "result", "Data", default=[])
-    if isinstance(pods_data, list):
-        return pods_data
-    if isinstance(pods_data, dict):
-        return pods_data.get("objPodData", []) or []
-    return []
-
-
-def _get_multi_meter_data(data: dict | None) -> dict:
-    """Extrage datele contorului din GetMultiMeter.
-
-    Structură reală: result.MeterDetails = LIST cu:
-    {MeterType, MeterNumber, IsAMI, Status, Address}
-    """
-    if not data:
-        return {}
-    mm = data.get("multi_meter")
-    if not mm:
-        return {}
-    result = mm.get("result", {})
-    if not isinstance(result, dict):
-        return {}
-    meter_details = result.get("MeterDetails", [])
-    if meter_details and isinstance(meter_details, list):
-        return meter_details[0]
-    return {}
-
-
-def _get_previous_meter_read(data: dict | None) -> dict | None:
-    """Extrage datele din GetPreviousMeterRead.
-
-    Structură reală: result.Data = LIST cu un singur element conținând:
-    {contractAccountID, equipmentNo, prevMRResult, prevMRDate, prevMRRsn,
-     serialNumber, pod, distributor, supplier, distCustomer, distContract, ...}
-    """
-    if not data:
-        return None
-    prev = data.get("previous_meter_read")
-    if not prev:
-        return None
-    prev_data = safe_get(prev, "result", "Data", default=[])
-    if isinstance(prev_data, list) and prev_data:
-        return prev_data[0]
-    if isinstance(prev_data, dict):
-        for k in ("objPreviousMeterReadData",):
-            inner = prev_data.get(k, [])
-            if inner and isinstance(inner, list):
-                return inner[0]
-        return prev_data if prev_data else None
-    return None
-
-
-def _get_active_counter_series(data: dict | None) -> str | None:
-    """Determină seria de contor activă (cea mai recentă).
-
-    Verifică meter_counter_series (GetMeterCounterSeries) care are MrDate
-    pentru fiecare serie. Seria cu MrDate mai recent este cea activă.
-    Fallback: dacă nu există meter_counter_series, returnează None
-    (și _get_latest_meter_read va lua cea mai recentă citire din toate seriile).
-    """
-    if not data:
-        return None
-    mcs = data.get("meter_counter_series")
-    if not mcs:
+        num = float(value)
+    except (TypeError, ValueError):
         return None
-    mcs_data = safe_get(mcs, "result", "Data", default=[])
-    if not isinstance(mcs_data, list) or not mcs_data:
-        # Poate fi dict cu objMeterCounterSeriesList
-        if isinstance(mcs_data, dict):
-            inner = mcs_data.get("objMeterCounterSeriesList", [])
-            if isinstance(inner, list) and inner:
-                mcs_data = inner
-            else:
-                return None
-        else:
-            return None
-
-    # Alegem seria cu MrDate cel mai recent
-    best_series = None
-    best_date = datetime.min
-    for entry in mcs_data:
-        series = entry.get("CounterSeries", "") or entry.get("MeterCounterSeriesId", "")
-        mr_date_str = entry.get("MrDate", "")
-        parsed = _parse_date_dmy(mr_date_str)
-        if parsed and parsed > best_date:
-            best_date = parsed
-            best_series = str(series)
-
-    return best_series
-
-
-def _get_latest_meter_read(
-    data: dict | None,
-    register_filter: str | None = None,
-) -> dict | None:
-    """Returnează cea mai recentă citire din GetMeterReadHistory.
-
-    Filtrează pe seria de contor activă (dacă e cunoscută).
-    Dacă register_filter e specificat (ex: "1.8.0", "1.8.0_P"),
-    returnează doar citiri cu acel Registers.
-    """
-    reads = _get_meter_read_list(data)
-    if not reads:
-        return None
-
-    # Filtrăm pe seria activă dacă o cunoaștem
-    active_series = _get_active_counter_series(data)
-    if active_series:
-        filtered = [
-            r for r in reads
-            if str(r.get("CounterSeries", "")) == str(active_series)
-            or str(r.get("MeterCounterSeriesId", "")) == str(active_series)
-        ]
-        if filtered:
-            reads = filtered
-
-    # Filtrăm pe registru (1.8.0 = consum, 1.8.0_P = producție prosumator)
-    if register_filter:
-        reads = [r for r in reads if r.get("Registers") == register_filter]
-        if not reads:
-            return None
-
-    def parse_key(entry):
-        d = _parse_date_dmy(entry.get("Date", ""))
-        return d if d else datetime.min
-
-    return max(reads, key=parse_key)
-
-
-def _get_meter_counter_series_fallback(data: dict | None) -> tuple[int | None, str | None]:
-    """Fallback: extrage ultimul index din meter_counter_series (seria activă).
-
-    Returnează (index, date_str) sau (None, None).
-    Folosit doar dacă meter_read_history nu are date.
-    """
-    if not data:
-        return None, None
-    mcs = data.get("meter_counter_series")
-    if not mcs:
-        return None, None
-    mcs_data = safe_get(mcs, "result", "Data", default=[])
-    # Dacă e dict cu objMeterCounterSeriesList
-    if isinstance(mcs_data, dict):
-        inner = mcs_data.get("objMeterCounterSeriesList", [])
-        if isinstance(inner, list) and inner:
-            mcs_data = inner
-    if not isinstance(mcs_data, list) or not mcs_data:
-        return None, None
-
-    # Seria activă
-    active_series = _get_active_counter_series(data)
-    target = None
-    for entry in mcs_data:
-        cs = entry.get("CounterSeries") or entry.get("MeterCounterSeriesId")
-        if active_series and str(cs) == str(active_series):
-            target = entry
-            break
-    if not target:
-        target = mcs_data[0]
-
-    index_str = target.get("Index", "")
-    mr_date = target.get("MrDate", "")
-    if index_str:
-        indices = index_str.split(",")
-        if indices:
-            try:
-                return int(indices[-1].strip()), mr_date
-            except (ValueError, TypeError):
-                pass
-    return None, None
-
-
-def _get_bill_result(data: dict | None) -> dict:
-    """Extrage result din GetBill.
-
-    Structură reală: result = DICT cu:
-    {billamount, invoicenumber, rembalance, duedate, Table1, objResponseProxy}
-    """
-    if not data:
-        return {}
-    bill = data.get("bill") or {}
-    result = bill.get("result", {})
-    return result if isinstance(result, dict) else {}
-
-
-# ══════════════════════════════════════════════
-# Helpers pentru grupare pe ani
-# ══════════════════════════════════════════════
-
-def _extract_usage_years(data: dict | None) -> dict[int, list]:
-    """Grupează datele de consum pe an."""
-    entries = _get_usage_list(data)
-    if not entries:
-        return {}
-    yearly: dict[int, list] = defaultdict(list)
-    for entry in entries:
-        year = entry.get("Year", 0)
-        if year:
-            yearly[year].append(entry)
-    return dict(yearly)
-
-
-def _extract_meter_read_years(
-    data: dict | None,
-    register_filter: str | None = None,
-) -> dict[int, list]:
-    """Grupează citirile de contor pe an (filtrate pe seria activă).
-
-    Args:
-        data: coordinator.data
-        register_filter: dacă e setat, filtrează pe Registers (ex: "1.8.0", "1.8.0_P").
-    """
-    entries = _get_meter_read_list(data)
-    if not entries:
-        return {}
-
-    # Filtrăm pe seria activă (dacă există) — evităm amestecul vechilor serii
-    active_series = _get_active_counter_series(data)
-    if active_series:
-        entries = [
-            e for e in entries
-            if str(e.get("CounterSeries", "")) == str(active_series)
-        ]
-
-    # Filtrăm pe tip registru (consum vs. producție)
-    if register_filter:
-        entries = [e for e in entries if e.get("Registers") == register_filter]
-
-    yearly: dict[int, list] = defaultdict(list)
-    for entry in entries:
-        year = _extract_year_from_dmy(entry.get("Date", ""))
-        if year:
-            yearly[year].append(entry)
-    return dict(yearly)
-
-
-# Prefixe canal care indică compensație ANRE (prosumator)
-_COMP_PREFIXES = ("Comp ANRE", "Comp ", "Compensare")
-
-
-def _is_compensation(channel: str) -> bool:
-    """Determină dacă o plată este compensație ANRE (prosumator)."""
-    return any(channel.startswith(p) for p in _COMP_PREFIXES)
-
-
-def _extract_payment_years(
-    data: dict | None,
-    channel_filter: str | None = None,
-) -> dict[int, list]:
-    """Grupează plățile reale pe an.
-
-    channel_filter:
-      None        → toate plățile (comportament original)
-      "normal"    → doar plăți normale (Incasari-*)
-      "comp"      → doar compensații ANRE (Comp ANRE-*)
-    """
-    entries = _get_payment_list(data)
-    if not entries:
-        return {}
-    if channel_filter == "normal":
-        entries = [e for e in entries if not _is_compensation(e.get("channel", ""))]
-    elif channel_filter == "comp":
-        entries = [e for e in entries if _is_compensation(e.get("channel", ""))]
-    yearly: dict[int, list] = defaultdict(list)
-    for entry in entries:
-        year = _extract_year_from_dmy(entry.get("paymentDate", ""))
-        if year:
-            yearly[year].append(entry)
-    return dict(yearly)
+    return int(num) if num.is_integer() else num
+
+
+def _iso_date(parsed: datetime | None, raw: str = "") -> str | None:
+    """Dată parsată → "yyyy-mm-dd" (altfel valoarea brută / None)."""
+    return parsed.date().isoformat() if parsed else (raw or None)
+
+
+def _compact_readings(year: int, entries: tuple) -> dict[str, Any]:
+    """Atribute compacte pentru arhivele de index (consum / producție)."""
+    last = entries[-1] if entries else None
+    return {
+        "year": year,
+        "readings_count": len(entries),
+        "last_index": _number(last.index) if last else None,
+        "last_date": _iso_date(last.read_at, last.date) if last else None,
+        "readings": [
+            {
+                "date": _iso_date(r.read_at, r.date),
+                "index": _number(r.index),
+                "type": r.reading_type or None,
+            }
+            for r in entries
+        ],
+        "attribution": ATTRIBUTION,
+    }
+
+
+def _compact_payments(year: int, entries: tuple) -> dict[str, Any]:
+    """Atribute compacte pentru arhivele de plăți / compensații."""
+    return {
+        "year": year,
+        "payments_count": len(entries),
+        "total_lei": round(sum(p.amount_value for p in entries), 2),
+        "payments": [
+            {
+                "date": _iso_date(p.paid_at, p.payment_date),
+                "amount_lei": p.amount_value,
+                "channel": p.channel or None,
+            }
+            for p in entries
+        ],
+        "attribution": ATTRIBUTION,
+    }
 
 
 # ──────────────────────────────────────────────
@@ -525,6 +97,11 @@ class HidroelectricaEntity(
     """Clasă de bază pentru entitățile Hidroelectrica România."""
 
     _attr_has_entity_name = False
+    # Separatoarele nu se scriu în baza de date a recorder-ului
+    _unrecorded_attributes = _SEPARATOR_KEYS
+    # Cheile din coordinator.data din care se calculează starea / atributele.
+    # Goală = se scrie la fiecare refresh (ex: stări care depind de dată).
+    _data_keys: frozenset[str] = frozenset()
 
     def __init__(
         self,
@@ -535,6 +112,12 @@ class HidroelectricaEntity(
         self._config_entry = config_entry
         self._uan = coordinator.uan
         self._custom_entity_id: str | None = None
+        # Atribute numerice, schemă mică (opțiunea compact_attributes)
+        self._compact: bool = config_entry.data.get(CONF_COMPACT_ATTRIBUTES, False)
+        # (cheie, atribute) — refolosite cât timp datele sursă nu se schimbă
+        self._attrs_memo: tuple[Any, dict[str, Any]] | None = None
+        # (available, licență validă) la ultima scriere de stare
+        self._last_gate: tuple[bool, bool] | None = None
 
     @property
     def _license_valid(self) -> bool:
@@ -544,6 +127,43 @@ class HidroelectricaEntity(
             return False
         return mgr.is_valid
 
+    @property
+    def _view(self) -> AccountView:
+        """Datele contului, parsate o singură dată per refresh."""
+        return self.coordinator.view
+
+    def _memo_attributes(
+        self, key: Any, build: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Același dict de atribute cât timp `key` (felia de date) e egală.
+
+        `build()` rulează doar când felia s-a schimbat. Modelele sunt
+        imutabile și refolosite între refresh-uri, deci comparația e ieftină.
+        """
+        memo = self._attrs_memo
+        if memo is not None and memo[0] == key:
+            return memo[1]
+        attrs = build()
+        self._attrs_memo = (key, attrs)
+        return attrs
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Scrie starea doar dacă s-a schimbat una din _data_keys.
+
+        Refresh-urile care nu ating felia de date a entității (ex: refresh
+        fără istorice pentru un senzor de arhivă) nu mai ajung la state machine.
+        """
+        gate = (self.available, self._license_valid)
+        if (
+            self._data_keys
+            and gate == self._last_gate
+            and self._data_keys.isdisjoint(self.coordinator.changed_keys)
+        ):
+            return
+        self._last_gate = gate
+        super()._handle_coordinator_update()
+
     @property
     def entity_id(self) -> str | None:
         return self._custom_entity_id
@@ -617,6 +237,7 @@ def _build_sensors_for_coordinator(
         )
 
     sensors: list[SensorEntity] = []
+    view = coordinator.view
 
     # ── 1. Senzori de bază (mereu prezenți) ──
     sensors.append(DateContractSensor(coordinator, config_entry))
@@ -626,8 +247,7 @@ def _build_sensors_for_coordinator(
 
     # CitirePermisaSensor — doar la non-prosumator (prosumatorii nu trimit index manual)
     # Detecția prosumator se face aici devreme pentru a decide dacă se creează senzorul
-    reads_early = _get_meter_read_list(coordinator.data)
-    is_prosumer = any(r.get("Registers") == "1.8.0_P" for r in reads_early)
+    is_prosumer = view.is_prosumer
     if not is_prosumer:
         sensors.append(CitirePermisaSensor(coordinator, config_entry))
     else:
@@ -638,7 +258,7 @@ def _build_sensors_for_coordinator(
         )
 
     # ── 2. Arhivă consum (GetUsageGeneration) — ultimul an ──
-    usage_years = _extract_usage_years(coordinator.data)
+    usage_years = view.usage_years
     if usage_years:
         max_year = max(usage_years.keys())
         sensors.append(ArhivaConsumSensor(coordinator, config_entry, max_year))
@@ -660,11 +280,11 @@ def _build_sensors_for_coordinator(
     # ── 4. Arhivă index consum (GetMeterReadHistory) — ultimul an ──
     # La prosumator filtrăm pe 1.8.0 (consum) — altfel se amestecă cu producția
     consum_filter = "1.8.0" if has_production else None
-    mrh_years = _extract_meter_read_years(coordinator.data, register_filter=consum_filter)
+    mrh_years = view.meter_read_years.get(consum_filter, {})
     _LOGGER.debug(
         "_build_sensors: meter_read_history prezent=%s, mrh_years=%s, prosumator=%s (UAN=%s).",
         coordinator.data.get("meter_read_history") is not None if coordinator.data else False,
-        dict(mrh_years) if mrh_years else "gol",
+        {year: len(reads) for year, reads in mrh_years.items()} if mrh_years else "gol",
         has_production,
         uan,
     )
@@ -676,7 +296,7 @@ def _build_sensors_for_coordinator(
             max_year, len(mrh_years[max_year]), consum_filter, uan,
         )
     else:
-        # Creăm oricum cu anul curent — se va popula la primul heavy refresh
+        # Creăm oricum cu anul curent — se va popula la prima cerere a istoricului
         current_year = datetime.now().year
         sensors.append(ArhivaIndexSensor(coordinator, config_entry, current_year, register_filter=consum_filter))
         _LOGGER.debug(
@@ -692,7 +312,7 @@ def _build_sensors_for_coordinator(
         )
 
         # Arhivă index producție (1.8.0_P)
-        prod_years = _extract_meter_read_years(coordinator.data, register_filter="1.8.0_P")
+        prod_years = view.meter_read_years.get("1.8.0_P", {})
         if prod_years:
             max_year_prod = max(prod_years.keys())
             sensors.append(ArhivaIndexProdusSensor(coordinator, config_entry, max_year_prod))
@@ -713,7 +333,7 @@ def _build_sensors_for_coordinator(
         )
 
     # ── 6. Arhivă plăți normale (utilizator → companie) — ultimul an ──
-    normal_years = _extract_payment_years(coordinator.data, channel_filter="normal")
+    normal_years = view.payment_years.get("normal", {})
     if normal_years:
         max_year = max(normal_years.keys())
         sensors.append(ArhivaPlatiSensor(coordinator, config_entry, max_year))
@@ -731,7 +351,7 @@ def _build_sensors_for_coordinator(
 
     # ── 7. Arhivă plăți prosumator (compensații ANRE) — doar la prosumator ──
     if has_production:
-        comp_years = _extract_payment_years(coordinator.data, channel_filter="comp")
+        comp_years = view.payment_years.get("comp", {})
         if comp_years:
             max_comp_year = max(comp_years.keys())
             sensors.append(
@@ -791,6 +411,40 @@ async def async_setup_entry(
 # ══════════════════════════════════════════════
 
 
+# ──────────────────────────────────────────────
+# Bază pentru senzorii de arhivă (istoric pe an)
+# ──────────────────────────────────────────────
+class HidroelectricaArchiveEntity(HidroelectricaEntity):
+    """Senzor de arhivă: atribute detaliate (implicit) sau compacte.
+
+    Modul compact expune valori numerice într-o schemă fixă; lista
+    completă (cheia „months" / „readings" / „payments") nu se scrie
+    în baza de date a recorder-ului.
+    """
+
+    _unrecorded_attributes = _SEPARATOR_KEYS | {"months", "readings", "payments"}
+
+    @abstractmethod
+    def _get_entries(self) -> tuple:
+        """Intrările arhivei (luni / citiri / plăți)."""
+
+    @abstractmethod
+    def _verbose_attributes(self, entries: tuple) -> dict[str, Any]:
+        """Atributele detaliate (lista completă)."""
+
+    @abstractmethod
+    def _compact_attributes(self, entries: tuple) -> dict[str, Any]:
+        """Atributele compacte (schemă fixă, valori numerice)."""
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        if not self._license_valid:
+            return {"licență": "necesară"}
+        entries = self._get_entries()
+        build = self._compact_attributes if self._compact else self._verbose_attributes
+        return self._memo_attributes(entries, lambda: build(entries))
+
+
 # ──────────────────────────────────────────────
 # LicentaNecesaraSensor
 # Senzor unic afișat când integrarea NU are licență validă.
@@ -844,6 +498,10 @@ class DateContractSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:file-document-edit-outline"
     _attr_translation_key = "date_contract"
+    _data_keys = frozenset({
+        "pods", "multi_meter", "previous_meter_read",
+        "meter_read_history", "meter_counter_series",
+    })
 
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
@@ -869,71 +527,70 @@ class DateContractSensor(HidroelectricaEntity):
             return {"attribution": ATTRIBUTION}
 
         attrs: dict[str, Any] = {}
+        view = self._view
 
         # ── POD și instalație din GetPods (mereu disponibil) ──
-        pods_list = _get_pods_list(data)
-        if pods_list:
-            pod = pods_list[0]
-            if pod.get("pod"):
-                attrs["CLC - Cod punct de măsură (POD)"] = pod["pod"]
-            if pod.get("installation"):
-                attrs["Instalație"] = pod["installation"]
-            if pod.get("contractAccountID"):
-                attrs["Cod încasare"] = pod["contractAccountID"]
-            if pod.get("accountID"):
-                attrs["Cod partener (BP)"] = pod["accountID"]
+        if view.pods:
+            pod = view.pods[0]
+            if pod.pod:
+                attrs["CLC - Cod punct de măsură (POD)"] = pod.pod
+            if pod.installation:
+                attrs["Instalație"] = pod.installation
+            if pod.contract_account_id:
+                attrs["Cod încasare"] = pod.contract_account_id
+            if pod.account_id:
+                attrs["Cod partener (BP)"] = pod.account_id
 
         # ── Serie contor activă din meter_counter_series (mereu disponibil) ──
         # IMPORTANT: GetMultiMeter.MeterNumber poate fi seria veche!
         # Seria corectă (actuală) vine din meter_counter_series (MrDate mai recent).
-        active_series = _get_active_counter_series(data)
+        active_series = view.active_series
         if active_series:
             attrs["Serie contor"] = active_series
 
         # ── Info suplimentare contor din GetMultiMeter ──
-        meter = _get_multi_meter_data(data)
+        meter = view.meter
         if meter:
-            if meter.get("MeterType"):
-                attrs["Tip contor"] = meter["MeterType"]
-            if meter.get("IsAMI") is not None:
-                attrs["Contor inteligent (AMI)"] = "Da" if meter["IsAMI"] else "Nu"
+            if meter.meter_type:
+                attrs["Tip contor"] = meter.meter_type
+            if meter.is_ami is not None:
+                attrs["Contor inteligent (AMI)"] = "Da" if meter.is_ami else "Nu"
 
         # ── Date contractuale din GetPreviousMeterRead ──
         # ATENȚIE: Acest endpoint returnează HTTP 400 când fereastra de
         # autocitire e ÎNCHISĂ. Datele sunt disponibile doar ~22-26 ale lunii.
-        prev = _get_previous_meter_read(data)
+        prev = view.previous_read
         if prev:
             attrs["────"] = ""
 
-            if prev.get("distributor"):
-                attrs["Operator de Distribuție (OD)"] = prev["distributor"]
-            if prev.get("supplier"):
+            if prev.distributor:
+                attrs["Operator de Distribuție (OD)"] = prev.distributor
+            if prev.supplier:
                 supplier_map = {"HE": "Hidroelectrica"}
-                raw_supplier = prev["supplier"]
-                attrs["Furnizor"] = supplier_map.get(raw_supplier, raw_supplier)
-            if prev.get("distCustomer"):
-                attrs["Client distribuitor"] = prev["distCustomer"]
-            if prev.get("distCustomerId"):
-                attrs["ID client distribuitor"] = prev["distCustomerId"]
-            if prev.get("distContract"):
-                attrs["Nr. contract distribuitor"] = prev["distContract"]
-            if prev.get("distContractDate"):
-                attrs["Data contract distribuitor"] = _format_date_display(
-                    prev["distContractDate"]
+                attrs["Furnizor"] = supplier_map.get(prev.supplier, prev.supplier)
+            if prev.dist_customer:
+                attrs["Client distribuitor"] = prev.dist_customer
+            if prev.dist_customer_id:
+                attrs["ID client distribuitor"] = prev.dist_customer_id
+            if prev.dist_contract:
+                attrs["Nr. contract distribuitor"] = prev.dist_contract
+            if prev.dist_contract_date:
+                attrs["Data contract distribuitor"] = format_date_display(
+                    prev.dist_contract_date
                 )
 
             attrs["─────"] = ""
 
-            if prev.get("serialNumber"):
-                attrs["Serie contor (distribuitor)"] = prev["serialNumber"]
-            if prev.get("equipmentNo"):
-                attrs["Nr. echipament"] = prev["equipmentNo"]
-            if prev.get("registerCat"):
-                attrs["Categorie registru"] = prev["registerCat"]
-            if prev.get("uom"):
-                attrs["Unitate de măsură"] = prev["uom"]
-            if prev.get("meterInterval"):
-                attrs["Interval citire"] = prev["meterInterval"].capitalize()
+            if prev.serial_number:
+                attrs["Serie contor (distribuitor)"] = prev.serial_number
+            if prev.equipment_no:
+                attrs["Nr. echipament"] = prev.equipment_no
+            if prev.register_cat:
+                attrs["Categorie registru"] = prev.register_cat
+            if prev.uom:
+                attrs["Unitate de măsură"] = prev.uom
+            if prev.meter_interval:
+                attrs["Interval citire"] = prev.meter_interval.capitalize()
         else:
             # ── Fallback: meter_counter_series + meter_read_history ──
             # GetPreviousMeterRead a returnat HTTP 400 (fereastra închisă).
@@ -941,19 +598,19 @@ class DateContractSensor(HidroelectricaEntity):
             attrs["────"] = ""
 
             # Ultima citire din meter_read_history (seria activă)
-            latest = _get_latest_meter_read(data)
+            latest = view.latest_read()
             if latest:
-                if latest.get("POD"):
-                    attrs["POD (citire)"] = latest["POD"]
-                if latest.get("RegisterDescription"):
-                    attrs["Registru"] = latest["RegisterDescription"]
-                if latest.get("Registers"):
-                    attrs["Categorie registru"] = latest["Registers"]
+                if latest.pod:
+                    attrs["POD (citire)"] = latest.pod
+                if latest.register_description:
+                    attrs["Registru"] = latest.register_description
+                if latest.registers:
+                    attrs["Categorie registru"] = latest.registers
 
             # Seria veche din multi_meter (informativ)
-            if meter and meter.get("MeterNumber") and active_series:
-                old_meter = meter["MeterNumber"]
-                if str(old_meter) != str(active_series):
+            if meter and meter.meter_number and active_series:
+                old_meter = meter.meter_number
+                if old_meter != str(active_series):
                     attrs["─────"] = ""
                     attrs["Serie contor veche (multi_meter)"] = old_meter
 
@@ -975,6 +632,7 @@ class SoldFacturaSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:currency-eur"
     _attr_translation_key = "sold_factura"
+    _data_keys = frozenset({"bill"})
 
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
@@ -987,49 +645,57 @@ class SoldFacturaSensor(HidroelectricaEntity):
         """Stare: 'Da' (sold de plată), 'Nu' (achitat), 'Credit' (prosumator)."""
         if not self._license_valid:
             return "Licență necesară"
-        bill = _get_bill_result(self.coordinator.data)
-        if not bill:
-            return "Nu"
-        rembalance = bill.get("rembalance", "0")
-        try:
-            val = parse_romanian_amount(str(rembalance))
-            if val > 0:
-                return "Da"
-            if val < 0:
-                return "Credit"
-            return "Nu"
-        except (ValueError, TypeError):
+        bill = self._view.bill
+        if not bill or bill.balance is None:
             return "Nu"
+        if bill.balance > 0:
+            return "Da"
+        if bill.balance < 0:
+            return "Credit"
+        return "Nu"
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         if not self._license_valid:
             return {"licență": "necesară"}
-        bill = _get_bill_result(self.coordinator.data)
+        bill = self._view.bill
         if not bill:
             return {"attribution": ATTRIBUTION}
+        build = self._compact_attributes if self._compact else self._verbose_attributes
+        return self._memo_attributes(bill, lambda: build(bill))
 
-        attrs: dict[str, Any] = {}
-
-        # Sold (rembalance)
-        rembalance = bill.get("rembalance", "0")
+    def _compact_attributes(self, bill: Bill) -> dict[str, Any]:
         try:
-            rem_val = parse_romanian_amount(str(rembalance))
-            if rem_val > 0:
-                attrs["Sold"] = f"{format_ron(rem_val)} lei"
-                attrs["Status"] = "De plată"
-            elif rem_val < 0:
-                attrs["Sold"] = f"-{format_ron(abs(rem_val))} lei"
-                attrs["Status"] = "Credit (prosumator)"
-            else:
-                attrs["Sold"] = "0,00 lei"
-                attrs["Status"] = "Achitat integral"
+            bill_amount = parse_romanian_amount(bill.billamount) if bill.billamount else None
         except (ValueError, TypeError):
+            bill_amount = None
+        return {
+            "balance_lei": bill.balance,
+            "bill_amount_lei": bill_amount,
+            "due_date": _iso_date(parse_yyyymmdd(bill.duedate), bill.duedate),
+            "attribution": ATTRIBUTION,
+        }
+
+    def _verbose_attributes(self, bill: Bill) -> dict[str, Any]:
+        attrs: dict[str, Any] = {}
+
+        # Sold (rembalance, parsat în model)
+        rem_val = bill.balance
+        if rem_val is None:
             attrs["Sold"] = "Necunoscut"
             attrs["Status"] = "Necunoscut"
+        elif rem_val > 0:
+            attrs["Sold"] = f"{format_ron(rem_val)} lei"
+            attrs["Status"] = "De plată"
+        elif rem_val < 0:
+            attrs["Sold"] = f"-{format_ron(abs(rem_val))} lei"
+            attrs["Status"] = "Credit (prosumator)"
+        else:
+            attrs["Sold"] = "0,00 lei"
+            attrs["Status"] = "Achitat integral"
 
         # Suma facturii (billamount)
-        billamount = bill.get("billamount", "")
+        billamount = bill.billamount
         if billamount:
             try:
                 bill_val = parse_romanian_amount(str(billamount))
@@ -1038,12 +704,12 @@ class SoldFacturaSensor(HidroelectricaEntity):
                 attrs["Suma ultimei facturi"] = f"{billamount} lei"
 
         # Data scadenței — format yyyyMMdd
-        duedate = bill.get("duedate", "")
+        duedate = bill.duedate
         if duedate:
-            attrs["Data scadenței"] = _format_duedate_yyyymmdd(duedate)
+            attrs["Data scadenței"] = format_duedate_yyyymmdd(duedate)
 
         # Număr factură (criptat, dar îl afișăm)
-        invoicenumber = bill.get("invoicenumber", "")
+        invoicenumber = bill.invoicenumber
         if invoicenumber and not invoicenumber.endswith("=="):
             attrs["Număr factură"] = invoicenumber
 
@@ -1077,25 +743,13 @@ class FacturaRestantaSensor(HidroelectricaEntity):
 
     def _is_overdue(self) -> bool:
         """Verifică dacă soldul este depășit ca termen de plată."""
-        bill = _get_bill_result(self.coordinator.data)
-        if not bill:
-            return False
-
-        rembalance = bill.get("rembalance", "0")
-        try:
-            val = parse_romanian_amount(str(rembalance))
-            if val <= 0:
-                return False
-        except (ValueError, TypeError):
+        bill = self._view.bill
+        if not bill or bill.balance is None or bill.balance <= 0:
             return False
 
-        duedate = bill.get("duedate", "")
-        if duedate and len(duedate) == 8:
-            try:
-                due = datetime.strptime(duedate, "%Y%m%d")
-                return datetime.now() > due
-            except ValueError:
-                pass
+        due = parse_yyyymmdd(bill.duedate)
+        if due is not None:
+            return datetime.now() > due
 
         # Dacă nu putem parsa duedate dar avem sold > 0,
         # nu considerăm restant (ar fi SoldFacturaSensor)
@@ -1119,40 +773,58 @@ class FacturaRestantaSensor(HidroelectricaEntity):
                 "attribution": ATTRIBUTION,
             }
 
-        attrs: dict[str, Any] = {}
-        bill = _get_bill_result(data)
+        view = self._view
+        overdue = self._is_overdue()
+        build = self._compact_attributes if self._compact else self._verbose_attributes
+        return self._memo_attributes(
+            (view.bill, view.latest_invoice, overdue),
+            lambda: build(view.bill, view.latest_invoice, overdue),
+        )
 
-        if self._is_overdue():
-            rembalance = bill.get("rembalance", "0")
+    def _compact_attributes(
+        self, bill: Bill | None, latest: Invoice | None, overdue: bool
+    ) -> dict[str, Any]:
+        latest_amount = None
+        if latest and latest.amount:
             try:
-                val = parse_romanian_amount(str(rembalance))
-                duedate = _format_duedate_yyyymmdd(bill.get("duedate", ""))
-                attrs["Factură restantă"] = (
-                    f"Datorie de {format_ron(val)} lei (scadentă {duedate})"
-                )
-                attrs["Total neachitat"] = f"{format_ron(val)} lei"
+                latest_amount = parse_romanian_amount(latest.amount)
             except (ValueError, TypeError):
-                attrs["Total neachitat"] = "Necunoscut"
+                pass
+        return {
+            "overdue_lei": bill.balance if overdue and bill else 0.0,
+            "due_date": _iso_date(parse_yyyymmdd(bill.duedate), bill.duedate)
+            if bill else None,
+            "latest_invoice_lei": latest_amount,
+            "latest_invoice_date": _iso_date(latest.invoiced_at, latest.invoice_date)
+            if latest else None,
+            "attribution": ATTRIBUTION,
+        }
+
+    def _verbose_attributes(
+        self, bill: Bill | None, latest: Invoice | None, overdue: bool
+    ) -> dict[str, Any]:
+        attrs: dict[str, Any] = {}
+
+        if overdue:
+            val = bill.balance
+            duedate = format_duedate_yyyymmdd(bill.duedate)
+            attrs["Factură restantă"] = (
+                f"Datorie de {format_ron(val)} lei (scadentă {duedate})"
+            )
+            attrs["Total neachitat"] = f"{format_ron(val)} lei"
         else:
             attrs["Total neachitat"] = "0,00 lei"
 
         # Ultima factură emisă din billing_history
-        billing_list = _get_billing_list(data)
-        if billing_list:
-            # Sortăm descrescător pe invoiceDate
-            def sort_key(e):
-                parsed = _parse_date_dmy(e.get("invoiceDate", ""))
-                return parsed if parsed else datetime.min
-
-            latest = max(billing_list, key=sort_key)
+        if latest:
             attrs["────"] = ""
             attrs["Ultima factură emisă"] = (
-                f"{latest.get('amount', 'N/A')} lei din {latest.get('invoiceDate', 'N/A')}"
+                f"{latest.amount or 'N/A'} lei din {latest.invoice_date or 'N/A'}"
             )
-            if latest.get("invoiceType"):
-                attrs["Tip"] = latest["invoiceType"]
-            if latest.get("dueDate"):
-                attrs["Scadentă"] = latest["dueDate"]
+            if latest.invoice_type:
+                attrs["Tip"] = latest.invoice_type
+            if latest.due_date:
+                attrs["Scadentă"] = latest.due_date
 
         attrs["attribution"] = ATTRIBUTION
         return attrs
@@ -1176,6 +848,10 @@ class IndexEnergieSensor(HidroelectricaEntity):
     """
 
     _attr_translation_key = "index_energie_electrica"
+    _data_keys = frozenset({
+        "meter_read_history", "meter_counter_series", "previous_meter_read",
+        "window_dates", "window_dates_enc",
+    })
 
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
@@ -1197,12 +873,13 @@ class IndexEnergieSensor(HidroelectricaEntity):
             return 0
 
         # Sursa principală: meter_read_history (filtrat pe seria activă + registru consum)
-        latest = _get_latest_meter_read(data, register_filter="1.8.0")
+        view = self._view
+        latest = view.latest_read("1.8.0")
         if not latest:
             # Fallback fără filtru registru (non-prosumator fără Registers)
-            latest = _get_latest_meter_read(data)
+            latest = view.latest_read()
         if latest:
-            idx = latest.get("Index")
+            idx = latest.index
             if idx is not None:
                 try:
                     return int(idx)
@@ -1210,9 +887,9 @@ class IndexEnergieSensor(HidroelectricaEntity):
                     pass
 
         # Fallback 1: previous_meter_read
-        prev = _get_previous_meter_read(data)
+        prev = view.previous_read
         if prev:
-            prev_val = prev.get("prevMRResult")
+            prev_val = prev.prev_mr_result
             if prev_val is not None:
                 try:
                     return int(prev_val)
@@ -1220,7 +897,7 @@ class IndexEnergieSensor(HidroelectricaEntity):
                     pass
 
         # Fallback 2: meter_counter_series (ultimul index din seria activă)
-        mcs_index, _ = _get_meter_counter_series_fallback(data)
+        mcs_index, _ = view.counter_series_fallback
         if mcs_index is not None:
             return mcs_index
 
@@ -1238,60 +915,62 @@ class IndexEnergieSensor(HidroelectricaEntity):
             return {"attribution": ATTRIBUTION}
 
         attrs: dict[str, Any] = {}
+        view = self._view
 
         # ── Serie contor activă ──
-        active_series = _get_active_counter_series(data)
+        active_series = view.active_series
         if active_series:
             attrs["Serie contor activă"] = active_series
 
         # ── Număr contor (seria activă, nu din multi_meter care poate fi veche) ──
-        prev = _get_previous_meter_read(data)
-        if prev and prev.get("serialNumber"):
-            attrs["Numărul dispozitivului"] = prev["serialNumber"]
+        prev = view.previous_read
+        if prev and prev.serial_number:
+            attrs["Numărul dispozitivului"] = prev.serial_number
         elif active_series:
             attrs["Numărul dispozitivului"] = active_series
 
         # ── Ultima citire din GetMeterReadHistory (filtrată pe seria activă + consum) ──
-        latest = _get_latest_meter_read(data, register_filter="1.8.0")
+        latest = view.latest_read("1.8.0")
         if not latest:
-            latest = _get_latest_meter_read(data)
+            latest = view.latest_read()
         if latest:
             attrs["────"] = ""
-            attrs["Ultima citire validată"] = latest.get("Index", "N/A")
-            attrs["Data ultimei citiri"] = latest.get("Date", "Necunoscut")
-            read_type = latest.get("ReadingType", "")
+            attrs["Ultima citire validată"] = (
+                latest.index if latest.index is not None else "N/A"
+            )
+            attrs["Data ultimei citiri"] = latest.date or "Necunoscut"
+            read_type = latest.reading_type
             if read_type:
                 attrs["Tipul citirii curente"] = READING_TYPE_MAP.get(read_type, read_type)
-            if latest.get("POD"):
-                attrs["POD"] = latest["POD"]
-            if latest.get("CounterSeries"):
-                attrs["Serie contor (citire)"] = latest["CounterSeries"]
-            if latest.get("RegisterDescription"):
-                attrs["Registru"] = latest["RegisterDescription"]
-            if latest.get("Registers"):
-                attrs["Cod registru"] = latest["Registers"]
+            if latest.pod:
+                attrs["POD"] = latest.pod
+            if latest.counter_series:
+                attrs["Serie contor (citire)"] = latest.counter_series
+            if latest.register_description:
+                attrs["Registru"] = latest.register_description
+            if latest.registers:
+                attrs["Cod registru"] = latest.registers
         else:
             # Fallback: meter_counter_series
-            mcs_index, mcs_date = _get_meter_counter_series_fallback(data)
+            mcs_index, mcs_date = view.counter_series_fallback
             attrs["────"] = ""
             if mcs_index is not None:
                 attrs["Ultima citire (fallback)"] = mcs_index
                 if mcs_date:
-                    attrs["Data ultimei citiri"] = _format_date_display(mcs_date)
+                    attrs["Data ultimei citiri"] = format_date_display(mcs_date)
                 attrs["Sursă date"] = "meter_counter_series"
             else:
                 attrs["Ultima citire"] = "Nu sunt disponibile date"
 
         # ── Citire anterioară din GetPreviousMeterRead ──
-        prev = _get_previous_meter_read(data)
         if prev:
             attrs["─────"] = ""
-            if prev.get("prevMRResult") is not None:
-                attrs["Citire anterioară"] = prev["prevMRResult"]
-            prev_date = prev.get("prevMRDate", "")
+            if prev.prev_mr_result is not None:
+                attrs["Citire anterioară"] = prev.prev_mr_result
+            prev_date = prev.prev_mr_date
             if prev_date:
-                attrs["Data citirii anterioare"] = _format_date_display(prev_date)
-            prev_reason = prev.get("prevMRRsn", "")
+                attrs["Data citirii anterioare"] = format_date_display(prev_date)
+            prev_reason = prev.prev_mr_rsn
             if prev_reason:
                 reason_map = {
                     "01": "Citire distribuitor",
@@ -1303,14 +982,13 @@ class IndexEnergieSensor(HidroelectricaEntity):
                 )
 
         # ── Fereastră autocitire ──
-        wd = _get_window_data(data)
+        wd = view.window
         if wd:
             attrs["──────"] = ""
-            is_open_raw = wd.get("Is_Window_Open", "0")
-            is_open = is_open_raw == "1"
+            is_open = wd.is_window_open == "1"
             attrs["Autorizat să citească contorul"] = "Da" if is_open else "Nu"
-            open_date = wd.get("NextMonthOpeningDate", "")
-            close_date = _compute_closing_date(wd)
+            open_date = wd.next_opening_date
+            close_date = view.closing_date
             if open_date and close_date:
                 attrs["Perioadă transmitere index"] = f"{open_date} — {close_date}"
             if close_date:
@@ -1334,6 +1012,7 @@ class IndexEnergieProdusSensor(HidroelectricaEntity):
     """
 
     _attr_translation_key = "index_energie_produsa"
+    _data_keys = frozenset({"meter_read_history", "meter_counter_series"})
 
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
@@ -1354,9 +1033,9 @@ class IndexEnergieProdusSensor(HidroelectricaEntity):
         if not data:
             return 0
 
-        latest = _get_latest_meter_read(data, register_filter="1.8.0_P")
+        latest = self._view.latest_read("1.8.0_P")
         if latest:
-            idx = latest.get("Index")
+            idx = latest.index
             if idx is not None:
                 try:
                     return int(idx)
@@ -1373,31 +1052,32 @@ class IndexEnergieProdusSensor(HidroelectricaEntity):
             return {"attribution": ATTRIBUTION}
 
         attrs: dict[str, Any] = {}
+        view = self._view
 
         # Serie contor activă
-        active_series = _get_active_counter_series(data)
+        active_series = view.active_series
         if active_series:
             attrs["Serie contor activă"] = active_series
 
         # Ultima citire de producție
-        latest = _get_latest_meter_read(data, register_filter="1.8.0_P")
+        latest = view.latest_read("1.8.0_P")
         if latest:
-            attrs["Ultima citire producție"] = latest.get("Index", "N/A")
-            attrs["Data ultimei citiri"] = latest.get("Date", "Necunoscut")
-            read_type = latest.get("ReadingType", "")
+            attrs["Ultima citire producție"] = (
+                latest.index if latest.index is not None else "N/A"
+            )
+            attrs["Data ultimei citiri"] = latest.date or "Necunoscut"
+            read_type = latest.reading_type
             if read_type:
                 attrs["Tipul citirii"] = READING_TYPE_MAP.get(read_type, read_type)
-            if latest.get("RegisterDescription"):
-                attrs["Registru"] = latest["RegisterDescription"]
+            if latest.register_description:
+                attrs["Registru"] = latest.register_description
             attrs["Cod registru"] = "1.8.0_P"
         else:
             attrs["Ultima citire producție"] = "Nu sunt date disponibile"
 
         # Contorizăm total citiri producție
-        reads = _get_meter_read_list(data)
-        prod_reads = [r for r in reads if r.get("Registers") == "1.8.0_P"]
-        if prod_reads:
-            attrs["Total citiri producție"] = len(prod_reads)
+        if view.production_read_count:
+            attrs["Total citiri producție"] = view.production_read_count
 
         attrs["attribution"] = ATTRIBUTION
         return attrs
@@ -1415,6 +1095,10 @@ class CitirePermisaSensor(HidroelectricaEntity):
     """
 
     _attr_translation_key = "citire_permisa"
+    # window_is_open: fără Is_Window_Open în clar (ENC) → GetPreviousMeterRead
+    _data_keys = frozenset({
+        "window_dates", "window_dates_enc", "previous_meter_read", "pods",
+    })
 
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator, config_entry)
@@ -1423,28 +1107,12 @@ class CitirePermisaSensor(HidroelectricaEntity):
         self._custom_entity_id = f"sensor.{DOMAIN}_{self._uan}_citire_permisa"
 
     def _is_window_open(self) -> bool:
-        """Determină dacă fereastra de autocitire este deschisă."""
-        data = self.coordinator.data
-        if not data:
-            return False
-
-        # Preferăm window_dates (plain) — Is_Window_Open = "0" sau "1"
-        wd_plain = data.get("window_dates") or {}
-        plain_data = safe_get(wd_plain, "result", "Data", default={})
-        if isinstance(plain_data, dict):
-            val = plain_data.get("Is_Window_Open", "0")
-            if val in ("0", "1"):
-                return val == "1"
-
-        # Fallback pe window_dates_enc — Is_Window_Open = string criptat
-        # Nu putem decripta, deci verificăm dacă previous_meter_read a returnat date
-        prev = data.get("previous_meter_read")
-        if prev and isinstance(prev, dict):
-            status = prev.get("status_code", 0)
-            if status == 200:
-                return True
+        """Determină dacă fereastra de autocitire este deschisă.
 
-        return False
+        Preferă window_dates (plain) — Is_Window_Open = "0" sau "1";
+        varianta ENC e criptată, deci fallback pe previous_meter_read.
+        """
+        return self._view.window_is_open
 
     @property
     def native_value(self) -> str | None:
@@ -1461,11 +1129,12 @@ class CitirePermisaSensor(HidroelectricaEntity):
             return {"attribution": ATTRIBUTION}
 
         attrs: dict[str, Any] = {}
-        wd = _get_window_data(data)
+        view = self._view
+        wd = view.window
 
         if wd:
-            open_date = wd.get("NextMonthOpeningDate", "")
-            close_date = _compute_closing_date(wd)
+            open_date = wd.next_opening_date
+            close_date = view.closing_date
 
             if open_date and close_date:
                 attrs["Perioadă transmitere index"] = f"{open_date} — {close_date}"
@@ -1477,8 +1146,8 @@ class CitirePermisaSensor(HidroelectricaEntity):
             attrs["În perioadă de citire"] = "Da" if is_open else "Nu"
 
             # Date deschidere/închidere
-            opening = wd.get("OpeningDate", "")
-            closing = wd.get("ClosingDate", "")
+            opening = wd.opening_date
+            closing = wd.closing_date
             if opening and closing:
                 attrs["Zi deschidere fereastră"] = opening
                 attrs["Zi închidere fereastră"] = closing
@@ -1486,13 +1155,12 @@ class CitirePermisaSensor(HidroelectricaEntity):
             attrs["Perioadă transmitere index"] = "Perioada nu a fost stabilită"
 
         # POD și instalație
-        pods_list = _get_pods_list(data)
-        if pods_list:
-            pod = pods_list[0]
-            if pod.get("pod"):
-                attrs["POD"] = pod["pod"]
-            if pod.get("installation"):
-                attrs["Instalație"] = pod["installation"]
+        if view.pods:
+            pod = view.pods[0]
+            if pod.pod:
+                attrs["POD"] = pod.pod
+            if pod.installation:
+                attrs["Instalație"] = pod.installation
 
         attrs["Cod încasare"] = self._uan
         attrs["attribution"] = ATTRIBUTION
@@ -1514,7 +1182,7 @@ class CitirePermisaSensor(HidroelectricaEntity):
 # Responsabilitate: Istoric consum energie electrică pe an
 # Surse: GetUsageGeneration → objUsageGenerationResultSetTwo
 # ──────────────────────────────────────────────
-class ArhivaConsumSensor(HidroelectricaEntity):
+class ArhivaConsumSensor(HidroelectricaArchiveEntity):
     """Senzor pentru afișarea datelor istorice ale consumului.
 
     Citește dinamic din coordinator.data["usage"] (GetUsageGeneration).
@@ -1527,6 +1195,7 @@ class ArhivaConsumSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:lightning-bolt"
     _attr_translation_key = "arhiva_consum_energie_electrica"
+    _data_keys = frozenset({"usage"})
 
     def __init__(self, coordinator, config_entry, year: int):
         super().__init__(coordinator, config_entry)
@@ -1537,10 +1206,9 @@ class ArhivaConsumSensor(HidroelectricaEntity):
             f"sensor.{DOMAIN}_{self._uan}_arhiva_consum_energie_electrica_{year}"
         )
 
-    def _get_entries(self) -> list:
-        """Extrage dinamic intrările pentru anul curent din coordinator.data."""
-        usage_years = _extract_usage_years(self.coordinator.data)
-        return usage_years.get(self._year, [])
+    def _get_entries(self) -> tuple:
+        """Intrările anului (sortate pe lună) din view-ul coordinatorului."""
+        return self._view.usage_years.get(self._year, ())
 
     @property
     def native_value(self):
@@ -1550,36 +1218,46 @@ class ArhivaConsumSensor(HidroelectricaEntity):
         if not entries:
             return 0
         # value = consum real în kWh
-        total = sum(
-            float(e.get("value", 0))
-            for e in entries
-            if e.get("value") is not None
-        )
+        total = sum(float(e.value) for e in entries if e.value is not None)
         return round(total, 2)
 
     @property
     def native_unit_of_measurement(self):
         return None
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        if not self._license_valid:
-            return {"licență": "necesară"}
+    def _compact_attributes(self, entries: tuple) -> dict[str, Any]:
+        months = [
+            {
+                "month": m.month,
+                "kwh": _number(m.value),
+                "lei": _number(m.usage_value),
+                "billing_days": _number(m.billing_days),
+            }
+            for m in entries
+        ]
+        return {
+            "year": self._year,
+            "total_kwh": round(sum(m["kwh"] or 0 for m in months), 2),
+            "total_lei": round(sum(m["lei"] or 0 for m in months), 2),
+            "months": months,
+            "attribution": ATTRIBUTION,
+        }
+
+    def _verbose_attributes(self, entries: tuple) -> dict[str, Any]:
         attrs: dict[str, Any] = {"attribution": ATTRIBUTION}
-        entries = self._get_entries()
 
         if not entries:
             attrs["Date"] = "Nu sunt disponibile date de consum"
             return attrs
 
-        # Ordonăm pe lună
-        sorted_entries = sorted(entries, key=lambda e: e.get("Month", 0))
+        # Deja ordonate pe lună (în view)
+        sorted_entries = entries
 
         # Consum lunar în kWh (value) și sumă facturată în lei (UsageValue)
         for entry in sorted_entries:
-            month_num = entry.get("Month", 0)
-            kwh = entry.get("value", 0)
-            lei = entry.get("UsageValue", 0)
+            month_num = entry.month
+            kwh = entry.value if entry.value is not None else 0
+            lei = entry.usage_value
             month_name = MONTHS_NUM_RO.get(month_num, str(month_num))
             attrs[f"Consum lunar {month_name}"] = (
                 f"{format_number_ro(kwh)} kWh ({format_ron(float(lei))} lei)"
@@ -1588,13 +1266,12 @@ class ArhivaConsumSensor(HidroelectricaEntity):
         # Consum mediu zilnic în kWh
         has_daily = False
         for entry in sorted_entries:
-            billing_days = entry.get("BillingDays", "0")
             try:
-                days = int(billing_days)
+                days = int(entry.billing_days)
                 if days > 0:
-                    kwh_val = float(entry.get("value", 0))
+                    kwh_val = float(entry.value if entry.value is not None else 0)
                     daily = round(kwh_val / days, 2)
-                    month_num = entry.get("Month", 0)
+                    month_num = entry.month
                     month_name = MONTHS_NUM_RO.get(month_num, str(month_num))
                     if not has_daily:
                         attrs["────"] = ""
@@ -1611,7 +1288,7 @@ class ArhivaConsumSensor(HidroelectricaEntity):
 # Responsabilitate: Istoric citiri contor pe an
 # Surse: GetMeterReadHistory
 # ──────────────────────────────────────────────
-class ArhivaIndexSensor(HidroelectricaEntity):
+class ArhivaIndexSensor(HidroelectricaArchiveEntity):
     """Senzor pentru afișarea istoricului citirilor contorului.
 
     Citește dinamic din coordinator.data["meter_read_history"] (GetMeterReadHistory).
@@ -1624,6 +1301,7 @@ class ArhivaIndexSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:clipboard-text-clock-outline"
     _attr_translation_key = "arhiva_index_energie_electrica"
+    _data_keys = frozenset({"meter_read_history", "meter_counter_series"})
 
     def __init__(self, coordinator, config_entry, year: int, register_filter: str | None = None):
         super().__init__(coordinator, config_entry)
@@ -1635,10 +1313,9 @@ class ArhivaIndexSensor(HidroelectricaEntity):
             f"sensor.{DOMAIN}_{self._uan}_arhiva_index_energie_electrica_{year}"
         )
 
-    def _get_entries(self) -> list:
-        """Extrage dinamic citirile pentru anul curent din coordinator.data."""
-        mrh_years = _extract_meter_read_years(self.coordinator.data, register_filter=self._register_filter)
-        return mrh_years.get(self._year, [])
+    def _get_entries(self) -> tuple:
+        """Citirile anului (sortate cronologic) din view-ul coordinatorului."""
+        return self._view.meter_reads_for_year(self._year, self._register_filter)
 
     @property
     def native_value(self):
@@ -1646,29 +1323,22 @@ class ArhivaIndexSensor(HidroelectricaEntity):
             return "Licență necesară"
         return len(self._get_entries())
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        if not self._license_valid:
-            return {"licență": "necesară"}
+    def _compact_attributes(self, entries: tuple) -> dict[str, Any]:
+        return _compact_readings(self._year, entries)
+
+    def _verbose_attributes(self, entries: tuple) -> dict[str, Any]:
         attrs: dict[str, Any] = {}
-        entries = self._get_entries()
 
         if not entries:
             attrs["Date"] = "Nu sunt disponibile date de citire"
             attrs["attribution"] = ATTRIBUTION
             return attrs
 
-        # Sortăm pe Date (dd/MM/yyyy) cronologic
-        def sort_key(e):
-            parsed = _parse_date_dmy(e.get("Date", ""))
-            return parsed if parsed else datetime.min
-
-        sorted_entries = sorted(entries, key=sort_key)
-
-        for entry in sorted_entries:
-            date_str = entry.get("Date", "Necunoscut")
-            index_val = entry.get("Index", "N/A")
-            read_type = entry.get("ReadingType", "")
+        # Deja sortate pe Date (dd/MM/yyyy) cronologic (în view)
+        for entry in entries:
+            date_str = entry.date or "Necunoscut"
+            index_val = entry.index if entry.index is not None else "N/A"
+            read_type = entry.reading_type
             display_type = READING_TYPE_MAP.get(read_type, read_type) if read_type else "Necunoscut"
 
             attrs[f"Index ({display_type}) {date_str}"] = f"{index_val} kWh"
@@ -1682,7 +1352,7 @@ class ArhivaIndexSensor(HidroelectricaEntity):
 # Responsabilitate: Istoric citiri contor energie PRODUSĂ (Registers=1.8.0_P)
 # Surse: GetMeterReadHistory → citiri filtrate pe 1.8.0_P
 # ──────────────────────────────────────────────
-class ArhivaIndexProdusSensor(HidroelectricaEntity):
+class ArhivaIndexProdusSensor(HidroelectricaArchiveEntity):
     """Senzor pentru afișarea istoricului citirilor contorului de energie produsă.
 
     Activ DOAR la prosumator (Registers=1.8.0_P prezent în meter_read_history).
@@ -1692,6 +1362,7 @@ class ArhivaIndexProdusSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:solar-power-variant"
     _attr_translation_key = "arhiva_index_energie_produsa"
+    _data_keys = frozenset({"meter_read_history", "meter_counter_series"})
 
     def __init__(self, coordinator, config_entry, year: int):
         super().__init__(coordinator, config_entry)
@@ -1702,12 +1373,9 @@ class ArhivaIndexProdusSensor(HidroelectricaEntity):
             f"sensor.{DOMAIN}_{self._uan}_arhiva_index_energie_produsa_{year}"
         )
 
-    def _get_entries(self) -> list:
-        """Extrage dinamic citirile de producție pentru anul curent."""
-        mrh_years = _extract_meter_read_years(
-            self.coordinator.data, register_filter="1.8.0_P"
-        )
-        return mrh_years.get(self._year, [])
+    def _get_entries(self) -> tuple:
+        """Citirile de producție ale anului (sortate cronologic)."""
+        return self._view.meter_reads_for_year(self._year, "1.8.0_P")
 
     @property
     def native_value(self):
@@ -1715,29 +1383,22 @@ class ArhivaIndexProdusSensor(HidroelectricaEntity):
             return "Licență necesară"
         return len(self._get_entries())
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        if not self._license_valid:
-            return {"licență": "necesară"}
+    def _compact_attributes(self, entries: tuple) -> dict[str, Any]:
+        return _compact_readings(self._year, entries)
+
+    def _verbose_attributes(self, entries: tuple) -> dict[str, Any]:
         attrs: dict[str, Any] = {}
-        entries = self._get_entries()
 
         if not entries:
             attrs["Date"] = "Nu sunt disponibile date de citire producție"
             attrs["attribution"] = ATTRIBUTION
             return attrs
 
-        # Sortăm pe Date (dd/MM/yyyy) cronologic
-        def sort_key(e):
-            parsed = _parse_date_dmy(e.get("Date", ""))
-            return parsed if parsed else datetime.min
-
-        sorted_entries = sorted(entries, key=sort_key)
-
-        for entry in sorted_entries:
-            date_str = entry.get("Date", "Necunoscut")
-            index_val = entry.get("Index", "N/A")
-            read_type = entry.get("ReadingType", "")
+        # Deja sortate pe Date (dd/MM/yyyy) cronologic (în view)
+        for entry in entries:
+            date_str = entry.date or "Necunoscut"
+            index_val = entry.index if entry.index is not None else "N/A"
+            read_type = entry.reading_type
             display_type = READING_TYPE_MAP.get(read_type, read_type) if read_type else "Necunoscut"
 
             attrs[f"Index produs ({display_type}) {date_str}"] = f"{index_val} kWh"
@@ -1751,7 +1412,7 @@ class ArhivaIndexProdusSensor(HidroelectricaEntity):
 # Responsabilitate: Istoric plăți REALE efectuate
 # Surse: GetBillingHistory → objBillingPaymentHistoryEntity (plăți, NU facturi)
 # ──────────────────────────────────────────────
-class ArhivaPlatiSensor(HidroelectricaEntity):
+class ArhivaPlatiSensor(HidroelectricaArchiveEntity):
     """Senzor pentru afișarea istoricului plăților efectuate de utilizator.
 
     Citește dinamic din coordinator.data["billing_history"]
@@ -1765,6 +1426,7 @@ class ArhivaPlatiSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:cash-register"
     _attr_translation_key = "arhiva_plati"
+    _data_keys = frozenset({"billing_history"})
 
     def __init__(self, coordinator, config_entry, year: int):
         super().__init__(coordinator, config_entry)
@@ -1773,12 +1435,9 @@ class ArhivaPlatiSensor(HidroelectricaEntity):
         self._attr_unique_id = f"{DOMAIN}_arhiva_plati_{self._uan}_{year}"
         self._custom_entity_id = f"sensor.{DOMAIN}_{self._uan}_arhiva_plati_{year}"
 
-    def _get_entries(self) -> list:
-        """Extrage dinamic plățile normale pentru anul curent."""
-        payment_years = _extract_payment_years(
-            self.coordinator.data, channel_filter="normal"
-        )
-        return payment_years.get(self._year, [])
+    def _get_entries(self) -> tuple:
+        """Plățile normale ale anului, cronologic."""
+        return self._view.payments_for_year(self._year, "normal")
 
     @property
     def native_value(self):
@@ -1786,12 +1445,11 @@ class ArhivaPlatiSensor(HidroelectricaEntity):
             return "Licență necesară"
         return len(self._get_entries())
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        if not self._license_valid:
-            return {"licență": "necesară"}
+    def _compact_attributes(self, entries: tuple) -> dict[str, Any]:
+        return _compact_payments(self._year, entries)
+
+    def _verbose_attributes(self, entries: tuple) -> dict[str, Any]:
         attrs: dict[str, Any] = {}
-        entries = self._get_entries()
 
         if not entries:
             attrs["Date"] = "Nu sunt disponibile date de plată"
@@ -1800,43 +1458,29 @@ class ArhivaPlatiSensor(HidroelectricaEntity):
             attrs["attribution"] = ATTRIBUTION
             return attrs
 
-        def sort_key(e):
-            parsed = _parse_date_dmy(e.get("paymentDate", ""))
-            return parsed if parsed else datetime.min
-
-        sorted_entries = sorted(entries, key=sort_key)
-
         total = 0.0
-        for idx, entry in enumerate(sorted_entries, start=1):
-            amount_str = entry.get("amount", "0")
-            payment_date = entry.get("paymentDate", "Necunoscut")
-            channel = entry.get("channel", "")
-
-            try:
-                amount_float = parse_romanian_amount(str(amount_str))
-            except (ValueError, TypeError):
-                amount_float = 0.0
-
+        for idx, payment in enumerate(entries, start=1):
+            amount_float = payment.amount_value
+            channel = payment.channel
             total += amount_float
 
-            parsed_date = _parse_date_dmy(payment_date)
-            if parsed_date:
-                month_name = MONTHS_NUM_RO.get(parsed_date.month, "necunoscut")
+            if payment.paid_at:
+                month_name = MONTHS_NUM_RO.get(payment.paid_at.month, "necunoscut")
             else:
-                month_name = payment_date
+                month_name = payment.payment_date or "Necunoscut"
 
             channel_suffix = f" ({channel})" if channel else ""
             attrs[f"Plată {idx} luna {month_name}{channel_suffix}"] = (
                 f"{format_ron(amount_float)} lei"
             )
 
-        attrs["Plăți efectuate"] = len(sorted_entries)
+        attrs["Plăți efectuate"] = len(entries)
         attrs["Sumă totală"] = f"{format_ron(total)} lei"
         attrs["attribution"] = ATTRIBUTION
         return attrs
 
 
-class ArhivaPlatiProsumatorSensor(HidroelectricaEntity):
+class ArhivaPlatiProsumatorSensor(HidroelectricaArchiveEntity):
     """Senzor pentru afișarea compensațiilor ANRE primite de prosumator.
 
     Afișează doar plățile cu canal de tip Comp ANRE-* (compensații
@@ -1845,6 +1489,7 @@ class ArhivaPlatiProsumatorSensor(HidroelectricaEntity):
 
     _attr_icon = "mdi:solar-power-variant"
     _attr_translation_key = "arhiva_plati_prosumator"
+    _data_keys = frozenset({"billing_history"})
 
     def __init__(self, coordinator, config_entry, year: int):
         super().__init__(coordinator, config_entry)
@@ -1857,12 +1502,9 @@ class ArhivaPlatiProsumatorSensor(HidroelectricaEntity):
             f"sensor.{DOMAIN}_{self._uan}_arhiva_plati_prosumator_{year}"
         )
 
-    def _get_entries(self) -> list:
-        """Extrage dinamic compensațiile ANRE pentru anul curent."""
-        payment_years = _extract_payment_years(
-            self.coordinator.data, channel_filter="comp"
-        )
-        return payment_years.get(self._year, [])
+    def _get_entries(self) -> tuple:
+        """Compensațiile ANRE ale anului, cronologic."""
+        return self._view.payments_for_year(self._year, "comp")
 
     @property
     def native_value(self):
@@ -1870,12 +1512,11 @@ class ArhivaPlatiProsumatorSensor(HidroelectricaEntity):
             return "Licență necesară"
         return len(self._get_entries())
 
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        if not self._license_valid:
-            return {"licență": "necesară"}
+    def _compact_attributes(self, entries: tuple) -> dict[str, Any]:
+        return _compact_payments(self._year, entries)
+
+    def _verbose_attributes(self, entries: tuple) -> dict[str, Any]:
         attrs: dict[str, Any] = {}
-        entries = self._get_entries()
 
         if not entries:
             attrs["Date"] = "Nu sunt disponibile compensații ANRE"
@@ -1884,36 +1525,22 @@ class ArhivaPlatiProsumatorSensor(HidroelectricaEntity):
             attrs["attribution"] = ATTRIBUTION
             return attrs
 
-        def sort_key(e):
-            parsed = _parse_date_dmy(e.get("paymentDate", ""))
-            return parsed if parsed else datetime.min
-
-        sorted_entries = sorted(entries, key=sort_key)
-
         total = 0.0
-        for idx, entry in enumerate(sorted_entries, start=1):
-            amount_str = entry.get("amount", "0")
-            payment_date = entry.get("paymentDate", "Necunoscut")
-            channel = entry.get("channel", "")
-
-            try:
-                amount_float = parse_romanian_amount(str(amount_str))
-            except (ValueError, TypeError):
-                amount_float = 0.0
-
+        for idx, payment in enumerate(entries, start=1):
+            amount_float = payment.amount_value
+            channel = payment.channel
             total += amount_float
 
-            parsed_date = _parse_date_dmy(payment_date)
-            if parsed_date:
-                month_name = MONTHS_NUM_RO.get(parsed_date.month, "necunoscut")
+            if payment.paid_at:
+                month_name = MONTHS_NUM_RO.get(payment.paid_at.month, "necunoscut")
             else:
-                month_name = payment_date
+                month_name = payment.payment_date or "Necunoscut"
 
             attrs[f"Compensație {idx} luna {month_name} ({channel})"] = (
                 f"{format_ron(amount_float)} lei"
             )
 
-        attrs["Compensații ANRE"] = len(sorted_entries)
+        attrs["Compensații ANRE"] = len(entries)
         attrs["Sumă totală"] = f"{format_ron(total)} lei"
         attrs["attribution"] = ATTRIBUTION
         return attrs
@@ -0,0 +1,134 @@
+"""Sesiune HTTP dedicată ihidro.ro pentru integrarea Hidroelectrica România.
+
+Sesiunea partajată a Home Assistant (async_get_clientsession) nu permite
+reglarea pool-ului pentru un singur host. Sesiunea proprie a integrării:
+- TCPConnector cu limită per host egală cu limitatorul global
+  (UPSTREAM_MAX_INFLIGHT) — conexiunile nu stau în coadă la connector
+- keep-alive lung între refresh-uri: conexiunile TLS deschise se
+  refolosesc, fără handshake TCP + TLS la fiecare request
+- cache DNS pentru ihidro.ro
+- contoare (TraceConfig): conexiuni noi vs. refolosite, DNS hit/miss
+
+Sesiunea aparține config entry-ului și se închide la unload.
+"""
+
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import (
+    ClientSession,
+    TCPConnector,
+    TraceConfig,
+    TraceConnectionCreateEndParams,
+    TraceConnectionQueuedStartParams,
+    TraceConnectionReuseconnParams,
+    TraceDnsCacheHitParams,
+    TraceDnsCacheMissParams,
+    TraceRequestStartParams,
+)
+
+from .const import (
+    HTTP_DNS_TTL,
+    HTTP_KEEPALIVE_TIMEOUT,
+    UPSTREAM_MAX_INFLIGHT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SewSessionStats:
+    """Contoare de conexiuni pentru sesiunea dedicată (pentru diagnostics)."""
+
+    def __init__(self) -> None:
+        self._counters: dict[str, int] = {
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "connections_queued": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+        }
+
+    def trace_config(self) -> TraceConfig:
+        """TraceConfig care actualizează contoarele."""
+        trace = TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_connection_create_end.append(self._on_connection_created)
+        trace.on_connection_reuseconn.append(self._on_connection_reused)
+        trace.on_connection_queued_start.append(self._on_connection_queued)
+        trace.on_dns_cache_hit.append(self._on_dns_cache_hit)
+        trace.on_dns_cache_miss.append(self._on_dns_cache_miss)
+        return trace
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        connections = (
+            self._counters["connections_created"] + self._counters["connections_reused"]
+        )
+        return {
+            **self._counters,
+            "reuse_ratio": round(self._counters["connections_reused"] / connections, 3)
+            if connections else None,
+        }
+
+    async def _on_request_start(
+        self, _session: ClientSession, _ctx: SimpleNamespace,
+        _params: TraceRequestStartParams,
+    ) -> None:
+        self._counters["requests"] += 1
+
+    async def _on_connection_created(
+        self, _session: ClientSession, _ctx: SimpleNamespace,
+        _params: TraceConnectionCreateEndParams,
+    ) -> None:
+        self._counters["connections_created"] += 1
+
+    async def _on_connection_reused(
+        self, _session: ClientSession, _ctx: SimpleNamespace,
+        _params: TraceConnectionReuseconnParams,
+    ) -> None:
+        self._counters["connections_reused"] += 1
+
+    async def _on_connection_queued(
+        self, _session: ClientSession, _ctx: SimpleNamespace,
+        _params: TraceConnectionQueuedStartParams,
+    ) -> None:
+        self._counters["connections_queued"] += 1
+
+    async def _on_dns_cache_hit(
+        self, _session: ClientSession, _ctx: SimpleNamespace,
+        _params: TraceDnsCacheHitParams,
+    ) -> None:
+        self._counters["dns_cache_hits"] += 1
+
+    async def _on_dns_cache_miss(
+        self, _session: ClientSession, _ctx: SimpleNamespace,
+        _params: TraceDnsCacheMissParams,
+    ) -> None:
+        self._counters["dns_cache_misses"] += 1
+
+
+def create_sew_session() -> tuple[ClientSession, SewSessionStats]:
+    """Creează sesiunea dedicată ihidro.ro și contoarele ei.
+
+    Apelantul (setup-ul config entry-ului) o închide la unload.
+    SSL se configurează per request (contextul fără verificare din api.py).
+    """
+    stats = SewSessionStats()
+    connector = TCPConnector(
+        limit_per_host=UPSTREAM_MAX_INFLIGHT,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=HTTP_DNS_TTL,
+        enable_cleanup_closed=True,
+    )
+    session = ClientSession(
+        connector=connector, trace_configs=[stats.trace_config()]
+    )
+    _LOGGER.debug(
+        "Sesiune HTTP dedicată creată (limită/host=%s, keep-alive=%ss, DNS TTL=%ss).",
+        UPSTREAM_MAX_INFLIGHT, HTTP_KEEPALIVE_TIMEOUT, HTTP_DNS_TTL,
+    )
+    return session, stats
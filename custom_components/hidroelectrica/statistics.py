@@ -0,0 +1,260 @@
+"""Import în statisticile pe termen lung pentru Hidroelectrica România.
+
+Senzorii de arhivă împachetează ani întregi de istoric în atribute, pe
+care recorder-ul le re-salvează la fiecare schimbare de stare. Istoricul
+se scrie și ca statistici externe (vizibile în Energy dashboard și în
+graficele de statistici):
+- hidroelectrica:consum_<uan>        — consum lunar (kWh), GetUsageGeneration
+- hidroelectrica:cost_<uan>          — sumă lunară facturată (lei)
+- hidroelectrica:index_<uan>         — index contor (kWh), GetMeterReadHistory
+- hidroelectrica:index_produs_<uan>  — index producție (doar prosumator)
+
+Per statistică se păstrează un watermark în entry store (secțiunea
+„statistics"): ultima perioadă scrisă și suma cumulată. La fiecare
+refresh se trimit doar perioadele noi (plus ultima, care se poate
+corecta). Importul rulează doar când răspunsurile istorice se schimbă.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+)
+from homeassistant.const import UnitOfEnergy
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+
+try:
+    from homeassistant.components.recorder.models import StatisticMeanType
+except ImportError:  # Home Assistant mai vechi
+    StatisticMeanType = None  # type: ignore[assignment,misc]
+
+if TYPE_CHECKING:
+    from .coordinator import HidroelectricaCoordinator
+    from .derived import AccountView
+    from .storage import HidroelectricaEntryStore
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_SECTION = "statistics"
+
+# Răspunsurile din care se construiesc statisticile
+_SOURCE_KEYS = ("usage", "meter_read_history", "meter_counter_series")
+
+# (prev_state, state) → creșterea sumei cumulate
+_Delta = Callable[[float | None, float], float]
+
+
+def _add_value(_prev: float | None, state: float) -> float:
+    """Consum / cost lunar: fiecare perioadă se adaugă integral."""
+    return state
+
+
+def _add_index_increase(prev: float | None, state: float) -> float:
+    """Index contor: doar creșterea față de citirea anterioară.
+
+    Prima citire pornește suma de la 0; o scădere (contor înlocuit) nu
+    scade suma.
+    """
+    if prev is None:
+        return 0.0
+    return max(0.0, state - prev)
+
+
+def _to_float(value: Any) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _period_start(day: date) -> datetime:
+    """Începutul zilei locale, rotunjit în jos la ora fixă UTC.
+
+    Statisticile acceptă doar începuturi de oră; în fusurile cu decalaj
+    fracționar (+05:30, +09:30) miezul nopții local nu e la oră fixă UTC.
+    """
+    start = dt_util.as_utc(dt_util.start_of_local_day(day))
+    return start.replace(minute=0, second=0, microsecond=0)
+
+
+def _usage_points(view: AccountView, attr: str) -> list[tuple[datetime, float]]:
+    """(început de lună local, valoare) pentru consum (value) sau cost (usage_value)."""
+    points: list[tuple[datetime, float]] = []
+    for year in sorted(view.usage_years):
+        for month in view.usage_years[year]:
+            value = _to_float(getattr(month, attr))
+            if value is None or not 1 <= int(month.month or 0) <= 12:
+                continue
+            start = _period_start(date(int(year), int(month.month), 1))
+            points.append((start, value))
+    return points
+
+
+def _index_points(
+    view: AccountView, register: str | None
+) -> list[tuple[datetime, float]]:
+    """(zi locală, index) pentru citirile seriei active; ultima citire din zi."""
+    by_day: dict[datetime, float] = {}
+    years = view.meter_read_years.get(register, {})
+    for year in sorted(years):
+        for read in years[year]:
+            value = _to_float(read.index)
+            if value is None or read.read_at is None:
+                continue
+            by_day[_period_start(read.read_at.date())] = value
+    return sorted(by_day.items())
+
+
+def _new_rows(
+    points: Iterable[tuple[datetime, float]],
+    mark: dict[str, Any] | None,
+    delta: _Delta,
+) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """Rândurile de trimis (după watermark) și watermark-ul nou.
+
+    Ultima perioadă deja scrisă se re-trimite (poate fi corectată) —
+    suma ei pornește din sum / state de dinaintea ei.
+    """
+    last_start: float | None = None
+    total, state = 0.0, None
+    if mark:
+        last_start = mark["start"]
+        total, state = mark["prev_sum"], mark["prev_state"]
+
+    rows: list[dict[str, Any]] = []
+    prev_sum, prev_state = total, state
+    for start, value in points:
+        if last_start is not None and start.timestamp() < last_start:
+            continue
+        prev_sum, prev_state = total, state
+        total += delta(state, value)
+        state = value
+        rows.append({"start": start, "state": value, "sum": total})
+
+    if not rows:
+        return [], mark
+    if (
+        mark
+        and len(rows) == 1
+        and rows[0]["start"].timestamp() == mark["start"]
+        and rows[0]["state"] == mark["state"]
+    ):
+        # Nimic nou: doar ultima perioadă, neschimbată
+        return [], mark
+    return rows, {
+        "start": rows[-1]["start"].timestamp(),
+        "sum": total,
+        "state": state,
+        "prev_sum": prev_sum,
+        "prev_state": prev_state,
+    }
+
+
+def _metadata(statistic_id: str, name: str, unit: str) -> dict[str, Any]:
+    """StatisticMetaData pentru o statistică externă cu sumă cumulată."""
+    metadata: dict[str, Any] = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": name,
+        "source": DOMAIN,
+        "statistic_id": statistic_id,
+        "unit_of_measurement": unit,
+    }
+    if StatisticMeanType is not None:
+        # Home Assistant 2025.x: mean_type / unit_class înlocuiesc has_mean
+        metadata["mean_type"] = StatisticMeanType.NONE
+        metadata["unit_class"] = "energy" if unit == UnitOfEnergy.KILO_WATT_HOUR else None
+    return metadata
+
+
+class HidroelectricaStatisticsImporter:
+    """Scrie istoricul unui cont ca statistici externe, incremental."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: HidroelectricaCoordinator,
+        entry_store: HidroelectricaEntryStore,
+    ) -> None:
+        self.hass = hass
+        self._coordinator = coordinator
+        self._entry_store = entry_store
+        self._sources: tuple[Any, ...] | None = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Importă la fiecare actualizare a coordinatorului; returnează stop."""
+        if "recorder" not in self.hass.config.components:
+            _LOGGER.debug(
+                "Recorder inactiv — statisticile nu se importă (UAN=%s).",
+                self._coordinator.uan,
+            )
+            return lambda: None
+        self._async_import()
+        return self._coordinator.async_add_listener(self._async_import)
+
+    @callback
+    def _async_import(self) -> None:
+        data = self._coordinator.data
+        if not data:
+            return
+        sources = tuple(data.get(key) for key in _SOURCE_KEYS)
+        if self._sources is not None and all(
+            a is b for a, b in zip(sources, self._sources)
+        ):
+            return
+        self._sources = sources
+
+        uan = self._coordinator.uan
+        view = self._coordinator.view
+        marks: dict[str, Any] = dict(
+            self._entry_store.get(STATISTICS_SECTION, uan) or {}
+        )
+        kwh = UnitOfEnergy.KILO_WATT_HOUR
+        series = [
+            (f"consum_{uan}", f"Consum lunar {uan}", kwh,
+             _usage_points(view, "value"), _add_value),
+            (f"cost_{uan}", f"Cost lunar {uan}", "RON",
+             _usage_points(view, "usage_value"), _add_value),
+            (f"index_{uan}", f"Index energie electrică {uan}", kwh,
+             _index_points(view, "1.8.0" if view.is_prosumer else None),
+             _add_index_increase),
+        ]
+        if view.is_prosumer:
+            series.append(
+                (f"index_produs_{uan}", f"Index energie produsă {uan}", kwh,
+                 _index_points(view, "1.8.0_P"), _add_index_increase)
+            )
+
+        written = 0
+        for object_id, name, unit, points, delta in series:
+            rows, mark = _new_rows(points, marks.get(object_id), delta)
+            if not rows:
+                continue
+            statistic_id = f"{DOMAIN}:{object_id}"
+            try:
+                async_add_external_statistics(
+                    self.hass, _metadata(statistic_id, name, unit), rows
+                )
+            except HomeAssistantError as err:
+                # Watermark-ul rămâne neschimbat: se reîncearcă la următorul import
+                _LOGGER.error("Import statistici %s eșuat: %s", statistic_id, err)
+                continue
+            marks[object_id] = mark
+            written += len(rows)
+            _LOGGER.debug(
+                "Statistici %s: %s perioade trimise (ultima=%s).",
+                statistic_id, len(rows), rows[-1]["start"].isoformat(),
+            )
+
+        if written:
+            self._entry_store.async_set(STATISTICS_SECTION, uan, marks)
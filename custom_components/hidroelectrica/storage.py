@@ -0,0 +1,145 @@
+"""Persistență locală pentru integrarea Hidroelectrica România.
+
+Token-urile SEW NU mai sunt salvate în config_entry.data:
+- orice async_update_entry declanșează listener-ul de opțiuni → reload complet
+- fiecare rotire de token ar rescrie core.config_entries pe disc
+
+În schimb, folosim un Store dedicat (.storage/hidroelectrica_tokens),
+indexat pe username, cu salvare amânată (async_delay_save).
+
+Datele per config entry (ex: snapshot-ul coordinatorului pentru pornire
+instantanee) stau în .storage/hidroelectrica_entry_<entry_id>, pe secțiuni
+și pe cont (UAN), tot cu salvare amânată.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ENTRY_SAVE_DELAY,
+    ENTRY_STORAGE_KEY,
+    ENTRY_STORAGE_VERSION,
+    TOKEN_SAVE_DELAY,
+    TOKEN_STORAGE_KEY,
+    TOKEN_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Cheie în hass.data — NU sub hass.data[DOMAIN], care se șterge la ultimul unload
+_TOKEN_STORE_DATA_KEY = TOKEN_STORAGE_KEY
+
+
+class HidroelectricaTokenStore:
+    """Token-uri SEW persistate per username (salvare cu debounce)."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, TOKEN_STORAGE_VERSION, TOKEN_STORAGE_KEY, private=True
+        )
+        self._data: dict[str, dict] = {}
+        self._loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def async_load(self) -> None:
+        """Încarcă token-urile de pe disc (o singură dată)."""
+        async with self._load_lock:
+            if self._loaded:
+                return
+            try:
+                stored = await self._store.async_load()
+            except Exception:  # noqa: BLE001
+                _LOGGER.warning(
+                    "Storage token-uri corupt sau ilizibil — pornesc cu date goale."
+                )
+                stored = None
+            tokens = (stored or {}).get("tokens", {})
+            self._data = dict(tokens) if isinstance(tokens, dict) else {}
+            self._loaded = True
+            _LOGGER.debug("Token store încărcat: %d utilizatori.", len(self._data))
+
+    def get(self, username: str) -> dict | None:
+        """Returnează token-ul salvat pentru username (sau None)."""
+        return self._data.get(username.lower())
+
+    def async_set(self, username: str, token_data: dict) -> bool:
+        """Actualizează token-ul și programează salvarea amânată.
+
+        Returns:
+            True dacă token-ul s-a schimbat (și se va scrie pe disc).
+        """
+        key = username.lower()
+        if self._data.get(key) == token_data:
+            return False
+        self._data[key] = dict(token_data)
+        self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+        return True
+
+    def async_remove(self, username: str) -> None:
+        """Șterge token-ul unui username (la ștergerea integrării)."""
+        if self._data.pop(username.lower(), None) is not None:
+            self._store.async_delay_save(self._data_to_save, TOKEN_SAVE_DELAY)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Structura scrisă pe disc."""
+        return {"tokens": self._data}
+
+
+async def async_get_token_store(hass: HomeAssistant) -> HidroelectricaTokenStore:
+    """Returnează instanța unică de token store (creată și încărcată la nevoie)."""
+    store: HidroelectricaTokenStore | None = hass.data.get(_TOKEN_STORE_DATA_KEY)
+    if store is None:
+        # Setăm referința ÎNAINTE de await (evităm instanțe duplicate)
+        store = HidroelectricaTokenStore(hass)
+        hass.data[_TOKEN_STORE_DATA_KEY] = store
+    await store.async_load()
+    return store
+
+
+class HidroelectricaEntryStore:
+    """Date locale per config entry, pe secțiuni și pe cont (UAN).
+
+    Structură pe disc: {secțiune: {uan: valoare}}.
+    Valorile trebuie să fie serializabile JSON.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, ENTRY_STORAGE_VERSION, f"{ENTRY_STORAGE_KEY}_{entry_id}"
+        )
+        self._data: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> None:
+        """Încarcă datele de pe disc."""
+        try:
+            stored = await self._store.async_load()
+        except Exception:  # noqa: BLE001
+            _LOGGER.warning(
+                "Storage entry corupt sau ilizibil — pornesc cu date goale."
+            )
+            stored = None
+        self._data = dict(stored) if isinstance(stored, dict) else {}
+
+    def get(self, section: str, uan: str) -> Any:
+        """Returnează valoarea salvată pentru (secțiune, UAN) sau None."""
+        return self._data.get(section, {}).get(uan)
+
+    def async_set(self, section: str, uan: str, value: Any) -> None:
+        """Actualizează valoarea și programează salvarea amânată."""
+        self._data.setdefault(section, {})[uan] = value
+        self._store.async_delay_save(self._data_to_save, ENTRY_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Șterge fișierul de storage (la ștergerea integrării)."""
+        self._data = {}
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Structura scrisă pe disc."""
+        return self._data
@@ -0,0 +1,118 @@
+"""Microbenchmark pentru dates.parse_sew_date (parserul rapid SEW).
+
+Compară, pe un istoric de 5 ani (240 de date dd/MM/yyyy):
+- bucla veche cu până la patru datetime.strptime per valoare
+- calea rapidă (detectare după separatori), cu cache-ul LRU golit
+- calea rapidă cu cache-ul plin (refresh-urile următoare)
+
+Verifică apoi că rezultatele sunt identice cu parserul vechi pe un set
+generat care acoperă toate formatele, ambiguitatea zi/lună și date invalide.
+
+Rulare (din rădăcina repo-ului, fără Home Assistant instalat):
+    python scripts/bench_dates.py
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+_DATES_PY = (
+    Path(__file__).resolve().parent.parent
+    / "custom_components" / "hidroelectrica" / "dates.py"
+)
+_spec = importlib.util.spec_from_file_location("hidroelectrica_dates", _DATES_PY)
+dates = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(dates)
+
+ROUNDS = 20
+SAMPLES = 12_000
+
+
+def parse_strptime(date_str: str) -> datetime | None:
+    """Parserul de dinainte: strptime pe fiecare format, excepții ca flux."""
+    if not date_str:
+        return None
+    clean = date_str.rstrip("Z")
+    if " " in date_str:
+        clean = clean.split(" ")[0]
+    for fmt in ("%d/%m/%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d", "%m/%d/%Y"):
+        try:
+            return datetime.strptime(clean, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _history() -> list[str]:
+    """Istoric de 5 ani: 4 date pe lună (citire, factură, scadență, plată)."""
+    return [
+        f"{day:02d}/{month:02d}/{year}"
+        for year in range(2021, 2026)
+        for month in range(1, 13)
+        for day in (3, 10, 17, 24)
+    ]
+
+
+def _samples(rng: random.Random) -> list[str]:
+    """Valori în toate formatele SEW, inclusiv ambigue și invalide."""
+    values: list[str] = []
+    for _ in range(SAMPLES):
+        y, m, d = rng.randint(2015, 2030), rng.randint(1, 13), rng.randint(1, 32)
+        h, mi, s = rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59)
+        values.append(rng.choice((
+            f"{d:02d}/{m:02d}/{y}",
+            f"{d}/{m}/{y}",
+            f"{m:02d}/{d:02d}/{y} {h:02d}:{mi:02d}:{s:02d}",
+            f"{y}-{m:02d}-{d:02d}T{h:02d}:{mi:02d}:{s:02d}",
+            f"{y}-{m:02d}-{d:02d}T{h:02d}:{mi:02d}:{s:02d}Z",
+            f"{y}-{m:02d}-{d:02d}",
+            "",
+            "n/a",
+        )))
+    return values
+
+
+def _per_date_us(seconds: float, count: int) -> float:
+    return seconds / count * 1e6
+
+
+def main() -> None:
+    history = _history()
+    count = len(history) * ROUNDS
+
+    def run_strptime() -> None:
+        for value in history:
+            parse_strptime(value)
+
+    def run_fast_cold() -> None:
+        dates.parse_sew_date.cache_clear()
+        for value in history:
+            dates.parse_sew_date(value)
+
+    def run_fast_cached() -> None:
+        for value in history:
+            dates.parse_sew_date(value)
+
+    print(f"Istoric: {len(history)} date × {ROUNDS} runde")
+    for label, func in (
+        ("strptime (vechi)", run_strptime),
+        ("rapid, cache gol", run_fast_cold),
+        ("rapid, cache plin", run_fast_cached),
+    ):
+        seconds = min(timeit.repeat(func, number=ROUNDS, repeat=5))
+        print(f"  {label:<18} {_per_date_us(seconds, count):6.2f} µs/dată")
+
+    dates.parse_sew_date.cache_clear()
+    values = _samples(random.Random(0))
+    mismatches = [v for v in values if dates.parse_sew_date(v) != parse_strptime(v)]
+    print(f"Echivalență: {len(values) - len(mismatches)}/{len(values)} identice")
+    for value in mismatches[:10]:
+        print(f"  diferență: {value!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Teste pentru ferestrele de autocitire (scheduler.reading_windows)."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from custom_components.hidroelectrica.capabilities import window_state
+from custom_components.hidroelectrica.scheduler import reading_windows
+
+# Fereastră peste granița lunii: 28 → 2
+WD_28_2 = {"OpeningDate": "28", "ClosingDate": "2"}
+
+
+def test_fereastra_peste_luna_ziua_1() -> None:
+    """Pe 1 noiembrie fereastra curentă e cea deschisă pe 28 octombrie."""
+    now = datetime(2026, 11, 1, 10, 0)
+    start, end = reading_windows(WD_28_2, now)[0]
+    assert start == datetime(2026, 10, 28)
+    assert end == datetime(2026, 11, 3)
+    assert window_state({"result": {"Data": WD_28_2}}, now) is True
+
+
+def test_fereastra_peste_luna_ziua_29() -> None:
+    """Pe 29 octombrie fereastra curentă începe pe 28 octombrie."""
+    now = datetime(2026, 10, 29, 10, 0)
+    start, end = reading_windows(WD_28_2, now)[0]
+    assert start == datetime(2026, 10, 28)
+    assert end == datetime(2026, 11, 3)
+    assert window_state({"result": {"Data": WD_28_2}}, now) is True
+
+
+def test_fereastra_peste_an_ziua_1() -> None:
+    """Pe 1 ianuarie fereastra curentă e cea deschisă pe 28 decembrie."""
+    start, _end = reading_windows(WD_28_2, datetime(2027, 1, 1, 5, 0))[0]
+    assert start == datetime(2026, 12, 28)
+
+
+def test_fereastra_inchisa_dupa_ziua_2() -> None:
+    """Pe 3 noiembrie fereastra e închisă."""
+    now = datetime(2026, 11, 3, 1, 0)
+    assert window_state({"result": {"Data": WD_28_2}}, now) is False